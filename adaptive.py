@@ -0,0 +1,200 @@
+from simulation import create_simulation, play_round
+from betting import Count_histogram
+from statistics import NormalDist
+
+
+class Running_stats:
+    """Az átlagot és a varianciát egy menetben, tárolás nélkül frissítő (Welford-féle) statisztika.
+    Két statisztika összevonható, így a párhuzamosan futó részek eredményei egyesíthetők.
+    >>> a, b, c = Running_stats(), Running_stats(), Running_stats()
+    >>> for x in [1, -1, 0.5, 2, -1]:
+    ...     a.add(x)
+    ...     c.add(x)
+    >>> for x in [1.5, -1, 1]:
+    ...     b.add(x)
+    ...     c.add(x)
+    >>> a.merge(b)
+    >>> a.count, round(a.mean, 12) == round(c.mean, 12), round(a.variance(), 12) == round(c.variance(), 12)
+    (8, True, True)
+    >>> round(c.mean, 4), round(c.variance(), 4)
+    (0.375, 1.4821)
+    >>> Running_stats().half_width()
+    inf
+    >>> copy = Running_stats.from_dict(c.as_dict())
+    >>> copy.count, copy.mean == c.mean, copy.variance() == c.variance()
+    (8, True, True)
+    """
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, x: float) -> None:
+        """Hozzáad egy mintát.
+
+        Args:
+            x (float): A minta.
+        """
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+
+    def merge(self, other: 'Running_stats') -> None:
+        """Hozzáadja egy másik statisztika mintáit.
+
+        Args:
+            other (Running_stats): A másik statisztika.
+        """
+        count = self.count + other.count
+        if count == 0:
+            return
+        delta = other.mean - self.mean
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.mean += delta * other.count / count
+        self.count = count
+
+    def as_dict(self) -> dict:
+        """A statisztika állapota JSON-ként küldhető formában.
+
+        Returns:
+            dict: A minták száma (count), az átlag (mean) és az eltérés négyzetösszeg (m2).
+        """
+        return {'count': self.count, 'mean': self.mean, 'm2': self._m2}
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Running_stats':
+        """Visszaállítja az as_dict által elkészített állapotot.
+
+        Args:
+            data (dict): Az állapot.
+
+        Returns:
+            Running_stats: A statisztika.
+        """
+        stats = Running_stats()
+        stats.count, stats.mean, stats._m2 = data['count'], data['mean'], data['m2']
+        return stats
+
+    def variance(self) -> float:
+        """A minták korrigált tapasztalati varianciája.
+
+        Returns:
+            float: A variancia, ha kettőnél kevesebb minta van, akkor végtelen.
+        """
+        return self._m2 / (self.count - 1) if self.count > 1 else float('inf')
+
+    def standard_error(self) -> float:
+        """Az átlag standard hibája.
+
+        Returns:
+            float: A standard hiba.
+        """
+        return (self.variance() / self.count) ** 0.5 if self.count > 1 else float('inf')
+
+    def half_width(self, confidence: float = 0.95) -> float:
+        """Az átlag konfidencia intervallumának a fele, normális közelítéssel.
+
+        Args:
+            confidence (float): A megbízhatósági szint.
+
+        Returns:
+            float: Az intervallum félszélessége.
+        """
+        return NormalDist().inv_cdf(0.5 + confidence / 2) * self.standard_error()
+
+
+def play_batch(ai, g, rounds: int, counting: bool, history: list = None, histogram: Count_histogram = None) -> Running_stats:
+    """Lejátszik egy adag kört, és a körönkénti eredményt a kezdő tét arányában gyűjti, a zsetonok pontos (zseton egységben vett) értékéből.
+
+    Args:
+        ai (AI): A játékos.
+        g (Game_simulation): A játék.
+        rounds (int): A körök száma.
+        counting (bool): A játékos számolja-e a lapokat.
+        history (list): Ha meg van adva, akkor ehhez a listához fűzi hozzá a zseton mennyiségeket.
+        histogram (Count_histogram): Ha meg van adva, akkor az eredményeket a tét megtételekor érvényes valódi érték szerint is gyűjti.
+
+    Returns:
+        Running_stats: A körönkénti eredmények statisztikája.
+    """
+    stats = Running_stats()
+    for _ in range(rounds):
+        stats.add(play_round(ai, g, counting, histogram) / g.get_round_bet())
+        if history is not None:
+            history.append(g.get_player_chips_value())
+    return stats
+
+
+def is_precise(stats: Running_stats, precision: float, confidence: float) -> bool:
+    """Megnézi, hogy elérte-e a becslés a kívánt pontosságot.
+
+    Args:
+        stats (Running_stats): A körönkénti eredmények statisztikája.
+        precision (float): A konfidencia intervallum kívánt félszélessége a kezdő tét arányában, például 0.001 a ±0,1%-hoz.
+        confidence (float): A megbízhatósági szint.
+
+    Returns:
+        bool: Ha az intervallum félszélessége legfeljebb a kívánt pontosság, akkor True.
+    """
+    return stats.half_width(confidence) <= precision
+
+
+def summarize(stats: Running_stats, precision: float, confidence: float) -> dict:
+    """Összefoglalja az adaptív szimuláció eredményét.
+
+    Args:
+        stats (Running_stats): A körönkénti eredmények statisztikája.
+        precision (float): A kívánt pontosság.
+        confidence (float): A megbízhatósági szint.
+
+    Returns:
+        dict: A felhasznált körök száma (rounds), a kezdő tét arányában vett várható érték körönként (ev),
+            a konfidencia intervallum félszélessége (half_width), a szórás (standard_deviation) és hogy elérte-e a pontosságot (converged).
+    """
+    return {
+        'rounds': stats.count,
+        'ev': stats.mean,
+        'half_width': stats.half_width(confidence),
+        'standard_deviation': stats.variance() ** 0.5,
+        'converged': is_precise(stats, precision, confidence),
+    }
+
+
+def run_adaptive(config: dict, precision: float = 0.001, confidence: float = 0.95, batch_rounds: int = 10000,
+                 max_rounds: int = 10 ** 7, history: list = None, histogram: Count_histogram = None) -> dict:
+    """Adagokban játszik, amíg a körönkénti várható érték konfidencia intervalluma el nem éri a kívánt pontosságot,
+    vagy el nem fogy a körök kerete.
+    >>> config = {"deck_count": 6, "min_bet": 100, "max_bet": 100, "chips": 10 ** 6, "basic_strategy": True,
+    ...           "bet_system": False, "rules": "Default", "seed": 1}
+    >>> result = run_adaptive(config, precision=0.05, batch_rounds=500)
+    >>> result['converged'], result['rounds'] % 500, result['half_width'] <= 0.05
+    (True, 0, True)
+    >>> run_adaptive(config, precision=0.0001, batch_rounds=500, max_rounds=1200)['rounds']
+    1200
+
+    Args:
+        config (dict): A szimuláció beállításai.
+        precision (float): A konfidencia intervallum kívánt félszélessége a kezdő tét arányában.
+        confidence (float): A megbízhatósági szint.
+        batch_rounds (int): Ennyi körönként ellenőrzi a pontosságot.
+        max_rounds (int): Legfeljebb ennyi kört játszik.
+        history (list): Ha meg van adva, akkor ehhez a listához fűzi hozzá a körök utáni zseton mennyiségeket.
+        histogram (Count_histogram): Ha meg van adva és a játékos számolja a lapokat, akkor ebbe gyűjti a valódi érték szerinti eredményeket.
+
+    Returns:
+        dict: Az eredmény, ahogy a summarize visszaadja.
+    """
+    ai, g = create_simulation(config)
+    counting = bool(config["bet_system"])
+    stats = Running_stats()
+    while stats.count < max_rounds and not is_precise(stats, precision, confidence):
+        stats.merge(play_batch(ai, g, min(batch_rounds, max_rounds - stats.count), counting, history,
+                               histogram if counting else None))
+    return summarize(stats, precision, confidence)
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
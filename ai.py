@@ -1,6 +1,46 @@
-from blackjack_logic import Game, Player_hand, Player
-from random import randint, choice
-import json
+from blackjack_logic import (Game, Deck, Player_hand, Player, Rules, INFINITE_DECK, CHIP_SCALE, PAYOUT_WIN, PAYOUT_PUSH, PAYOUT_SURRENDER,
+                             INSURANCE_STAKE, PAYOUT_INSURANCE, load_data)
+from betting import load_bet_system
+from random_source import Random_source
+
+CARD_VALUES = range(2, 12)
+
+
+def compile_deck_estimates(decks: int, deck_resolution: float) -> list:
+    """Minden lehetséges hátralévő lapszámhoz előre kiszámolja a hátralévő paklik becsült számát.
+
+    Args:
+        decks (int): A paklik száma.
+        deck_resolution (float): A becslés pontossága paklikban.
+
+    Returns:
+        list: A hátralévő lapok számával indexelhető becslések listája.
+    """
+    if deck_resolution == 1:
+        return [remaining // 52 for remaining in range(decks * 52 + 1)]
+    elif deck_resolution == 0:
+        return [remaining / 52 for remaining in range(decks * 52 + 1)]
+    return [remaining // (52 * deck_resolution) * deck_resolution for remaining in range(decks * 52 + 1)]
+
+
+def load_tag_matrix(systems: list = None) -> dict:
+    """Betölti a lapszámolási technikák címkéit a data/counting_systems.json fájlból.
+
+    Args:
+        systems (list): A technikák nevei, ha nincs megadva, akkor az összes.
+
+    Returns:
+        dict: Technikánként a 2-11 lapértékek címkéinek a listája.
+    """
+    data = load_data('counting_systems')
+    rows = {}
+    for name in (data if systems is None else systems):
+        tags = dict.fromkeys(CARD_VALUES, 0.0)
+        for tag, values in data[name].items():
+            for value in values:
+                tags[value] = float(tag)
+        rows[name] = [tags[value] for value in CARD_VALUES]
+    return rows
 
 
 class Card_counter:
@@ -48,19 +88,48 @@ class Card_counter:
     150
     >>> c.calculate_bet(100, 120)
     120
+    >>> c = Card_counter('Hi-Lo', 6, '1-8 spread', 0.5)
+    >>> c.running_count([2, 3, 4, 5, 6, 2, 3, 4, 5, 6])
+    >>> c._remaining_cards
+    302
+    >>> c._calculate_decks_remaining()
+    5.5
+    >>> c._calculate_true_count()
+    1.8181818181818181
+    >>> c.calculate_bet(100, 3000)
+    100
+    >>> c.running_count([2, 3, 4, 5, 6, 2, 3])
+    >>> c.calculate_bet(100, 3000)
+    400
+    >>> c = Card_counter('Hi-Lo', 1, 'Linear', 0)
+    >>> c.running_count([2] * 26)
+    >>> c._calculate_decks_remaining()
+    0.5
+    >>> c._calculate_true_count()
+    52.0
+    >>> c = Card_counter('Hi-Lo', 0)
+    >>> c.running_count([2, 3, 4, 5, 6])
+    >>> c.get_true_count()
+    0
     """
 
-    def __init__(self, system: str, decks: int) -> None:
-        """Betölti a megadott lapszámlálási technikát, majd eltárolja azt.
+    def __init__(self, system: str, decks: int, bet_ramp: str = 'Linear', deck_resolution: float = 1) -> None:
+        """Betölti a megadott lapszámlálási technikát és tétrendszert, majd eltárolja azokat.
 
         Args:
             system (str): A kiválasztott kártyaszámolási technika neve.
-            decks (int): A paklik száma.
+            decks (int): A paklik száma. Végtelen pakli esetén a valódi érték mindig 0.
+            bet_ramp (str): A tétrendszer neve a data/bet_ramps.json fájlban.
+            deck_resolution (float): A hátralévő paklik becslésének a pontossága. 1 esetén egész paklira,
+                0.5 esetén fél paklira lefelé kerekít, 0 esetén pedig a pontos tört értéket használja.
         """
         self._decks = decks
         self._reset_count()
-        with open(f'data/counting_systems.json') as f:
-            self._system = json.load(f)[system]
+        self._system = load_data('counting_systems')[system]
+        self._bet_system = load_bet_system(bet_ramp)
+        self._deck_estimates = compile_deck_estimates(decks, deck_resolution)
+        if decks == INFINITE_DECK:
+            self.running_count = self._ignore_cards
 
     def _reset_count(self) -> None:
         """Alaphelyzetbe állítja a számlálót."""
@@ -89,13 +158,20 @@ class Card_counter:
         for card in cards:
             self._counting(card)
 
+    def _ignore_cards(self, cards: list) -> None:
+        """Végtelen paklinál a kihúzott lapok nem változtatják meg a pakli összetételét, így nincs mit számolni.
+
+        Args:
+            cards (list): A kártya értékek listája.
+        """
+
     def _calculate_decks_remaining(self) -> int:
         """Kiszámolja, hogy hány pakli van még hátra a következő keverésig.
 
         Returns:
             int: A hátralévő paklik száma.
         """
-        return self._remaining_cards // 52
+        return self._deck_estimates[self._remaining_cards]
 
     def _calculate_true_count(self) -> int:
         """Kiszámolja a valódi értéket. Ha több paklival játszanak, akkor a számláló értékét el kell osztani a hátralévő paklik számával.
@@ -108,22 +184,129 @@ class Card_counter:
             return self._count
         return self._count / decks_remaining
 
-    def calculate_bet(self, min_bet: int, max_bet: int) -> int:
-        """Kiszámolja az optimális tétet a valódi érték alapján.
+    def get_true_count(self) -> float:
+        """Visszaadja az aktuális valódi értéket.
+
+        Returns:
+            float: A valódi érték.
+        """
+        return self._calculate_true_count()
+
+    def calculate_bet(self, min_bet: int, max_bet: int, bankroll: int = 0) -> int:
+        """Kiszámolja az optimális tétet a valódi érték alapján a beállított tétrendszerrel.
 
         Args:
             min_bet (int): Minimum tét.
             max_bet (int): Maximum tét.
+            bankroll (int): A játékos zsetonjainak az értéke, a Kelly-féle tétrendszer használja.
 
         Returns:
             int: Az optimális tét.
         """
-        bet = (self._calculate_true_count() - 1) * min_bet
-        if bet < min_bet:
-            return min_bet
-        elif bet > max_bet:
-            return max_bet
-        return round(bet)
+        return self._bet_system.calculate_bet(self._calculate_true_count(), min_bet, max_bet, bankroll)
+
+
+class Multi_counter:
+    """Egyszerre több lapszámolási technikát számol ugyanazokból a lapokból. A technikák címkéi egy mátrixba fordulnak le
+    (technikák × lapértékek), a kiosztott lapokból lapértékenként egy gyakorisági tábla készül, és minden futó érték
+    ezzel egyetlen mátrix-vektor szorzással frissül. Az eredmény lapról lapra megegyezik a technikánkénti Card_counter-ével.
+    >>> systems = ['Hi-Lo', 'Omega II', 'Halves']
+    >>> m = Multi_counter(systems, 1)
+    >>> counters = [Card_counter(system, 1) for system in systems]
+    >>> cards = [10, 5, 2, 3, 8, 7, 5, 11, 9, 4, 6, 6] * 5
+    >>> for start in range(0, len(cards), 7):
+    ...     m.running_count(cards[start:start + 7])
+    ...     for c in counters:
+    ...         c.running_count(cards[start:start + 7])
+    >>> m.get_true_counts() == [c.get_true_count() for c in counters]
+    True
+    >>> m.get_true_counts()
+    [3.0, 8.0, 3.5]
+    >>> m.calculate_bets(100, 3000, [0, 0, 0])
+    [200, 700, 250]
+    >>> Multi_counter(decks=6).systems == [*load_tag_matrix()]
+    True
+    """
+
+    def __init__(self, systems: list = None, decks: int = 6, bet_ramp: str = 'Linear', deck_resolution: float = 1) -> None:
+        """
+        Args:
+            systems (list): A lapszámolási technikák nevei, ha nincs megadva, akkor a data/counting_systems.json összes technikája.
+            decks (int): A paklik száma. Végtelen pakli esetén a valódi értékek mindig 0-k.
+            bet_ramp (str): A tétrendszer neve a data/bet_ramps.json fájlban, minden technika ezzel számolja a tétjét.
+            deck_resolution (float): A hátralévő paklik becslésének a pontossága.
+        """
+        rows = load_tag_matrix(systems)
+        self.systems = [*rows]
+        self._tags = [*rows.values()]
+        self._decks = decks
+        self._reset_count()
+        self._bet_system = load_bet_system(bet_ramp)
+        self._deck_estimates = compile_deck_estimates(decks, deck_resolution)
+        if decks == INFINITE_DECK:
+            self.running_count = self._ignore_cards
+
+    def _reset_count(self) -> None:
+        """Alaphelyzetbe állítja a számlálókat."""
+        self._counts = [0.0] * len(self._tags)
+        self._remaining_cards = self._decks * 52
+
+    def _count_histogram(self, cards: list) -> None:
+        """A lapok gyakorisági táblája alapján frissíti az összes futó értéket.
+
+        Args:
+            cards (list): A kártya értékek listája.
+        """
+        histogram = [0] * 12
+        for card in cards:
+            histogram[card] += 1
+        dealt = [(value - 2, histogram[value]) for value in CARD_VALUES if histogram[value]]
+        self._counts = [count + sum(tags[index] * n for index, n in dealt) for count, tags in zip(self._counts, self._tags)]
+        self._remaining_cards -= len(cards)
+
+    def running_count(self, cards: list) -> None:
+        """Egy adag kiosztott lapot számol meg az összes technikával. Ha a cipő közben elfogy, akkor ugyanott állítja nullára
+        a számlálókat, ahol a Card_counter.
+
+        Args:
+            cards (list): A kártya értékek listája.
+        """
+        while len(cards) >= self._remaining_cards:
+            last_shoe, cards = cards[:self._remaining_cards], cards[self._remaining_cards:]
+            self._count_histogram(last_shoe)
+            self._reset_count()
+        self._count_histogram(cards)
+
+    def _ignore_cards(self, cards: list) -> None:
+        """Végtelen paklinál a kihúzott lapok nem változtatják meg a pakli összetételét, így nincs mit számolni.
+
+        Args:
+            cards (list): A kártya értékek listája.
+        """
+
+    def get_true_counts(self) -> list:
+        """Visszaadja a technikák valódi értékeit.
+
+        Returns:
+            list: A valódi értékek a technikák sorrendjében.
+        """
+        decks_remaining = self._deck_estimates[self._remaining_cards]
+        if decks_remaining == 0:
+            return self._counts.copy()
+        return [count / decks_remaining for count in self._counts]
+
+    def calculate_bets(self, min_bet: int, max_bet: int, bankrolls: list) -> list:
+        """Kiszámolja, hogy mekkora tétet tenne meg az egyes technikák szerint játszó játékos.
+
+        Args:
+            min_bet (int): Minimum tét.
+            max_bet (int): Maximum tét.
+            bankrolls (list): A technikák szerint játszó játékosok zsetonjai, a Kelly-féle tétrendszer használja.
+
+        Returns:
+            list: A tétek a technikák sorrendjében.
+        """
+        return self._bet_system.calculate_bets(self.get_true_counts(), min_bet, max_bet, bankrolls)
 
 
 class Strategy:
@@ -166,91 +349,183 @@ class Strategy:
     >>> h.add_card(('♠', '9', 9))
     >>> s.calculate_move(h,('♦', 'Q', 10))
     's'
+    >>> s = Strategy('Illustrious 18')
+    >>> h = Player_hand()
+    >>> h.add_card(('♠', '6', 6))
+    >>> h.add_card(('♠', '10', 10))
+    >>> s.calculate_move(h, ('♦', 'K', 10))
+    'h'
+    >>> s.calculate_move(h, ('♦', 'K', 10), -0.5)
+    'h'
+    >>> s.calculate_move(h, ('♦', 'K', 10), 0)
+    's'
+    >>> h = Player_hand()
+    >>> h.add_card(('♠', '10', 10))
+    >>> h.add_card(('♠', '3', 3))
+    >>> s.calculate_move(h, ('♦', '2', 2), 0)
+    's'
+    >>> s.calculate_move(h, ('♦', '2', 2), -1.5)
+    'h'
+    >>> h = Player_hand()
+    >>> h.add_card(('♠', '6', 6))
+    >>> h.add_card(('♠', '4', 4))
+    >>> s.calculate_move(h, ('♦', 'J', 10), 5)
+    'd'
+    >>> h = Player_hand()
+    >>> h.add_card(('♠', '5', 5))
+    >>> h.add_card(('♠', '2', 2))
+    >>> h.add_card(('♠', '3', 3))
+    >>> s.calculate_move(h, ('♦', 'J', 10), 5)
+    'h'
+    >>> s.take_insurance(2.5), s.take_insurance(3)
+    (False, True)
+    >>> Strategy().take_insurance(10)
+    False
     """
 
-    def __init__(self) -> None:
-        """Betölti a kiválasztott stratégiát, majd eltárolja azt."""
-        with open(f'data/basic_strategy.json') as f:
-            self._strategy = json.load(f)
+    def __init__(self, deviations: str = None, strategy: str = 'basic_strategy') -> None:
+        """Betölti a kiválasztott stratégiát és az eltéréseket, majd lefordítja azokat közvetlenül indexelhető táblázatokká.
+
+        Args:
+            deviations (str): Az eltérések neve a data/deviations.json fájlban. Ha nincs megadva, akkor csak az alapstratégiát használja.
+            strategy (str): A stratégia fájl neve a data mappában (például egy tanult stratégia), vagy egy .json fájl elérési útja,
+                alapértelmezetten az alapstratégia.
+        """
+        self._strategy = load_data(strategy)
+        self._tables = {hand_type: self._compile_table(
+            self._strategy[hand_type]) for hand_type in self._strategy}
+        self._deviations = {hand_type: [[None] * 12 for _ in range(32)]
+                            for hand_type in self._strategy}
+        self._insurance = None
+        if deviations is not None:
+            for deviation in load_data('deviations')[deviations]:
+                if deviation['hand'] == 'insurance':
+                    self._insurance = (deviation['index'], deviation['when'] == '>=')
+                else:
+                    self._deviations[deviation['hand']][deviation['player']][deviation['dealer']] = (
+                        deviation['index'], deviation['when'] == '>=', deviation['move'])
+
+    def _compile_table(self, strategy: dict) -> list:
+        """A stratégia táblázatot a játékos és az osztó értékeivel közvetlenül indexelhető listává alakítja.
+        Ha egy érték nem szerepel a táblázatban, akkor az első sor, illetve oszlop döntése érvényes.
+
+        Args:
+            strategy (dict): A stratégia egy táblázata.
+
+        Returns:
+            list: A [játékos][osztó] indexelésű döntések.
+        """
+        rows = {card: index for index, card in enumerate(strategy['player'])}
+        columns = {card: index for index, card in enumerate(strategy['dealer'])}
+        return [[strategy['move'][rows.get(player, 0)][columns.get(dealer, 0)] for dealer in range(12)]
+                for player in range(32)]
 
-    def _search_move(self, hand_type: str, player: int, dealer: int) -> str:
+    def _search_move(self, hand_type: str, player: int, dealer: int, true_count: float = None) -> str:
         """A stratégiának megfelelő döntést keresi meg, a megadott kéz és kártya értékek alapján.
+        Ha meg van adva a valódi érték és a helyzethez tartozik eltérés, akkor az index átlépésekor az eltérés döntését adja vissza.
 
         Args:
             hand_type (str): A kiválasztott kártyaszámolási technika neve.
             player (int): A stratégiának megfelelő érték, ami a játékoshoz tartozik.
             dealer (int): Az osztó első lapja.
+            true_count (float): A valódi érték.
 
         Returns:
             str: A döntés rövidítve (h=hit, s=stand, d=double down, sp=split).
         """
-        row = 0
-        column = 0
-        strategy = self._strategy[hand_type]
-        for index, card in enumerate(strategy['player']):
-            if player == card:
-                row = index
-        for index, card in enumerate(strategy['dealer']):
-            if dealer == card:
-                column = index
-        return strategy['move'][row][column]
-
-    def calculate_move(self, player_hand: Player_hand, dealer_card: tuple) -> str:
+        if true_count is not None:
+            deviation = self._deviations[hand_type][player][dealer]
+            if deviation is not None and (true_count >= deviation[0]) == deviation[1]:
+                return deviation[2]
+        return self._tables[hand_type][player][dealer]
+
+    def calculate_move(self, player_hand: Player_hand, dealer_card: tuple, true_count: float = None) -> str:
         """A stratégiának megfelelő döntést hozza meg a játékos keze alapján. Figyelembe véve azt, hogy egyzser lehet splitelni és ha a kéz splitelve van akkor nem lehet duplázni.
+        Ha az eltérés döntése nem lehetséges, akkor az alapstratégia döntése érvényes, ha az sem (a lapot nem kérhető splitelt ásznál), akkor megállás.
 
         Args:
             player_hand (Player_hand): A játékos keze.
             dealer_card (int): Az osztó első lapja.
+            true_count (float): A valódi érték, ha a játékos számolja a lapokat.
 
         Returns:
             str: A döntés rövidítve (h=hit, s=stand, d=double down, sp=split).
         """
         moves = player_hand.get_moves()
         if 'sp' in moves:
-            return self._search_move('pair_splitting', player_hand.get_card_values()[0], dealer_card[2])
+            hand_type = 'pair_splitting'
+            player = player_hand.get_card_values()[0]
         elif player_hand.is_in_ace() and player_hand.is_soft():
-            move = self._search_move(
-                'soft_hand', player_hand.get_score()-11, dealer_card[2])
-            return 'h' if move == 'd' and 'd' not in moves else move
+            hand_type = 'soft_hand'
+            player = player_hand.get_score() - 11
         else:
-            move = self._search_move(
-                'hard_hand', player_hand.get_score(), dealer_card[2])
-            return 'h' if move == 'd' and 'd' not in moves else move
+            hand_type = 'hard_hand'
+            player = player_hand.get_score()
+        move = self._search_move(hand_type, player, dealer_card[2], true_count)
+        if move not in moves:
+            move = self._tables[hand_type][player][dealer_card[2]]
+            if move == 'd' and 'd' not in moves:
+                move = 'h'
+            if move not in moves:
+                return 's'
+        return move
+
+    def take_insurance(self, true_count: float = None) -> bool:
+        """Az alapstratégia szerint soha nem érdemes biztosítást kötni, csak ha az eltérések között szerepel és a valódi érték átlépi az indexet.
+
+        Args:
+            true_count (float): A valódi érték, ha a játékos számolja a lapokat.
+
+        Returns:
+            bool: Ha érdemes biztosítást kötni, akkor True-val, különben meg False-al tér vissza.
+        """
+        if true_count is None or self._insurance is None:
+            return False
+        return (true_count >= self._insurance[0]) == self._insurance[1]
 
 
 class AI(Player):
-    def __init__(self, chips: int) -> None:
+    def __init__(self, chips: int, rng: Random_source = None) -> None:
         """A döntéseket és a tét nagyságát fogja eldönteni a megadott paraméterek alapján.
 
         Args:
             chips (int): Zseton, amivel játszik a játékos.
+            rng (Random_source): A véletlenszerű döntésekhez használt véletlenszám forrás.
         """
         super().__init__(chips)
+        self._rng = Random_source() if rng is None else rng
         self._is_basic_strategy = False
         self._is_card_counter = False
 
-    def set_basic_strategy(self) -> None:
-        """Beállítja az alapstratégiát."""
+    def set_basic_strategy(self, deviations: str = None, strategy: str = 'basic_strategy') -> None:
+        """Beállítja az alapstratégiát.
+
+        Args:
+            deviations (str): A valódi értéktől függő eltérések neve. Csak lapszámolással együtt van hatása.
+            strategy (str): A stratégia fájl neve a data mappában, vagy egy .json fájl elérési útja.
+        """
         self._is_basic_strategy = True
-        self._strategy = Strategy()
+        self._strategy = Strategy(deviations, strategy)
 
-    def set_card_counter(self, system: str, decks: int) -> None:
+    def set_card_counter(self, system: str, decks: int, bet_ramp: str = 'Linear', deck_resolution: float = 1) -> None:
         """Beállítja a megadott lapszámolási technikát.
 
         Args:
             system (str): A lapszámolási technika neve.
             decks (int): A paklik száma.
+            bet_ramp (str): A tétrendszer neve.
+            deck_resolution (float): A hátralévő paklik becslésének a pontossága.
         """
         self._is_card_counter = True
-        self._card_counter = Card_counter(system, decks)
+        self._card_counter = Card_counter(system, decks, bet_ramp, deck_resolution)
 
     def _stupid_bet_calculator(self, min_bet: int, max_bet: int) -> int:
         """Ez az AI nem érti a játékot és teljesen véletlenszerűen választja ki a tét méretét."""
-        return randint(min_bet, max_bet)
+        return self._rng.randint(min_bet, max_bet)
 
     def _stupid_strategy(self, hand: Player_hand) -> str:
         """Ez az AI nem érti a játékot és teljesen véletlenszerűen hoz döntéseket."""
-        return choice(hand.get_moves())
+        return self._rng.choice(hand.get_moves())
 
     def get_bet(self, min_bet: int, max_bet: int) -> int:
         """A játékos tétjének a meghatározását végzi el.
@@ -262,7 +537,28 @@ class AI(Player):
         Returns:
             int: A játékos tétjének a nagysága.
         """
-        return self._card_counter.calculate_bet(min_bet, max_bet) if self._is_card_counter else self._stupid_bet_calculator(min_bet, max_bet)
+        return self._card_counter.calculate_bet(min_bet, max_bet, self.get_chips_value()) if self._is_card_counter else self._stupid_bet_calculator(min_bet, max_bet)
+
+    def get_true_count(self) -> float:
+        """A valódi érték, amivel a játékos a következő tétet megteszi.
+
+        Returns:
+            float: A valódi érték, vagy None, ha a játékos nem számolja a lapokat.
+        """
+        return self._card_counter.get_true_count() if self._is_card_counter else None
+
+    def get_insurance(self, dealer_card: tuple) -> bool:
+        """A játékos eldönti, hogy köt-e biztosítást.
+
+        Args:
+            dealer_card (tuple): Az osztó első lapja.
+
+        Returns:
+            bool: Ha a játékos biztosítást köt, akkor True-val, különben meg False-al tér vissza.
+        """
+        if self._is_basic_strategy:
+            return self._strategy.take_insurance(self._card_counter.get_true_count() if self._is_card_counter else None)
+        return self._rng.choice((True, False))
 
     def get_move(self, player_hand: Player_hand, dealer_card: tuple) -> str:
         """A játékos döntését adja meg.
@@ -272,9 +568,11 @@ class AI(Player):
             dealer_card (int): Az osztó első lapja.
 
         Returns:
-            str: A döntés rövidítve (h=hit, s=stand, d=double down, sp=split).
+            str: A döntés rövidítve (h=hit, s=stand, d=double down, sp=split, r=surrender).
         """
-        return self._strategy.calculate_move(player_hand, dealer_card) if self._is_basic_strategy else self._stupid_strategy(player_hand)
+        if self._is_basic_strategy:
+            return self._strategy.calculate_move(player_hand, dealer_card, self._card_counter.get_true_count() if self._is_card_counter else None)
+        return self._stupid_strategy(player_hand)
 
     def view_cards_on_the_table(self, cards: list) -> None:
         """Végignézi a kártya értékekeet, azaz megszámolja azokat.
@@ -288,15 +586,19 @@ class AI(Player):
 class Game_simulation(Game):
     """A szimuláció szsámára definiált Game osztály. A kártyaszámolást is "támogatja". """
 
-    def __init__(self, player: Player, min_bet: int, max_bet: int, deck_count: int) -> None:
+    def __init__(self, player: Player, min_bet: int, max_bet: int, deck_count: int, rules: Rules = None, rng: Random_source = None,
+                 deck: Deck = None) -> None:
         """
         Args:
             player (Player): A megadott játékos, aki játszani fog.
             min_bet (int): Minimum tét.
             max_bet (int): Maximum tét.
             deck_count (int): A paklik száma.
+            rules (Rules): A játékszabályok.
+            rng (Random_source): A pakli véletlenszám forrása.
+            deck (Deck): Ha meg van adva, akkor ebből a pakliból oszt.
         """
-        super().__init__(player, min_bet, max_bet, deck_count)
+        super().__init__(player, min_bet, max_bet, deck_count, rules, rng, deck)
 
     def get_cards_on_the_table(self) -> list:
         """Visszaadja az asztalon lévő kártyák értékeit.
@@ -306,8 +608,344 @@ class Game_simulation(Game):
         """
         cards = self._dealer.hand.get_card_values()
         cards.extend(self._player.main_hand.get_card_values())
-        if self._player.main_hand.is_split_hand:
-            cards.extend(self._player.split_hand.get_card_values())
+        for hand in self._player.split_hands:
+            cards.extend(hand.get_card_values())
+        return cards
+
+
+HAND_STATE, HAND_BET, HAND_STAND, HAND_SPLIT, HAND_CAN_SPLIT, HAND_SURRENDERED, HAND_CARDS, HAND_SPLIT_ACE = range(8)
+
+
+class Table_game(Game_simulation):
+    """Táblázat alapú játékmenet. A kéz egy kis egész szám, az állapot (a lapok összege, van-e ász, a lapok száma
+    és a pár értéke), a lapok hatására bekövetkező állapotváltozások és a stratégia döntései állapotonként és
+    osztó laponként előre ki vannak számolva, így egy kéz lejátszása csak táblázatokból olvasás.
+    Ugyanazzal a véletlenszám forrással ugyanazt a játékot játssza, mint a Game_simulation, beleértve a Hand osztály sajátosságait is:
+    az ász értéke csak egyszer csökken 10-zel, és 21 vagy annál nagyobb értéknél a kéz nem vesz fel több lapot.
+    A játékos beállításait (alapstratégia, lapszámolás) az első kör előtt kell megadni, mert az első kör fordítja le a táblázatokat.
+    >>> def play(engine, rules, basic_strategy, system=None, deviations=None, decks=6, rounds=3000):
+    ...     rng = Random_source(5)
+    ...     ai = AI(10 ** 6, rng)
+    ...     g = engine(ai, 100, 3000, decks, rules, rng)
+    ...     if system:
+    ...         ai.set_card_counter(system, decks)
+    ...     if basic_strategy:
+    ...         ai.set_basic_strategy(deviations)
+    ...     history = []
+    ...     for _ in range(rounds):
+    ...         g.round()
+    ...         if system:
+    ...             ai.view_cards_on_the_table(g.get_cards_on_the_table())
+    ...         history.append(g.get_player_chips_value())
+    ...     return history
+    >>> play(Table_game, None, True, 'Hi-Lo', 'Illustrious 18') == play(Game_simulation, None, True, 'Hi-Lo', 'Illustrious 18')
+    True
+    >>> rules = Rules(dealer_hits_soft_17=True, double_after_split=True, max_hands=4, resplit_aces=True,
+    ...               hit_split_aces=False, surrender=True, insurance=True, blackjack_payout=1.2)
+    >>> play(Table_game, rules, False, 'Halves', decks=1) == play(Game_simulation, rules, False, 'Halves', decks=1)
+    True
+    >>> play(Table_game, rules, True, 'Hi-Lo', 'Fab 4', decks=2) == play(Game_simulation, rules, True, 'Hi-Lo', 'Fab 4', decks=2)
+    True
+    >>> play(Table_game, None, True, decks=INFINITE_DECK) == play(Game_simulation, None, True, decks=INFINITE_DECK)
+    True
+    >>> g = Table_game(AI(1000), 100, 3000, 6, rules)
+    >>> aces = g._hit[g._first[11]][11]
+    >>> g._moves[aces][4 + 2 + 1], g._moves[aces][4 + 1], g._moves[aces][2 + 1]
+    (['s', 'sp'], ['s'], ['s', 'h', 'd', 'sp'])
+    """
+
+    def __init__(self, player: AI, min_bet: int, max_bet: int, deck_count: int, rules: Rules = None, rng: Random_source = None,
+                 deck: Deck = None) -> None:
+        """
+        Args:
+            player (AI): A megadott játékos, aki játszani fog.
+            min_bet (int): Minimum tét.
+            max_bet (int): Maximum tét.
+            deck_count (int): A paklik száma.
+            rules (Rules): A játékszabályok.
+            rng (Random_source): A pakli véletlenszám forrása.
+            deck (Deck): Ha meg van adva, akkor ebből a pakliból oszt.
+        """
+        super().__init__(player, min_bet, max_bet, deck_count, rules, rng, deck)
+        self._compile_states()
+        self._dealer_cards = []
+        self._hands = []
+
+    def _compile_states(self) -> None:
+        """Bejárja a kéz összes elérhető állapotát, és kiszámolja az állapotváltozásokat és az állapotok tulajdonságait.
+        Egy állapot a lapok összege (az ászt 11-nek számolva), van-e ász a kézben, a lapok száma (legfeljebb 3, ami 3 vagy több lapot jelent)
+        és az első lap értéke, ha egy lap van a kézben, illetve a pár értéke, ha a két lap egy párt alkot.
+        """
+        keys = [(0, False, 0, 0)]
+        index = {keys[0]: 0}
+        self._hit = []
+        for raw, ace, count, pair in keys:
+            score = raw - 10 if ace and raw > 21 else raw
+            row = [0] * 12
+            for value in range(2, 12):
+                if score >= 21:
+                    row[value] = index[(raw, ace, count, pair)]
+                    continue
+                if count == 0:
+                    new_pair = value
+                elif count == 1:
+                    new_pair = value if value == pair else 0
+                else:
+                    new_pair = 0
+                key = (raw + value, ace or value == 11, min(count + 1, 3), new_pair)
+                if key not in index:
+                    index[key] = len(keys)
+                    keys.append(key)
+                row[value] = index[key]
+            self._hit.append(row)
+        self._first = self._hit[0]
+        self._scores = [raw - 10 if ace and raw > 21 else raw for raw, ace, _, _ in keys]
+        self._soft = [ace and raw <= 21 for raw, ace, _, _ in keys]
+        self._aces = [ace for _, ace, _, _ in keys]
+        self._two_cards = [count == 2 for _, _, count, _ in keys]
+        self._pairs = [pair for _, _, _, pair in keys]
+        self._done = [score >= 21 for score in self._scores]
+        self._blackjack = [two_cards and score == 21 for two_cards, score in zip(self._two_cards, self._scores)]
+        if self._rules.dealer_hits_soft_17:
+            self._dealer_stand = [score > 17 or (score == 17 and not soft) for score, soft in zip(self._scores, self._soft)]
+        else:
+            self._dealer_stand = [score > 16 for score in self._scores]
+        moves = self._rules.moves
+        split_ace_moves = self._rules.split_ace_moves
+        self._moves = [[split_ace_moves[two_cards and can_split and pair != 0] if split_ace
+                        else moves[two_cards][two_cards and can_split and pair != 0][is_split_hand]
+                        for split_ace in (False, True) for can_split in (False, True) for is_split_hand in (False, True)]
+                       for two_cards, pair in zip(self._two_cards, self._pairs)]
+
+    def _compile_strategy(self) -> None:
+        """Állapotonként, a kéz jelzőinek a kombinációjaként és osztó laponként előre meghatározza a stratégia döntéseit és az eltéréseket,
+        ugyanúgy, ahogy a Strategy.calculate_move tenné. Ha nincs alapstratégia, akkor a véletlenszerű döntések a lépések listájából történnek."""
+        self._is_basic_strategy = self._player._is_basic_strategy
+        self._is_card_counter = self._player._is_card_counter
+        self._actions = None
+        self._deviations = None
+        if not self._is_basic_strategy:
+            return
+        strategy = self._player._strategy
+        self._actions = []
+        self._deviations = []
+        has_deviations = False
+        for state, state_moves in enumerate(self._moves):
+            actions = []
+            deviations = []
+            for moves in state_moves:
+                if 'sp' in moves:
+                    hand_type, player = 'pair_splitting', self._pairs[state]
+                elif self._aces[state] and self._soft[state]:
+                    hand_type, player = 'soft_hand', self._scores[state] - 11
+                else:
+                    hand_type, player = 'hard_hand', self._scores[state]
+                row = []
+                deviation_row = []
+                for dealer in range(12):
+                    move = strategy._tables[hand_type][player][dealer]
+                    if move not in moves and move == 'd':
+                        move = 'h'
+                    if move not in moves:
+                        move = 's'
+                    row.append(move)
+                    deviation = strategy._deviations[hand_type][player][dealer]
+                    if deviation is not None and deviation[2] not in moves:
+                        deviation = None
+                    has_deviations = has_deviations or deviation is not None
+                    deviation_row.append(deviation)
+                actions.append(row)
+                deviations.append(deviation_row)
+            self._actions.append(actions)
+            self._deviations.append(deviations)
+        if not (has_deviations and self._is_card_counter):
+            self._deviations = None
+
+    def round(self) -> None:
+        """Az első körben lefordítja a stratégiát, utána a kör közvetlenül a táblázatokkal játszódik le."""
+        self._compile_strategy()
+        self.round = self._round
+        self._round()
+
+    def _deal_value(self, hand: list) -> None:
+        """Oszt egy lapot a megadott kézre. Ha a kéz értéke már legalább 21, akkor a lap kimegy a pakliból, de a kézbe nem kerül.
+
+        Args:
+            hand (list): A kéz.
+        """
+        value = self._deal_card()[2]
+        state = hand[HAND_STATE]
+        if not self._done[state]:
+            hand[HAND_STATE] = self._hit[state][value]
+            hand[HAND_CARDS].append(value)
+
+    def _split(self, hand: list) -> int:
+        """Kettéosztja a kezet, ugyanúgy, ahogy a Player.split és a Game._move teszi.
+
+        Args:
+            hand (list): A splitelendő kéz.
+
+        Returns:
+            int: A split miatt a játékostól elvett zseton mennyiség.
+        """
+        hands = self._hands
+        rules = self._rules
+        bet = hand[HAND_BET]
+        value = self._pairs[hand[HAND_STATE]]
+        hand[HAND_STATE] = self._first[value]
+        hand[HAND_CARDS].pop()
+        hand[HAND_SPLIT] = True
+        split_hand = [self._first[value], bet, False, True, True, False, [value], False]
+        hands.append(split_hand)
+        can_split = len(hands) < rules.max_hands and (value != 11 or rules.resplit_aces)
+        for player_hand in hands:
+            player_hand[HAND_CAN_SPLIT] = can_split
+        self._deal_value(hand)
+        self._deal_value(split_hand)
+        if not rules.hit_split_aces and value == 11:
+            for split_ace in (hand, split_hand):
+                split_ace[HAND_SPLIT_ACE] = True
+                split_ace[HAND_STAND] = 'sp' not in self._moves[split_ace[HAND_STATE]][4 + 2 * split_ace[HAND_CAN_SPLIT] + split_ace[HAND_SPLIT]]
+        return bet
+
+    def _play_hand(self, hand: list, dealer: int, true_count: float) -> int:
+        """Lejátssza a kezet, amíg meg nem áll, ugyanúgy, ahogy a Game.move_and_check teszi.
+
+        Args:
+            hand (list): A kéz.
+            dealer (int): Az osztó első lapjának az értéke.
+            true_count (float): A valódi érték, ha az eltéréseket figyelembe kell venni.
+
+        Returns:
+            int: A duplázások és splitek miatt a játékostól elvett zseton mennyiség.
+        """
+        paid = 0
+        done = self._done
+        while not hand[HAND_STAND]:
+            state = hand[HAND_STATE]
+            flags = 4 * hand[HAND_SPLIT_ACE] + 2 * hand[HAND_CAN_SPLIT] + hand[HAND_SPLIT]
+            if self._actions is None:
+                move = self._player._rng.choice(self._moves[state][flags])
+            else:
+                move = self._actions[state][flags][dealer]
+                if self._deviations is not None:
+                    deviation = self._deviations[state][flags][dealer]
+                    if deviation is not None and (true_count >= deviation[0]) == deviation[1]:
+                        move = deviation[2]
+            if move == 'h':
+                self._deal_value(hand)
+            elif move == 's':
+                hand[HAND_STAND] = True
+            elif move == 'd' and move in self._moves[state][flags]:
+                paid += hand[HAND_BET]
+                hand[HAND_BET] += hand[HAND_BET]
+                self._deal_value(hand)
+                hand[HAND_STAND] = True
+            elif move == 'sp' and move in self._moves[state][flags]:
+                paid += self._split(hand)
+            elif move == 'r' and move in self._moves[state][flags]:
+                hand[HAND_STAND] = True
+                hand[HAND_SURRENDERED] = True
+            else:
+                raise Exception('Wrong move')
+            if done[hand[HAND_STATE]]:
+                hand[HAND_STAND] = True
+        return paid
+
+    def _round(self) -> None:
+        """Egy kör a táblázatok alapján, ugyanazokkal a lépésekkel és ugyanabban a sorrendben, mint a Game.round."""
+        player = self._player
+        hit = self._hit
+        bet = player.get_bet(self._min_bet, self._max_bet)
+        self._round_bet = bet
+        chips = player._chips - bet * CHIP_SCALE
+        main_hand = [0, bet, False, False, True, False, [], False]
+        self._hands = hands = [main_hand]
+        self._dealer_cards = dealer_cards = []
+        self._deal_value(main_hand)
+        dealer_card = self._deal_card()
+        dealer_cards.append(dealer_card[2])
+        self._deal_value(main_hand)
+        dealer_cards.append(self._deal_card()[2])
+        dealer_state = hit[self._first[dealer_cards[0]]][dealer_cards[1]]
+        dealer_blackjack = self._blackjack[dealer_state]
+        if self._rules.insurance and dealer_cards[0] == 11:
+            if player.get_insurance(dealer_card):
+                chips -= bet * INSURANCE_STAKE
+                if dealer_blackjack:
+                    chips += bet * PAYOUT_INSURANCE
+        player_blackjack = self._blackjack[main_hand[HAND_STATE]]
+        if player_blackjack and dealer_blackjack:
+            player._chips = chips + bet * PAYOUT_PUSH
+            return
+        elif player_blackjack:
+            player._chips = chips + bet * self._rules.blackjack_units
+            return
+        elif dealer_blackjack:
+            player._chips = chips
+            return
+
+        true_count = player._card_counter.get_true_count() if self._deviations is not None else None
+        dealer = dealer_cards[0]
+        i = 0
+        while i < len(hands):
+            chips -= self._play_hand(hands[i], dealer, true_count) * CHIP_SCALE
+            i += 1
+
+        player._chips = chips + self._settle(hands, self._play_dealer(dealer_state, dealer_cards))
+
+    def _play_dealer(self, dealer_state: int, dealer_cards: list) -> int:
+        """Az osztó lapot kér, amíg a szabályok szerint meg nem áll.
+
+        Args:
+            dealer_state (int): Az osztó kezének az állapota.
+            dealer_cards (list): Az osztó lapjai, ehhez fűzi hozzá az új lapokat.
+
+        Returns:
+            int: Az osztó kezének a végső állapota.
+        """
+        hit = self._hit
+        dealer_stand = self._dealer_stand
+        while not dealer_stand[dealer_state]:
+            value = self._deal_card()[2]
+            dealer_state = hit[dealer_state][value]
+            dealer_cards.append(value)
+        return dealer_state
+
+    def _settle(self, hands: list, dealer_state: int) -> int:
+        """Kifizeti a kezeket az osztó végső állapota alapján.
+
+        Args:
+            hands (list): A játékos kezei.
+            dealer_state (int): Az osztó kezének a végső állapota.
+
+        Returns:
+            int: A játékosnak visszajáró zseton mennyiség a tétekkel együtt, zseton egységben (1 / CHIP_SCALE zseton).
+        """
+        scores = self._scores
+        dealer_score = scores[dealer_state]
+        dealer_bust = dealer_score > 21
+        chips = 0
+        for hand in hands:
+            if hand[HAND_SURRENDERED]:
+                chips += hand[HAND_BET] * PAYOUT_SURRENDER
+                continue
+            score = scores[hand[HAND_STATE]]
+            if (score == 21 and dealer_score == 21) or (score == dealer_score and not dealer_bust):
+                chips += hand[HAND_BET] * PAYOUT_PUSH
+            elif (score > dealer_score and score <= 21) or (dealer_bust and score <= 21):
+                chips += hand[HAND_BET] * PAYOUT_WIN
+        return chips
+
+    def get_cards_on_the_table(self) -> list:
+        """Visszaadja az asztalon lévő kártyák értékeit, ugyanabban a sorrendben, mint a Game_simulation.
+
+        Returns:
+            list: A kártya értékek listája.
+        """
+        cards = self._dealer_cards.copy()
+        for hand in self._hands:
+            cards.extend(hand[HAND_CARDS])
         return cards
 
 
@@ -0,0 +1,205 @@
+from ai import AI, Game_simulation, Strategy, Table_game
+from blackjack_logic import Deck, Player_hand
+from random_source import Random_source
+from time import perf_counter
+import random
+import subprocess
+import sys
+
+
+def _best_time(function, repeat: int = 5) -> float:
+    """Többször lefuttatja a megadott függvényt és a leggyorsabb futás idejét adja vissza.
+
+    Args:
+        function (callable): A mérendő függvény.
+        repeat (int): A futtatások száma.
+
+    Returns:
+        float: A leggyorsabb futás ideje másodpercben.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        start = perf_counter()
+        function()
+        best = min(best, perf_counter() - start)
+    return best
+
+
+def _sample_decisions(count: int) -> list:
+    """Véletlenszerű döntési helyzeteket hoz létre: két lapos kezet, osztó lapot és valódi értéket.
+
+    Args:
+        count (int): A helyzetek száma.
+
+    Returns:
+        list: A (kéz, osztó lapja, valódi érték) hármasok listája.
+    """
+    rng = Random_source(0)
+    deck = Deck(8, rng)
+    decisions = []
+    for _ in range(count):
+        if len(deck._deck) < 3:
+            deck.deck_init()
+        hand = Player_hand()
+        hand.add_card(deck.get_a_card())
+        hand.add_card(deck.get_a_card())
+        decisions.append((hand, deck.get_a_card(), rng.random() * 12 - 6))
+    return decisions
+
+
+def benchmark_decisions(deviations: str = None, count: int = 100000) -> float:
+    """Megméri, hogy a stratégia másodpercenként hány döntést hoz.
+
+    Args:
+        deviations (str): Az eltérések neve, ha None, akkor csak az alapstratégiát méri.
+        count (int): A döntések száma egy futás alatt.
+
+    Returns:
+        float: Döntések másodpercenként.
+    """
+    strategy = Strategy(deviations)
+    decisions = _sample_decisions(count)
+    if deviations is None:
+        def run():
+            for hand, dealer_card, _ in decisions:
+                strategy.calculate_move(hand, dealer_card)
+    else:
+        def run():
+            for hand, dealer_card, true_count in decisions:
+                strategy.calculate_move(hand, dealer_card, true_count)
+    return count / _best_time(run)
+
+
+def benchmark_rounds(rounds: int = 20000, deck_count: int = 6, basic_strategy: bool = True, system: str = None, deviations: str = None,
+                     engine: type = Game_simulation) -> float:
+    """Megméri, hogy a szimuláció másodpercenként hány kört játszik le.
+
+    Args:
+        rounds (int): A körök száma egy futás alatt.
+        deck_count (int): A paklik száma.
+        basic_strategy (bool): Alkalmazza-e az alapstratégiát.
+        system (str): A lapszámolási technika neve, ha None, akkor nem számol lapot.
+        deviations (str): Az eltérések neve.
+        engine (type): A játékmenet osztálya, Game_simulation vagy Table_game.
+
+    Returns:
+        float: Körök másodpercenként.
+    """
+    def run():
+        rng = Random_source(0)
+        ai = AI(10 ** 9, rng)
+        g = engine(ai, 100, 3000, deck_count, rng=rng)
+        if system is not None:
+            ai.set_card_counter(system, deck_count)
+        if basic_strategy:
+            ai.set_basic_strategy(deviations)
+        for _ in range(rounds):
+            g.round()
+            if system is not None:
+                ai.view_cards_on_the_table(g.get_cards_on_the_table())
+    return rounds / _best_time(run, 3)
+
+
+def benchmark_random_source(count: int = 100000) -> dict:
+    """Összehasonlítja a random modul és a pufferelt véletlenszám forrás egy hívásának az idejét.
+
+    Args:
+        count (int): A hívások száma egy futás alatt.
+
+    Returns:
+        dict: A hívásonkénti idők nanoszekundumban, (random modul, Random_source) párokban.
+    """
+    rng = Random_source(0)
+    moves = ['s', 'h', 'd', 'sp']
+    cards = list(range(312))
+    shuffles = count // 312
+
+    def python_choice():
+        for _ in range(count):
+            random.choice(moves)
+
+    def buffered_choice():
+        for _ in range(count):
+            rng.choice(moves)
+
+    def python_randint():
+        for _ in range(count):
+            random.randint(100, 3000)
+
+    def buffered_randint():
+        for _ in range(count):
+            rng.randint(100, 3000)
+
+    def python_shuffle():
+        for _ in range(shuffles):
+            random.shuffle(cards)
+
+    def buffered_shuffle():
+        for _ in range(shuffles):
+            rng.shuffle(cards)
+
+    return {
+        'choice': (_best_time(python_choice) / count * 1e9, _best_time(buffered_choice) / count * 1e9),
+        'randint': (_best_time(python_randint) / count * 1e9, _best_time(buffered_randint) / count * 1e9),
+        'shuffle (6 decks)': (_best_time(python_shuffle) / shuffles * 1e9, _best_time(buffered_shuffle) / shuffles * 1e9),
+    }
+
+
+_FIRST_WINDOW = """
+from time import perf_counter
+start = perf_counter()
+from simulation_gui import Simulation_window
+w = Simulation_window()
+w.update()
+print(perf_counter() - start, 'matplotlib' in __import__('sys').modules)
+"""
+
+_FIRST_ROUND = """
+from time import perf_counter
+start = perf_counter()
+from ai import AI, Game_simulation
+g = Game_simulation(AI(5000), 100, 3000, 6)
+g.round()
+modules = __import__('sys').modules
+print(perf_counter() - start, 'tkinter' in modules or 'matplotlib' in modules)
+"""
+
+
+def benchmark_startup() -> dict:
+    """Új Python folyamatban megméri az importálástól az első ablak megjelenéséig és az első lejátszott körig eltelt időt.
+
+    Returns:
+        dict: Az idők másodpercben és hogy betöltődött-e közben grafikus modul. Ha nincs kijelző, akkor az ablakhoz tartozó érték None.
+    """
+    results = {}
+    for name, code in (('first window', _FIRST_WINDOW), ('first round', _FIRST_ROUND)):
+        process = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True)
+        if process.returncode != 0:
+            results[name] = None
+        else:
+            elapsed, loaded = process.stdout.split()
+            results[name] = (float(elapsed), loaded == 'True')
+    return results
+
+
+if __name__ == '__main__':
+    basic = benchmark_decisions()
+    deviations = benchmark_decisions('Illustrious 18')
+    print(f'Basic strategy decisions/sec:          {basic:12.0f}')
+    print(f'Basic strategy + I18 decisions/sec:    {deviations:12.0f}')
+    print(f'Deviation cost per decision:           {(1 / deviations - 1 / basic) * 1e9:12.0f} ns')
+    print(f'Rounds/sec, basic strategy:            {benchmark_rounds():12.0f}')
+    print(f'Rounds/sec, Hi-Lo counter:             {benchmark_rounds(system="Hi-Lo"):12.0f}')
+    print(f'Rounds/sec, Hi-Lo counter + I18:       {benchmark_rounds(system="Hi-Lo", deviations="Illustrious 18"):12.0f}')
+    print(f'Rounds/sec, random strategy:           {benchmark_rounds(basic_strategy=False):12.0f}')
+    print(f'Rounds/sec, infinite deck:             {benchmark_rounds(deck_count=0):12.0f}')
+    print(f'Rounds/sec, table engine:              {benchmark_rounds(engine=Table_game):12.0f}')
+    print(f'Rounds/sec, table engine + Hi-Lo + I18:{benchmark_rounds(system="Hi-Lo", deviations="Illustrious 18", engine=Table_game):12.0f}')
+    print(f'Rounds/sec, table engine, random:      {benchmark_rounds(basic_strategy=False, engine=Table_game):12.0f}')
+    for name, (python_time, buffered_time) in benchmark_random_source().items():
+        print(f'{name + ", random / Random_source:":39}{python_time:9.0f} ns / {buffered_time:.0f} ns')
+    for name, result in benchmark_startup().items():
+        if result is None:
+            print(f'{"Import to " + name + ":":39}{"n/a (no display)":>12}')
+        else:
+            print(f'{"Import to " + name + ":":39}{result[0] * 1000:9.1f} ms, GUI modules loaded: {result[1]}')
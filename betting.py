@@ -0,0 +1,276 @@
+from blackjack_logic import load_data
+from array import array
+from math import floor
+import json
+
+MIN_TRUE_COUNT = -10
+MAX_TRUE_COUNT = 20
+
+
+def _count_index(true_count: float) -> int:
+    """A valódi értékhez tartozó indexet adja meg a lefordított táblázatokban.
+
+    Args:
+        true_count (float): A valódi érték.
+
+    Returns:
+        int: A lefelé kerekített, a táblázat határai közé szorított valódi érték indexe.
+    """
+    if true_count <= MIN_TRUE_COUNT:
+        return 0
+    elif true_count >= MAX_TRUE_COUNT:
+        return MAX_TRUE_COUNT - MIN_TRUE_COUNT
+    return floor(true_count) - MIN_TRUE_COUNT
+
+
+class Bet_system:
+    """A tétrendszerek közös felülete. A valódi érték, a tét határok és a játékos zsetonjai alapján határozza meg a tétet."""
+
+    def calculate_bet(self, true_count: float, min_bet: int, max_bet: int, bankroll: int) -> int:
+        """Kiszámolja a tétet.
+
+        Args:
+            true_count (float): A valódi érték.
+            min_bet (int): Minimum tét.
+            max_bet (int): Maximum tét.
+            bankroll (int): A játékos zsetonjainak az értéke.
+
+        Returns:
+            int: A tét.
+        """
+        raise Exception('Unknown bet system')
+
+    def calculate_bets(self, true_counts: list, min_bet: int, max_bet: int, bankrolls: list) -> list:
+        """Több ülőhelyre, illetve több számlálóra egyszerre számolja ki a téteket.
+
+        Args:
+            true_counts (list): A valódi értékek listája.
+            min_bet (int): Minimum tét.
+            max_bet (int): Maximum tét.
+            bankrolls (list): A zseton mennyiségek listája, a valódi értékekkel azonos sorrendben.
+
+        Returns:
+            list: A tétek listája.
+        """
+        calculate_bet = self.calculate_bet
+        return [calculate_bet(true_count, min_bet, max_bet, bankroll) for true_count, bankroll in zip(true_counts, bankrolls)]
+
+
+class Linear_bet(Bet_system):
+    """Az eredeti képlet: a valódi értékből egyet levonunk, majd megszorozzuk a minimum téttel.
+    >>> b = Linear_bet()
+    >>> b.calculate_bet(2.5, 100, 3000, 0)
+    150
+    >>> b.calculate_bet(-3, 100, 3000, 0)
+    100
+    >>> b.calculate_bet(40, 100, 3000, 0)
+    3000
+    """
+
+    def calculate_bet(self, true_count: float, min_bet: int, max_bet: int, bankroll: int) -> int:
+        bet = (true_count - 1) * min_bet
+        if bet < min_bet:
+            return min_bet
+        elif bet > max_bet:
+            return max_bet
+        return round(bet)
+
+
+class Bet_ramp(Bet_system):
+    """Felhasználó által megadott tétlépcső. A kulcsok a valódi értékek, az értékek pedig a minimum tét többszörösei.
+    A lépcső egy tömbbe fordul le, így a tét kiszámolása egyetlen indexelés.
+    >>> b = Bet_ramp({'1': 1, '2': 2, '3': 4, '5': 8})
+    >>> b.calculate_bet(0.5, 100, 3000, 0)
+    100
+    >>> b.calculate_bet(2.9, 100, 3000, 0)
+    200
+    >>> b.calculate_bet(4, 100, 3000, 0)
+    400
+    >>> b.calculate_bet(12, 100, 500, 0)
+    500
+    >>> b.calculate_bets([-4, 3, 6], 100, 3000, [0, 0, 0])
+    [100, 400, 800]
+    """
+
+    def __init__(self, units: dict) -> None:
+        """
+        Args:
+            units (dict): A valódi értékekhez tartozó tét egységek.
+        """
+        steps = sorted((int(true_count), units[true_count]) for true_count in units)
+        self._units = []
+        for true_count in range(MIN_TRUE_COUNT, MAX_TRUE_COUNT + 1):
+            unit = steps[0][1]
+            for step_count, step_unit in steps:
+                if step_count <= true_count:
+                    unit = step_unit
+            self._units.append(unit)
+
+    def calculate_bet(self, true_count: float, min_bet: int, max_bet: int, bankroll: int) -> int:
+        bet = self._units[_count_index(true_count)] * min_bet
+        if bet < min_bet:
+            return min_bet
+        elif bet > max_bet:
+            return max_bet
+        return round(bet)
+
+
+class Kelly_bet(Bet_system):
+    """A Kelly-kritérium törtrészével számolt tét. A játékos előnye a valódi értékkel lineárisan nő,
+    a tét a zsetonok és az előny / variancia arányának a szorzata.
+    >>> b = Kelly_bet(0.5, 0.005, -0.005, 1.33)
+    >>> b.calculate_bet(0, 100, 3000, 100000)
+    100
+    >>> b.calculate_bet(3, 100, 3000, 100000)
+    376
+    >>> b.calculate_bet(3, 100, 3000, -500)
+    100
+    """
+
+    def __init__(self, fraction: float, edge_per_count: float, base_edge: float, variance: float) -> None:
+        """
+        Args:
+            fraction (float): A Kelly-tét hányad része, amit a játékos megtesz.
+            edge_per_count (float): Ennyivel nő a játékos előnye egy valódi értéknyi növekedéssel.
+            base_edge (float): A játékos előnye nullás valódi értéknél.
+            variance (float): Egy leosztás eredményének a varianciája.
+        """
+        self._multipliers = [fraction * max(0, base_edge + edge_per_count * true_count) / variance
+                             for true_count in range(MIN_TRUE_COUNT, MAX_TRUE_COUNT + 1)]
+
+    def calculate_bet(self, true_count: float, min_bet: int, max_bet: int, bankroll: int) -> int:
+        bet = round(bankroll * self._multipliers[_count_index(true_count)])
+        if bet < min_bet:
+            return min_bet
+        elif bet > max_bet:
+            return max_bet
+        return bet
+
+
+def load_bet_system(name: str) -> Bet_system:
+    """Betölti a megadott nevű tétrendszert.
+
+    Args:
+        name (str): A tétrendszer neve a data/bet_ramps.json fájlban.
+
+    Returns:
+        Bet_system: A lefordított tétrendszer.
+    """
+    data = load_data('bet_ramps')[name]
+    if data['type'] == 'linear':
+        return Linear_bet()
+    elif data['type'] == 'ramp':
+        return Bet_ramp(data['units'])
+    elif data['type'] == 'kelly':
+        return Kelly_bet(data['fraction'], data['edge_per_count'], data['base_edge'], data['variance'])
+    raise Exception(f'Unknown bet system type: {data["type"]}')
+
+
+class Count_histogram:
+    """Körönkénti eredmények a tét megtételekor érvényes valódi érték szerint, ugyanazokban a rögzített rekeszekben, amelyekkel
+    a tétrendszerek dolgoznak (lefelé kerekítve, MIN_TRUE_COUNT és MAX_TRUE_COUNT közé szorítva). Rekeszenként a körök száma,
+    a kezdő tét egységeiben nyert összeg, annak négyzetösszege és a tétek összege egy-egy tömbben van, így egy kör hozzáadása
+    négy indexelés, és két hisztogram (például a párhuzamos részeké) elemenkénti összeadással vonható össze.
+    >>> a, b = Count_histogram(), Count_histogram()
+    >>> a.add(-0.5, 100, -100)
+    >>> a.add(2.7, 200, 300)
+    >>> b.add(2.1, 200, -200)
+    >>> b.add(35, 3000, 3000)
+    >>> a.merge(b)
+    >>> [(row['true_count'], row['hands'], row['ev'], row['mean_bet']) for row in a.rows()]
+    [(-1, 1, -1.0, 100.0), (2, 2, 0.25, 200.0), (20, 1, 1.0, 3000.0)]
+    >>> round(a.rows()[1]['standard_deviation'], 4)
+    1.7678
+    >>> Count_histogram.from_dict(a.as_dict()).rows() == a.rows()
+    True
+    """
+
+    def __init__(self) -> None:
+        size = MAX_TRUE_COUNT - MIN_TRUE_COUNT + 1
+        self.hands = array('q', [0]) * size
+        self.units = array('d', [0.0]) * size
+        self.squares = array('d', [0.0]) * size
+        self.bets = array('q', [0]) * size
+
+    def add(self, true_count: float, bet: int, won: float) -> None:
+        """Hozzáad egy kört.
+
+        Args:
+            true_count (float): A valódi érték a tét megtételekor.
+            bet (int): A kezdő tét.
+            won (float): A körben nyert (vagy negatív esetén vesztett) zseton mennyiség, a zseton töredékével együtt.
+        """
+        index = _count_index(true_count)
+        units = won / bet
+        self.hands[index] += 1
+        self.units[index] += units
+        self.squares[index] += units * units
+        self.bets[index] += bet
+
+    def merge(self, other: 'Count_histogram') -> None:
+        """Hozzáadja egy másik hisztogram köreit.
+
+        Args:
+            other (Count_histogram): A másik hisztogram.
+        """
+        for mine, theirs in ((self.hands, other.hands), (self.units, other.units), (self.squares, other.squares), (self.bets, other.bets)):
+            for index, value in enumerate(theirs):
+                mine[index] += value
+
+    def rows(self) -> list:
+        """A nem üres rekeszek összesítése.
+
+        Returns:
+            list: Rekeszenként a valódi érték (true_count), a körök száma (hands), aránya (frequency), a kezdő tét arányában vett
+                várható érték (ev), szórás (standard_deviation) és az átlagos tét (mean_bet).
+        """
+        total = sum(self.hands)
+        rows = []
+        for index, hands in enumerate(self.hands):
+            if hands == 0:
+                continue
+            ev = self.units[index] / hands
+            variance = (self.squares[index] - hands * ev * ev) / (hands - 1) if hands > 1 else 0.0
+            rows.append({'true_count': index + MIN_TRUE_COUNT, 'hands': hands, 'frequency': hands / total, 'ev': ev,
+                         'standard_deviation': max(variance, 0.0) ** 0.5, 'mean_bet': self.bets[index] / hands})
+        return rows
+
+    def as_dict(self) -> dict:
+        """A hisztogram JSON-ként menthető és küldhető formában.
+
+        Returns:
+            dict: A hands, units, squares és bets listák.
+        """
+        return {'hands': self.hands.tolist(), 'units': self.units.tolist(), 'squares': self.squares.tolist(), 'bets': self.bets.tolist()}
+
+    @staticmethod
+    def from_dict(data: dict) -> 'Count_histogram':
+        """Visszaállítja az as_dict által elkészített hisztogramot.
+
+        Args:
+            data (dict): A hisztogram.
+
+        Returns:
+            Count_histogram: A hisztogram.
+        """
+        histogram = Count_histogram()
+        histogram.hands = array('q', data['hands'])
+        histogram.units = array('d', data['units'])
+        histogram.squares = array('d', data['squares'])
+        histogram.bets = array('q', data['bets'])
+        return histogram
+
+
+def get_bet_system_names() -> list:
+    """Visszaadja a data/bet_ramps.json fájlban megtalálható tétrendszerek neveit.
+
+    Returns:
+        list: A tétrendszerek neveinek a listája.
+    """
+    with open('data/bet_ramps.json') as f:
+        return [*json.load(f).keys()]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,21 +1,161 @@
-from random import shuffle
+from random_source import Random_source
+from functools import lru_cache
 import json
 
+INFINITE_DECK = 0
+CHIP_SCALE = 10
+PAYOUT_WIN = 2 * CHIP_SCALE
+PAYOUT_PUSH = CHIP_SCALE
+PAYOUT_SURRENDER = CHIP_SCALE // 2
+PAYOUT_LOSS = 0
+INSURANCE_STAKE = CHIP_SCALE // 2
+PAYOUT_INSURANCE = 3 * INSURANCE_STAKE
+
+
+class Rules:
+    """A játékszabályokat definiáló osztály. A szabályok a létrehozáskor egyszer fordulnak le jelzőkké és táblázatokká,
+    így a játék közben nem kell minden lapnál külön feltételeket vizsgálni.
+    >>> r = Rules()
+    >>> r.moves[True][True][False]
+    ['s', 'h', 'd', 'sp']
+    >>> r.moves[True][False][True]
+    ['s', 'h']
+    >>> r = Rules(double_after_split=True, surrender=True)
+    >>> r.moves[True][False][False]
+    ['s', 'h', 'd', 'r']
+    >>> r.moves[True][False][True]
+    ['s', 'h', 'd']
+    >>> r.moves[False][False][False]
+    ['s', 'h']
+    >>> Rules(blackjack_payout=1.2).blackjack_multiplier
+    2.2
+    >>> Rules().blackjack_units, Rules(blackjack_payout=1.2).blackjack_units
+    (25, 22)
+    >>> Rules(blackjack_payout=1.25)
+    Traceback (most recent call last):
+    ...
+    Exception: Invalid blackjack payout value
+    """
+
+    def __init__(self, dealer_hits_soft_17: bool = False, double_after_split: bool = False, max_hands: int = 2, resplit_aces: bool = False,
+                 hit_split_aces: bool = True, surrender: bool = False, insurance: bool = False, blackjack_payout: float = 1.5) -> None:
+        """
+        Args:
+            dealer_hits_soft_17 (bool): Az osztó lapot kér-e puha 17-re.
+            double_after_split (bool): Lehet-e duplázni splitelés után.
+            max_hands (int): Splitelésekkel legfeljebb hány keze lehet a játékosnak.
+            resplit_aces (bool): Lehet-e az ászokat újra splitelni.
+            hit_split_aces (bool): Kérhet-e lapot a játékos a splitelt ászokra.
+            surrender (bool): Feladhatja-e a játékos a kezét az első két lap után a tét feléért.
+            insurance (bool): Köthet-e biztosítást a játékos, ha az osztó első lapja ász.
+            blackjack_payout (float): A Blackjack kifizetése a tét arányában. A kifizetés egész számú zseton egységben (1 / CHIP_SCALE) pontos,
+                ezért 1 / CHIP_SCALE többszörösének kell lennie, a tét mellett visszajáró összeg szorzója a blackjack_units.
+        """
+        self.dealer_hits_soft_17 = dealer_hits_soft_17
+        self.double_after_split = double_after_split
+        self.max_hands = max_hands
+        self.resplit_aces = resplit_aces
+        self.hit_split_aces = hit_split_aces
+        self.surrender = surrender
+        self.insurance = insurance
+        self.blackjack_multiplier = 1 + blackjack_payout
+        self.blackjack_units = round(self.blackjack_multiplier * CHIP_SCALE)
+        if abs(self.blackjack_units - self.blackjack_multiplier * CHIP_SCALE) > 1e-9:
+            raise Exception('Invalid blackjack payout value')
+        self.moves = self._compile_moves()
+        self.split_ace_moves = [['s'], ['s', 'sp']]
+
+    def _compile_moves(self) -> list:
+        """Előre összeállítja a lehetséges lépések listáit.
+
+        Returns:
+            list: A [két lap van-e a kézben][splitelhető-e][splitelt kéz-e] indexeléssel elérhető lépések listái.
+                A lapot nem kérhető splitelt ászok lépései külön, a split_ace_moves[splitelhető-e] listákban vannak.
+        """
+        table = []
+        for two_cards in (False, True):
+            table.append([])
+            for splittable in (False, True):
+                table[-1].append([])
+                for is_split_hand in (False, True):
+                    moves = ['s', 'h']
+                    if two_cards and (not is_split_hand or self.double_after_split):
+                        moves.append('d')
+                    if splittable:
+                        moves.append('sp')
+                    if two_cards and not is_split_hand and self.surrender:
+                        moves.append('r')
+                    table[-1][-1].append(moves)
+        return table
+
+
+DEFAULT_RULES = Rules()
+
+
+@lru_cache(maxsize=None)
+def load_data(name: str) -> dict:
+    """Betölti a data mappa egy JSON fájlját. Az eredmény a folyamat élettartamára el van tárolva, így az újabb játékok
+    (például egy munkafolyamat következő feladatai) már nem olvassák és dolgozzák fel újra a fájlt. Az eredményt csak olvasni szabad.
+
+    Args:
+        name (str): A fájl neve kiterjesztés nélkül, vagy egy .json végű elérési út, ha a fájl nem a data mappában van.
+
+    Returns:
+        dict: A fájl tartalma.
+    """
+    with open(name if name.endswith('.json') else f'data/{name}.json') as f:
+        return json.load(f)
+
+
+def load_rules(name: str) -> Rules:
+    """Betölti a megadott nevű szabályokat.
+
+    Args:
+        name (str): A szabályok neve a data/rules.json fájlban.
+
+    Returns:
+        Rules: A szabályok.
+    """
+    return Rules(**load_data('rules')[name])
+
+
+def get_rules_names() -> list:
+    """Visszaadja a data/rules.json fájlban megtalálható szabályok neveit.
+
+    Returns:
+        list: A szabályok neveinek a listája.
+    """
+    with open('data/rules.json') as f:
+        return [*json.load(f).keys()]
+
 
 class Deck:
-    """Egy francia kártyapaklit definiáló osztály."""
+    """Egy francia kártyapaklit definiáló osztály. A shoes számláló az összekevert cipők sorszáma, minden újrakeveréskor eggyel nő.
+    >>> d = Deck(1)
+    >>> d.shoes
+    1
+    >>> for _ in range(52):
+    ...     _ = d.get_a_card()
+    >>> d.deck_init()
+    >>> d.shoes
+    2
+    """
 
-    def __init__(self, deck_count: int) -> None:
+    def __init__(self, deck_count: int, rng: Random_source = None) -> None:
         """
         Args:
             deck_count (int): A paklik száma.
+            rng (Random_source): A keveréshez használt véletlenszám forrás.
         """
         self._deck = []
         self._deck_count = deck_count
+        self._rng = Random_source() if rng is None else rng
+        self.shoes = 0
         self.deck_init()
 
     def deck_init(self) -> None:
         """Összekever annyi paklit amennyit megadtunk."""
+        self.shoes += 1
         for _ in range(self._deck_count):
             self._deck.extend(self._make_a_deck())
         self.shuffle()
@@ -27,16 +167,23 @@ class Deck:
             list: A pakliban lévő kártyák listája.
         """
         deck = []
-        with open('data/cards.json') as f:
-            data = json.load(f)
+        data = load_data('cards')
         for suit in data['suits']:
             for name in data['values'].keys():
                 deck.append((suit, name, data['values'][name]))
         return deck
 
+    def get_deck_count(self) -> int:
+        """Visszaadja a paklik számát.
+
+        Returns:
+            int: A paklik száma.
+        """
+        return self._deck_count
+
     def shuffle(self) -> None:
         """Megkeveri a paklit."""
-        shuffle(self._deck)
+        self._rng.shuffle(self._deck)
 
     def get_a_card(self) -> tuple:
         """Kivesz egy kártyát a pakliból.
@@ -57,6 +204,72 @@ class Deck:
         return len(self._deck) == 0
 
 
+class Infinite_deck(Deck):
+    """Végtelen pakli, azaz a lapok visszatevéssel kerülnek kihúzásra. Nem kell paklit összeállítani és keverni,
+    a lapokat előre legenerált véletlen blokkokból veszi, így a 10 értékű lapok aránya mindig 4/13.
+    >>> d = Infinite_deck(Random_source(1))
+    >>> cards = [d.get_a_card() for _ in range(26000)]
+    >>> d.out_of_card()
+    False
+    >>> abs(sum(card[2] == 10 for card in cards) / len(cards) - 4 / 13) < 0.01
+    True
+    >>> sorted({card[2] for card in cards})
+    [2, 3, 4, 5, 6, 7, 8, 9, 10, 11]
+    """
+
+    def __init__(self, rng: Random_source = None, block_size: int = 4096) -> None:
+        """
+        Args:
+            rng (Random_source): A húzásokhoz használt véletlenszám forrás.
+            block_size (int): Egyszerre ennyi lapot generál előre.
+        """
+        self._rng = Random_source() if rng is None else rng
+        self._templates = self._make_a_deck()
+        self._block_size = block_size
+        self._block = []
+        self._position = 0
+        self.shoes = 1
+
+    def get_deck_count(self) -> int:
+        """Végtelen pakli.
+
+        Returns:
+            int: INFINITE_DECK.
+        """
+        return INFINITE_DECK
+
+    def deck_init(self) -> None:
+        """Végtelen paklinál nincs mit összeállítani."""
+
+    def shuffle(self) -> None:
+        """Végtelen paklinál nincs mit megkeverni."""
+
+    def _fill_block(self) -> None:
+        """Egyetlen hívással legenerál egy blokknyi lapot az 52 lap közül visszatevéssel."""
+        self._block = self._rng.choices(self._templates, self._block_size)
+        self._position = 0
+
+    def get_a_card(self) -> tuple:
+        """Kivesz egy kártyát az előre legenerált blokkból, ha a blokk elfogyott, akkor újat generál.
+
+        Returns:
+            tuple: A kivett kártya.
+        """
+        if self._position == len(self._block):
+            self._fill_block()
+        card = self._block[self._position]
+        self._position += 1
+        return card
+
+    def out_of_card(self) -> bool:
+        """A végtelen pakliból soha nem fogy ki a lap.
+
+        Returns:
+            bool: Mindig False.
+        """
+        return False
+
+
 class Hand:
     """A kézben lévő kártyákat definiálja.
     >>> h = Hand()
@@ -115,9 +328,15 @@ class Hand:
     True
     """
 
-    def __init__(self) -> None:
+    def __init__(self, rules: Rules = None) -> None:
+        """
+        Args:
+            rules (Rules): A játékszabályok, ha nincs megadva, akkor az alapértelmezett szabályok.
+        """
         self._cards = []
         self._score = 0
+        self._soft = False
+        self._rules = DEFAULT_RULES if rules is None else rules
         self.stand = False
 
     def get_cards(self) -> list:
@@ -220,29 +439,57 @@ class Hand:
         """Megnézi, hogy milyen lépések közül választhatunk.
 
         Returns:
-            list: A lehetséges lépések listája.
+            list: A lehetséges lépések listája. A listát a szabályok közösen használják, ezért nem szabad módosítani.
         """
-        moves = []
-        if not self.stand:
-            moves.extend(['s', 'h'])
-            if len(self._cards) == 2 and not self.is_split_hand:
-                moves.append('d')
-            if self.is_pair() and not self.is_split_hand:
-                moves.append('sp')
-        return moves
+        if self.stand:
+            return []
+        two_cards = len(self._cards) == 2
+        if self.split_ace:
+            return self._rules.split_ace_moves[two_cards and self.can_split and self.is_pair()]
+        return self._rules.moves[two_cards][two_cards and self.can_split and self.is_pair()][self.is_split_hand]
 
 
 class Player_hand(Hand):
-    """A játékosnak a kezét fogja jelenteni, amihez tét is tartozik, emellett lehet egy második keze is."""
+    """A játékosnak a kezét fogja jelenteni, amihez tét is tartozik, emellett lehet egy második keze is.
+    A tét egész számú zseton egységben (1 / CHIP_SCALE zseton) van tárolva, így a kifizetések egész szorzással pontosak.
+    >>> h = Player_hand(101)
+    >>> h.blackjack_won()
+    >>> h.get_bet()
+    2525
+    >>> h = Player_hand(101, Rules(blackjack_payout=1.2))
+    >>> h.blackjack_won()
+    >>> h.get_bet()
+    2222
+    >>> h = Player_hand(101)
+    >>> h.surrender()
+    >>> h.get_bet()
+    505
+
+    A lapot nem kérhető splitelt ász csak megállhat, vagy ha újabb ászt kapott, újra splitelhet:
+
+    >>> h = Player_hand(10, Rules(max_hands=4, resplit_aces=True, hit_split_aces=False))
+    >>> h.is_split_hand = h.split_ace = True
+    >>> h.add_card(('♠', 'A', 11))
+    >>> h.add_card(('♥', 'A', 11))
+    >>> h.get_moves()
+    ['s', 'sp']
+    >>> h.can_split = False
+    >>> h.get_moves()
+    ['s']
+    """
 
-    def __init__(self, bet: int = 0) -> None:
+    def __init__(self, bet: int = 0, rules: Rules = None) -> None:
         """
         Args:
-            bet (int): A 
+            bet (int): A kézhez tartozó tét.
+            rules (Rules): A játékszabályok.
         """
-        super().__init__()
-        self._bet = bet
+        super().__init__(rules)
+        self._bet = bet * CHIP_SCALE
         self.is_split_hand = False
+        self.can_split = True
+        self.split_ace = False
+        self.surrendered = False
 
     def add_bet(self, size: int) -> None:
         """Hozzáadja a megadott zsetont mennyiséget a téthez.
@@ -250,21 +497,22 @@ class Player_hand(Hand):
         Args:
             size (int): A megadott zseton mennyiség.
         """
-        self._bet += size
+        self._bet += size * CHIP_SCALE
 
     def _multiplication(self, multiplier: int) -> None:
-        """Megszorozza a tétet a megadott szorzóval.
+        """Megszorozza a tétet a megadott szorzóval. A szorzó CHIP_SCALE egységben van megadva (például PAYOUT_WIN a kétszeres),
+        a kifizetés előtt a tét CHIP_SCALE többszöröse, így az egész osztás pontos.
 
         Args:
-            multiplier (int): A megadott szorzó.
+            multiplier (int): A megadott szorzó CHIP_SCALE egységben.
         """
-        self._bet *= multiplier
+        self._bet = self._bet * multiplier // CHIP_SCALE
 
     def get_bet(self) -> int:
         """Elveszi a kézhez tartozó tétet.
 
         Returns:
-            int: Zseton mennyiség, ami a kézhez tartozó tétet jelentette.
+            int: Zseton egység mennyiség (1 / CHIP_SCALE zseton), ami a kézhez tartozó tétet jelentette.
         """
         size = self._bet
         self._bet = 0
@@ -276,22 +524,28 @@ class Player_hand(Hand):
         Returns:
             int: A zseton mennyiség értéke, ami a kézhez tartozik.
         """
-        return self._bet
+        return self._bet // CHIP_SCALE
 
     def blackjack_won(self):
         """Blackjack győzelem esetén a játkos a játékos a tét mellett, annak a másfélszeresét kapja meg jutalmul."""
         self.stand = True
-        self._multiplication(2.5)
+        self._multiplication(self._rules.blackjack_units)
 
     def normal_won(self):
         """Normál győzelem esetén a játkos a játékos a tét kétszeresét kapja vissza."""
         self.stand = True
-        self._multiplication(2)
+        self._multiplication(PAYOUT_WIN)
 
     def lost(self):
         """Ha a játékos veszít, akkor nem kapja vissza a tétet"""
         self.stand = True
-        self._multiplication(0)
+        self._multiplication(PAYOUT_LOSS)
+
+    def surrender(self):
+        """Ha a játékos feladja a kezét, akkor a tét felét visszakapja."""
+        self.stand = True
+        self.surrendered = True
+        self._multiplication(PAYOUT_SURRENDER)
 
 
 class Player:
@@ -335,14 +589,58 @@ class Player:
     120
     >>> p.get_chips_value()
     880
+    >>> p = Player(1000)
+    >>> p.set_rules(Rules(max_hands=3))
+    >>> p.main_hand = Player_hand(100)
+    >>> p.main_hand.add_card(('♦', '8', 8))
+    >>> p.main_hand.add_card(('♣', '8', 8))
+    >>> p.split()
+    >>> second = p.split_hands[-1]
+    >>> second.add_card(('♠', '8', 8))
+    >>> second.get_moves()
+    ['s', 'h', 'sp']
+    >>> p.split(second)
+    >>> len(p.get_hands())
+    3
+    >>> second.add_card(('♥', '8', 8))
+    >>> second.get_moves()
+    ['s', 'h']
+    >>> p.get_chips_value()
+    800
+    >>> p = Player(1000)
+    >>> p._get_chips(101)
+    >>> p.main_hand = Player_hand(101)
+    >>> p.main_hand.blackjack_won()
+    >>> p.won_bet(p.main_hand)
+    >>> p.get_chips_value(), p.get_chip_units()
+    (1151, 11515)
+    >>> p = Player(1000)
+    >>> p._get_chips(101)
+    >>> p.main_hand = Player_hand(101)
+    >>> insured = p.buy_insurance()
+    >>> p.get_chip_units()
+    8485
+    >>> p.won_insurance(insured)
+    >>> p.get_chip_units()
+    10000
     """
 
     def __init__(self, chips: int) -> None:
         """
         Args:
-            chips (int): A játékoshoz tartozó zseton mennyiség.
+            chips (int): A játékoshoz tartozó zseton mennyiség. Belül zseton egységben (1 / CHIP_SCALE zseton) van tárolva.
+        """
+        self._chips = chips * CHIP_SCALE
+        self._rules = DEFAULT_RULES
+        self.split_hands = []
+
+    def set_rules(self, rules: Rules) -> None:
+        """Beállítja a játékszabályokat, amik alapján a játékos kezei létrejönnek.
+
+        Args:
+            rules (Rules): A játékszabályok.
         """
-        self._chips = chips
+        self._rules = rules
 
     def _get_chips(self, size: int) -> None:
         """Elveszi a megadott zseton mennyiséget a játékostól.
@@ -350,13 +648,22 @@ class Player:
         Args:
             size (int): A megadott zseton mennyiség.
         """
-        self._chips -= size
+        self._chips -= size * CHIP_SCALE
 
     def get_chips_value(self) -> int:
-        """Vissza adja a játékosnál lévő zsetonok mennyiségének az értékét.
+        """Vissza adja a játékosnál lévő zsetonok mennyiségének az értékét. A zseton töredéke (például egy páratlan tét
+        Blackjack kifizetésének a fele) nem vész el, csak a következő egész zsetonnál látszik.
+
+        Returns:
+            int: A játkosnál lévő zsetonok értéke, egész zsetonra lefelé kerekítve.
+        """
+        return self._chips // CHIP_SCALE
+
+    def get_chip_units(self) -> int:
+        """Vissza adja a játékosnál lévő zsetonok pontos értékét.
 
         Returns:
-            int: A játkosnál lévő zsetonok értéke.
+            int: A zsetonok értéke zseton egységben (1 / CHIP_SCALE zseton).
         """
         return self._chips
 
@@ -372,7 +679,16 @@ class Player:
         """
         bet = self.get_bet(min_bet, max_bet)
         self._get_chips(bet)
-        self.main_hand = Player_hand(bet)
+        self.main_hand = Player_hand(bet, self._rules)
+        self.split_hands = []
+
+    def get_hands(self) -> list:
+        """Visszaadja a játékos összes kezét.
+
+        Returns:
+            list: A fő kéz, majd a splitelésekkel létrejött kezek.
+        """
+        return [self.main_hand, *self.split_hands]
 
     def won_bet(self, hand: Player_hand) -> None:
         """A tét vissza kerül a játékoshoz.
@@ -380,24 +696,60 @@ class Player:
         Args:
             hand (Player_hand): A kéz, amihez a tét tartozik.
         """
-        self._chips += (round(hand.get_bet()))
+        self._chips += hand.get_bet()
+
+    def buy_insurance(self) -> int:
+        """Biztosítást köt a fő kéz tétjének a felével. A biztosítás zseton egységben pontos, páratlan tétnél sem kerekít.
 
-    def double(self) -> None:
-        """Ha a játékos úgy ítéli meg, hogy az első két lapja elég erős ahhoz, hogy egy harmadik lappal megnyerje a játékot, akkor a Double bemondásával a tétet duplázza. A játékos a Double bemondása után már csak egy lapot kap, további lapot nem kérhet."""
+        Returns:
+            int: A biztosított tét, azaz a fő kéz tétje.
+        """
         bet = self.main_hand.get_bet_value()
+        self._chips -= bet * INSURANCE_STAKE
+        return bet
+
+    def won_insurance(self, bet: int) -> None:
+        """Ha az osztónak Blackjackje van, akkor a biztosítás 2:1 arányban fizet.
+
+        Args:
+            bet (int): A biztosított tét, ahogy a buy_insurance visszaadja.
+        """
+        self._chips += bet * PAYOUT_INSURANCE
+
+    def double(self, hand: Player_hand = None) -> None:
+        """Ha a játékos úgy ítéli meg, hogy az első két lapja elég erős ahhoz, hogy egy harmadik lappal megnyerje a játékot, akkor a Double bemondásával a tétet duplázza. A játékos a Double bemondása után már csak egy lapot kap, további lapot nem kérhet.
+
+        Args:
+            hand (Player_hand): A kéz, aminek a tétje duplázódik. Ha nincs megadva, akkor a fő kéz.
+        """
+        if hand is None:
+            hand = self.main_hand
+        bet = hand.get_bet_value()
         self._get_chips(bet)
-        self.main_hand.add_bet(bet)
+        hand.add_bet(bet)
 
-    def split(self) -> None:
-        """Ha a játékos első két lapja egy párt alkot, akkor ezt kettéoszthatja, ezzel két „kezet” hoz létre, valamint mindkettőre azonos tétet tehet meg, azaz a tét duplázódik."""
-        bet = self.main_hand.get_bet_value()
-        self.split_hand = Player_hand(bet)
+    def split(self, hand: Player_hand = None) -> None:
+        """Ha a játékos első két lapja egy párt alkot, akkor ezt kettéoszthatja, ezzel két „kezet” hoz létre, valamint mindkettőre azonos tétet tehet meg, azaz a tét duplázódik.
+        A szabályok alapján a splitelt kezek tovább splitelhetők, amíg a kezek száma el nem éri a megengedett maximumot.
+
+        Args:
+            hand (Player_hand): A splitelendő kéz. Ha nincs megadva, akkor a fő kéz. Az új kéz a split_hands lista végére kerül.
+        """
+        if hand is None:
+            hand = self.main_hand
+        bet = hand.get_bet_value()
+        split_hand = Player_hand(bet, self._rules)
         self._get_chips(bet)
-        card = self.main_hand.get_cards()[1]
-        self.main_hand.pop_card()
-        self.split_hand.add_card(card)
-        self.main_hand.is_split_hand = True
-        self.split_hand.is_split_hand = True
+        card = hand.get_cards()[1]
+        hand.pop_card()
+        split_hand.add_card(card)
+        hand.is_split_hand = True
+        split_hand.is_split_hand = True
+        self.split_hands.append(split_hand)
+        self.split_hand = self.split_hands[0]
+        can_split = len(self.split_hands) + 1 < self._rules.max_hands and (card[2] != 11 or self._rules.resplit_aces)
+        for player_hand in self.get_hands():
+            player_hand.can_split = can_split
 
 
 class Dealer:
@@ -420,10 +772,24 @@ class Dealer:
     >>> d.hand.add_card(('♣', 'J', 10))
     >>> d.stand()
     True
+    >>> d = Dealer(Rules(dealer_hits_soft_17=True))
+    >>> d.hand.add_card(('♠', 'A', 11))
+    >>> d.hand.add_card(('♦', '6', 6))
+    >>> d.stand()
+    False
+    >>> d.hand.add_card(('♣', '10', 10))
+    >>> d.stand()
+    True
     """
 
-    def __init__(self) -> None:
-        self.hand = Hand()
+    def __init__(self, rules: Rules = None) -> None:
+        """
+        Args:
+            rules (Rules): A játékszabályok, ha nincs megadva, akkor az alapértelmezett szabályok.
+        """
+        self.hand = Hand(rules)
+        if rules is not None and rules.dealer_hits_soft_17:
+            self.stand = self._stand_hit_soft_17
 
     def stand(self) -> bool:
         """Az osztónak 16-nál kötelezően lapot kell kérnie, és 17-nél már kötelezően meg kell állnia, illetve ha besokall, szintén megáll.
@@ -433,29 +799,53 @@ class Dealer:
         """
         return (self.hand.get_score() > 16) or self.hand.is_bust()
 
+    def _stand_hit_soft_17(self) -> bool:
+        """Olyan szabályok esetén, ahol az osztó puha 17-re lapot kér, csak kemény 17-nél vagy felette áll meg.
+
+        Returns:
+            bool: Ha az osztó megáll, akkor True-val, különben meg False-al tér vissza.
+        """
+        score = self.hand.get_score()
+        return score > 17 or (score == 17 and not self.hand.is_soft())
+
 
 class Game:
     """A játék menetét definiáló osztály."""
 
-    def __init__(self, player: Player, min_bet: int, max_bet: int, deck_count: int) -> None:
+    def __init__(self, player: Player, min_bet: int, max_bet: int, deck_count: int, rules: Rules = None, rng: Random_source = None,
+                 deck: Deck = None) -> None:
         """
         Args:
             player (Player): A megadott játékos, aki játszani fog.
             min_bet (int): Minimum tét.
             max_bet (int): Maximum tét.
-            deck_count (int): A paklik száma.
+            deck_count (int): A paklik száma. INFINITE_DECK (0) esetén végtelen paklival, visszatevéssel játszik.
+            rules (Rules): A játékszabályok, ha nincs megadva, akkor az alapértelmezett szabályok.
+            rng (Random_source): A pakli véletlenszám forrása. Ha ugyanazt a forrást kapja a játékos is, akkor egy seed meghatározza az egész játékot.
+            deck (Deck): Ha meg van adva, akkor ebből a pakliból oszt (például egy előre megkevert Bank_deck-ből), a paklik számának egyeznie kell.
         """
         if min_bet > max_bet or min_bet < 1:
             raise Exception('Invalid minimum bet value')
         elif player.get_chips_value() < min_bet:
             raise Exception('The player has few chips')
-        elif deck_count < 1 or deck_count > 8:
+        elif deck_count < 0 or deck_count > 8:
             raise Exception('Invalid decks value')
+        elif deck is not None and deck.get_deck_count() != deck_count:
+            raise Exception('The deck does not match the decks value')
         else:
             self._player = player
-            self._deck = Deck(deck_count)
+            if deck is not None:
+                self._deck = deck
+            elif deck_count == INFINITE_DECK:
+                self._deck = Infinite_deck(rng)
+            else:
+                self._deck = Deck(deck_count, rng)
+            if deck_count == INFINITE_DECK:
+                self._deal_card = self._deck.get_a_card
             self._min_bet = min_bet
             self._max_bet = max_bet
+            self._rules = DEFAULT_RULES if rules is None else rules
+            self._player.set_rules(self._rules)
 
     def _deal_card(self) -> None:
         """Ha a elfogyott a pakli akkor újra keveri a kiment kártyákat és abból vesz egyet, ha van még kártya, akkor onnan vesz el."""
@@ -480,6 +870,7 @@ class Game:
             - stand, azaz megállás.
             - double, azaz a tét duplázása.
             - split, azaz a kéz kettéosztása.
+            - surrender, azaz a kéz feladása.
 
         Args:
             hand (Player_hand): A megadott kéz.
@@ -493,13 +884,20 @@ class Game:
             elif move == 's':
                 hand.stand = True
             elif move == 'd':
-                self._player.double()
+                self._player.double(hand)
                 hand.add_card(self._deal_card())
                 hand.stand = True
             elif move == 'sp':
-                self._player.split()
-                self._player.main_hand.add_card(self._deal_card())
-                self._player.split_hand.add_card(self._deal_card())
+                self._player.split(hand)
+                split_hand = self._player.split_hands[-1]
+                hand.add_card(self._deal_card())
+                split_hand.add_card(self._deal_card())
+                if not self._rules.hit_split_aces and split_hand.get_card_values()[0] == 11:
+                    for split_ace in (hand, split_hand):
+                        split_ace.split_ace = True
+                        split_ace.stand = 'sp' not in split_ace.get_moves()
+            elif move == 'r':
+                hand.surrender()
 
     def _valid_move(self, moves: list, move: str) -> None:
         """Megnézi, hogy a megadott lépés közte van-e a lehetséges lépések között.
@@ -527,12 +925,15 @@ class Game:
             - Senkinek sincs blackjackje, ekkor folytatódik a játék.
         """
         self._is_game_over = False
-        self._dealer = Dealer()
+        self._dealer = Dealer(self._rules)
         self._player.place_bet(self._min_bet, self._max_bet)
+        self._round_bet = self._player.main_hand.get_bet_value()
         self._player.main_hand.add_card(self._deal_card())
         self._dealer.hand.add_card(self._deal_card())
         self._player.main_hand.add_card(self._deal_card())
         self._dealer.hand.add_card(self._deal_card())
+        if self._rules.insurance and self._dealer.hand.get_cards()[0][2] == 11:
+            self._insurance()
         if self._player.main_hand.is_blackjack() and self._dealer.hand.is_blackjack():
             self._player.main_hand.stand = True
             self._game_over()
@@ -543,11 +944,17 @@ class Game:
             self._player.main_hand.lost()
             self._game_over()
 
+    def _insurance(self) -> None:
+        """Ha az osztó első lapja ász, akkor a játékos biztosítást köthet, ami az osztó Blackjackje esetén 2:1 arányban fizet."""
+        if self._player.get_insurance(self._dealer.hand.get_cards()[0]):
+            insured = self._player.buy_insurance()
+            if self._dealer.hand.is_blackjack():
+                self._player.won_insurance(insured)
+
     def _game_over(self) -> None:
         """A kör vége. Visszakerülnek a játékoshoz a megnyert tétek és a kör nem folytatódik tovább."""
-        self._player.won_bet(self._player.main_hand)
-        if self._player.main_hand.is_split_hand:
-            self._player.won_bet(self._player.split_hand)
+        for hand in self._player.get_hands():
+            self._player.won_bet(hand)
         self._is_game_over = True
 
     def _is_draw(self, hand: Player_hand) -> bool:
@@ -578,6 +985,8 @@ class Game:
         Args:
             hand (Player_hand): A megadott kéz.
         """
+        if hand.surrendered:
+            return
         if self._is_draw(hand):
             hand.stand = True
         elif self._is_won(hand):
@@ -601,14 +1010,29 @@ class Game:
         self._setup()
         while not self._is_game_over:
             self.move_and_check(self._player.main_hand)
-            if self._player.main_hand.is_split_hand:
-                self.move_and_check(self._player.split_hand)
+            for hand in self._player.split_hands:
+                self.move_and_check(hand)
             self._dealer_move()
-            self._check_player_after_dealer_move(self._player.main_hand)
-            if self._player.main_hand.is_split_hand:
-                self._check_player_after_dealer_move(self._player.split_hand)
+            for hand in self._player.get_hands():
+                self._check_player_after_dealer_move(hand)
             self._game_over()
 
+    def get_round_bet(self) -> int:
+        """Az utolsó kör kezdő tétje, a duplázások, splitek és a biztosítás nélkül.
+
+        Returns:
+            int: A kezdő tét.
+        """
+        return self._round_bet
+
+    def get_shoe_number(self) -> int:
+        """A pakli aktuális cipőjének a sorszáma. Végtelen paklinál mindig 1.
+
+        Returns:
+            int: A cipő sorszáma, az első cipő az 1-es.
+        """
+        return self._deck.shoes
+
     def get_player_chips_value(self) -> int:
         """A játékos zsetonjainak az értékét vizsgálja.
 
@@ -617,6 +1041,14 @@ class Game:
         """
         return self._player.get_chips_value()
 
+    def get_player_chip_units(self) -> int:
+        """A játékos zsetonjainak a pontos értéke.
+
+        Returns:
+            int: A játékos zsetonjainak az értéke zseton egységben (1 / CHIP_SCALE zseton).
+        """
+        return self._player.get_chip_units()
+
 
 if __name__ == '__main__':
     import doctest
@@ -0,0 +1,128 @@
+from simulation import create_simulation, play_round
+from adaptive import Running_stats
+from betting import Count_histogram
+from array import array
+import gzip
+import os
+import pickle
+
+CHECKPOINT_VERSION = 1
+
+
+def start(config: dict) -> dict:
+    """Létrehozza egy új szimuláció teljes állapotát.
+
+    Args:
+        config (dict): A szimuláció beállításai, köztük a körök száma (rounds).
+
+    Returns:
+        dict: Az állapot: a beállítások, a játékos, a játék, a körök utáni zseton mennyiségek,
+            a körönkénti eredmények statisztikája, lapszámolás esetén a valódi érték szerinti hisztogram (egyébként None)
+            és a lejátszott körök száma.
+    """
+    ai, g = create_simulation(config)
+    return {
+        "version": CHECKPOINT_VERSION,
+        "config": config,
+        "ai": ai,
+        "game": g,
+        "history": array('q'),
+        "stats": Running_stats(),
+        "histogram": Count_histogram() if config["bet_system"] else None,
+        "rounds_done": 0,
+    }
+
+
+def advance(state: dict, rounds: int) -> None:
+    """Továbbjátssza a szimulációt a megadott számú körrel.
+
+    Args:
+        state (dict): A szimuláció állapota.
+        rounds (int): A körök száma.
+    """
+    ai = state["ai"]
+    g = state["game"]
+    history = state["history"]
+    stats = state["stats"]
+    histogram = state.get("histogram")
+    counting = bool(state["config"]["bet_system"])
+    for _ in range(rounds):
+        stats.add(play_round(ai, g, counting, histogram) / g.get_round_bet())
+        history.append(g.get_player_chips_value())
+    state["rounds_done"] += rounds
+
+
+def save_checkpoint(file_name: str, state: dict) -> None:
+    """Tömörített fájlba menti az állapotot. Először egy ideiglenes fájlba ír, majd azzal cseréli le a régit,
+    így megszakítás esetén is mindig egy teljes ellenőrzőpont marad meg.
+
+    Args:
+        file_name (str): A fájl neve.
+        state (dict): A szimuláció állapota.
+    """
+    temporary = f'{file_name}.tmp'
+    with open(temporary, 'wb') as f:
+        with gzip.GzipFile(fileobj=f, mode='wb', compresslevel=6, mtime=0) as compressed:
+            pickle.dump(state, compressed, protocol=pickle.HIGHEST_PROTOCOL)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, file_name)
+
+
+def load_checkpoint(file_name: str) -> dict:
+    """Betölti az elmentett állapotot.
+
+    Args:
+        file_name (str): A fájl neve.
+
+    Returns:
+        dict: A szimuláció állapota.
+    """
+    with gzip.open(file_name, 'rb') as f:
+        state = pickle.load(f)
+    if state.get("version") != CHECKPOINT_VERSION:
+        raise Exception('Incompatible checkpoint')
+    return state
+
+
+def run_checkpointed(state: dict, file_name: str, every_rounds: int = 100000) -> dict:
+    """Lejátssza a hátralévő köröket, és minden every_rounds kör után ellenőrzőpontot ment.
+    Egy megszakított és folytatott szimuláció ugyanazt az eredményt adja, mint a megszakítás nélküli.
+    >>> import tempfile
+    >>> config = {"deck_count": 2, "rounds": 1000, "min_bet": 100, "max_bet": 3000, "chips": 5000,
+    ...           "basic_strategy": True, "bet_system": "Hi-Lo", "rules": "Default", "seed": 7}
+    >>> file_name = os.path.join(tempfile.mkdtemp(), 'run.ckpt')
+    >>> uninterrupted = run_checkpointed(start(config), file_name, 300)
+    >>> state = start(config)
+    >>> advance(state, 400)
+    >>> save_checkpoint(file_name, state)
+    >>> resumed = run_checkpointed(load_checkpoint(file_name), file_name, 300)
+    >>> resumed["history"] == uninterrupted["history"], len(resumed["history"])
+    (True, 1000)
+    >>> resumed["count_histogram"] == uninterrupted["count_histogram"], sum(resumed["count_histogram"]["hands"])
+    (True, 1000)
+    >>> load_checkpoint(file_name)["rounds_done"], os.path.exists(file_name + '.tmp')
+    (1000, False)
+
+    Args:
+        state (dict): A szimuláció állapota, ahogy a start vagy a load_checkpoint visszaadja.
+        file_name (str): Az ellenőrzőpont fájl neve.
+        every_rounds (int): Ennyi körönként ment.
+
+    Returns:
+        dict: A beállítások kiegészítve a körök utáni zseton mennyiségekkel (history) és lapszámolás esetén
+            a valódi érték szerinti hisztogrammal (count_histogram), ahogy a run_simulation visszaadja.
+    """
+    rounds = state["config"]["rounds"]
+    while state["rounds_done"] < rounds:
+        advance(state, min(every_rounds, rounds - state["rounds_done"]))
+        save_checkpoint(file_name, state)
+    data = dict(state["config"], history=state["history"].tolist())
+    if state.get("histogram") is not None:
+        data["count_histogram"] = state["histogram"].as_dict()
+    return data
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,162 @@
+from simulation import create_simulation
+from ai import Multi_counter
+from blackjack_logic import INFINITE_DECK, CHIP_SCALE
+from random import Random
+from statistics import fmean, variance
+
+
+def play_shoes(config: dict, shoes: int) -> list:
+    """Lejátssza a megadott számú cipőt, és cipőnként összegzi a játékos nyereségét.
+    Egy kör ahhoz a cipőhöz tartozik, amelyikben elkezdődött.
+
+    Args:
+        config (dict): A szimuláció beállításai, a deck_seed határozza meg a keveréseket.
+        shoes (int): A cipők száma.
+
+    Returns:
+        list: A (nyereség, körök száma) párok cipőnként.
+    """
+    ai, g = create_simulation(config)
+    counting = bool(config["bet_system"])
+    results = [[0, 0] for _ in range(shoes)]
+    units = g.get_player_chip_units()
+    shoe = g.get_shoe_number()
+    while shoe <= shoes:
+        g.round()
+        if counting:
+            ai.view_cards_on_the_table(g.get_cards_on_the_table())
+        new_units = g.get_player_chip_units()
+        results[shoe - 1][0] += new_units - units
+        results[shoe - 1][1] += 1
+        units = new_units
+        shoe = g.get_shoe_number()
+    return [[won / CHIP_SCALE, rounds] for won, rounds in results]
+
+
+def compare(configs: list, shoes: int, seed: int = None) -> dict:
+    """Közös véletlen számokkal hasonlítja össze a beállításokat: mindegyik ugyanazt a cipősorozatot kapja, a játékosok döntései
+    pedig külön véletlenszám forrásból jönnek, így a keverések nem függnek attól, hogy melyik beállítás hány lapot használ el.
+    A cipőnkénti nyereségek különbségei párosíthatók, a páros különbség varianciája pedig sokkal kisebb,
+    mint két független szimuláció eredményei különbségének a varianciája, így ugyanakkora pontossághoz kevesebb kör is elég.
+    >>> table = {"deck_count": 6, "min_bet": 100, "max_bet": 3000, "chips": 10 ** 6, "basic_strategy": True, "rules": "Default"}
+    >>> result = compare([dict(table, bet_system='Hi-Lo'), dict(table, bet_system='Omega II')], 60, seed=1)
+    >>> difference = result['differences'][0]
+    >>> difference['paired_variance'] < difference['unpaired_variance']
+    True
+    >>> same = compare([dict(table, bet_system='Hi-Lo'), dict(table, bet_system='Hi-Lo')], 10, seed=1)['differences'][0]
+    >>> same['mean'] == same['paired_variance'] == 0
+    True
+
+    Args:
+        configs (list): A szimulációk beállításai. Az első az alap, a többi ehhez van hasonlítva.
+        shoes (int): A cipők száma beállításonként, legalább 2.
+        seed (int): A keverések és a játékosok véletlenszám forrásainak a kezdőértéke.
+
+    Returns:
+        dict: A cipők száma (shoes), beállításonként a körök száma, a teljes nyereség, a cipőnkénti átlag és variancia (configs),
+            valamint az alaphoz képest a cipőnkénti különbség átlaga, páros és független varianciája,
+            a hozzájuk tartozó standard hibák és a variancia csökkenés aránya (differences).
+    """
+    if shoes < 2:
+        raise Exception('At least two shoes are needed')
+    if any(config["deck_count"] == INFINITE_DECK for config in configs):
+        raise Exception('Common random numbers need a finite number of decks')
+    seeds = Random(seed)
+    deck_seed = seeds.getrandbits(64)
+    ai_seed = seeds.getrandbits(64)
+    results = [play_shoes(dict(config, seed=ai_seed, deck_seed=deck_seed), shoes) for config in configs]
+    wins = [[won for won, _ in result] for result in results]
+    summary = {
+        'shoes': shoes,
+        'configs': [{
+            'config': config,
+            'rounds': sum(rounds for _, rounds in result),
+            'total': sum(won),
+            'mean': fmean(won),
+            'variance': variance(won),
+        } for config, result, won in zip(configs, results, wins)],
+        'differences': [],
+    }
+    for index in range(1, len(configs)):
+        differences = [won - base for won, base in zip(wins[index], wins[0])]
+        paired = variance(differences)
+        unpaired = variance(wins[index]) + variance(wins[0])
+        summary['differences'].append({
+            'against': index,
+            'mean': fmean(differences),
+            'paired_variance': paired,
+            'unpaired_variance': unpaired,
+            'paired_standard_error': (paired / shoes) ** 0.5,
+            'unpaired_standard_error': (unpaired / shoes) ** 0.5,
+            'variance_reduction': unpaired / paired if paired else float('inf'),
+        })
+    return summary
+
+
+def compare_systems(config: dict, systems: list = None) -> dict:
+    """Egyetlen játékon, ugyanazokból a kiosztott lapokból értékeli ki az összes lapszámolási technikát.
+    A Multi_counter minden kör előtt kiszámolja, hogy mekkora tétet tenne az egyes technikák szerint játszó játékos,
+    a kör eredményét pedig a valódi tét arányában kapja meg mindegyik. Minden kifizetés (a biztosítást is beleértve) a tét egész
+    számú zseton egységnyi többszöröse, így az arányos eredmény pontos, és mivel a játékos döntései nem függnek a tét nagyságától,
+    ez ugyanaz, mintha a technikák egymás után ugyanazt a játékot játszották volna (amíg a zsetonjaik elegendőek), de csak egyszer kell leosztani a lapokat.
+    A játékos lépései a beállítások szerint történnek (a deviations a saját bet_system technikájának valódi értékét használja).
+    >>> config = {"deck_count": 6, "rounds": 2000, "min_bet": 100, "max_bet": 3000, "chips": 10 ** 6, "basic_strategy": True,
+    ...           "bet_system": False, "rules": "Default", "seed": 3}
+    >>> result = compare_systems(config)
+    >>> result['rounds'], [*result['systems']] == Multi_counter().systems
+    (2000, True)
+    >>> hi_lo = compare_systems(dict(config, bet_system='Hi-Lo'), ['Hi-Lo'])['systems']['Hi-Lo']
+    >>> from simulation import run_simulation
+    >>> hi_lo['final_chips'] == run_simulation(dict(config, bet_system='Hi-Lo'))['history'][-1]
+    True
+    >>> for deviations in ('Fab 4', 'Illustrious 18'):
+    ...     atlantic = dict(config, bet_system='Hi-Lo', rules='Atlantic City', deviations=deviations,
+    ...                     min_bet=101, max_bet=3001)
+    ...     print(compare_systems(atlantic, ['Hi-Lo'])['systems']['Hi-Lo']['final_chips'] == run_simulation(atlantic)['history'][-1])
+    True
+    True
+
+    Args:
+        config (dict): A szimuláció beállításai, köztük a körök száma (rounds). A bet_ramp és a deck_resolution a technikákra is vonatkozik.
+        systems (list): A technikák nevei, ha nincs megadva, akkor az összes.
+
+    Returns:
+        dict: A körök száma (rounds), és technikánként a végső zseton mennyiség (final_chips), a nyereség (total),
+            a megtett tétek összege (wagered), az átlagos tét (mean_bet) és a megtett tét arányában vett nyereség (ev).
+    """
+    ai, g = create_simulation(config)
+    counting = bool(config["bet_system"])
+    counter = Multi_counter(systems, config["deck_count"], config.get("bet_ramp", "Linear"), config.get("deck_resolution", 1))
+    min_bet, max_bet = config["min_bet"], config["max_bet"]
+    bankrolls = [config["chips"] * CHIP_SCALE] * len(counter.systems)
+    wagered = [0] * len(counter.systems)
+    units = g.get_player_chip_units()
+    for _ in range(config["rounds"]):
+        bets = counter.calculate_bets(min_bet, max_bet, [bankroll // CHIP_SCALE for bankroll in bankrolls])
+        g.round()
+        cards = g.get_cards_on_the_table()
+        if counting:
+            ai.view_cards_on_the_table(cards)
+        counter.running_count(cards)
+        new_units = g.get_player_chip_units()
+        won = new_units - units
+        round_bet = g.get_round_bet()
+        units = new_units
+        for index, bet in enumerate(bets):
+            bankrolls[index] += bet * won // round_bet
+            wagered[index] += bet
+    return {
+        'rounds': config["rounds"],
+        'systems': {system: {
+            'final_chips': bankroll // CHIP_SCALE,
+            'total': bankroll // CHIP_SCALE - config["chips"],
+            'wagered': total_bet,
+            'mean_bet': total_bet / config["rounds"] if config["rounds"] else 0,
+            'ev': (bankroll - config["chips"] * CHIP_SCALE) / (total_bet * CHIP_SCALE) if total_bet else 0,
+        } for system, bankroll, total_bet in zip(counter.systems, bankrolls, wagered)},
+    }
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
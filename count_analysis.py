@@ -0,0 +1,130 @@
+from solver import Composition_solver, full_shoe, CARD_VALUES
+from blackjack_logic import load_rules, load_data
+from ai import Strategy, load_tag_matrix
+from functools import lru_cache
+
+WEIGHTS = [4 if value == 10 else 1 for value in CARD_VALUES]
+
+
+@lru_cache(maxsize=None)
+def effects_of_removal(deck_count: int, rules: str = 'Default', deviations: str = 'Illustrious 18') -> tuple:
+    """Kiszámolja, hogy egy-egy lap eltávolítása a teljes cipőből mennyivel változtatja meg a játék, a biztosítás
+    és az eltérésekben szereplő döntések várható értékét. Paklinként, szabályonként és eltérés készletenként csak egyszer számol.
+
+    Args:
+        deck_count (int): A paklik száma.
+        rules (str): A szabályok neve a data/rules.json fájlban.
+        deviations (str): Az eltérések neve a data/deviations.json fájlban, ezek a döntések adják a játék hatékonyságot.
+
+    Returns:
+        tuple: Három elem: a játék és a biztosítás lapértékenkénti hatása (2-11), valamint a döntések listája,
+            ahol egy döntés az eltérés, a lapértékenkénti hatás az eltérés és az alapstratégia várható értékének a különbségére.
+    """
+    rule_set = load_rules(rules)
+    strategy = Strategy()
+    decisions = [deviation for deviation in load_data('deviations')[deviations] if deviation['hand'] != 'insurance']
+
+    def evaluate(solver: Composition_solver) -> list:
+        values = [solver.expected_value(), solver.insurance_ev()]
+        for decision in decisions:
+            basic = strategy._tables[decision['hand']][decision['player']][decision['dealer']]
+            values.append(solver.action_ev(decision['hand'], decision['player'], decision['dealer'], decision['move'])
+                          - solver.action_ev(decision['hand'], decision['player'], decision['dealer'], basic))
+        return values
+
+    shoe = full_shoe(deck_count)
+    base = evaluate(Composition_solver(shoe, rule_set))
+    effects = [[] for _ in base]
+    for value in CARD_VALUES:
+        shoe[value] -= 1
+        for effect, removed, full in zip(effects, evaluate(Composition_solver(shoe, rule_set)), base):
+            effect.append(removed - full)
+        shoe[value] += 1
+    return effects[0], effects[1], list(zip(decisions, effects[2:]))
+
+
+def _center(vector: list) -> list:
+    """A lapok gyakoriságával súlyozott átlagot kivonja a vektorból.
+
+    Args:
+        vector (list): Lapértékenkénti értékek.
+
+    Returns:
+        list: A középre igazított értékek.
+    """
+    mean = sum(weight * x for weight, x in zip(WEIGHTS, vector)) / sum(WEIGHTS)
+    return [x - mean for x in vector]
+
+
+def correlations(tag_matrix: list, effect_matrix: list) -> list:
+    """Egyszerre kiszámolja az összes címke vektor és az összes hatás vektor súlyozott korrelációját.
+    Mindkét mátrix sorait egyszer igazítja középre és normálja, utána a korrelációk egyetlen mátrix szorzás eredményei.
+
+    Args:
+        tag_matrix (list): Soronként egy technika címkéi.
+        effect_matrix (list): Soronként egy hatás vektor.
+
+    Returns:
+        list: A [technika][hatás] korrelációk.
+    """
+    def normalize(matrix: list) -> list:
+        rows = []
+        for row in matrix:
+            row = _center(row)
+            norm = sum(weight * x * x for weight, x in zip(WEIGHTS, row)) ** 0.5
+            rows.append([weight * x / norm if norm else 0.0 for weight, x in zip(WEIGHTS, row)])
+        return rows
+
+    tags = normalize(tag_matrix)
+    effects = [[x / weight for weight, x in zip(WEIGHTS, row)] for row in normalize(effect_matrix)]
+    return [[sum(t * e for t, e in zip(tag_row, effect_row)) for effect_row in effects] for tag_row in tags]
+
+
+def analyze_systems(tag_matrix: dict = None, deck_count: int = 6, rules: str = 'Default', deviations: str = 'Illustrious 18') -> dict:
+    """Kiszámolja a lapszámolási technikák jellemzőit közvetlenül a címkékből:
+        - tét korreláció (betting correlation): a címkék és a lapok játékra gyakorolt hatásának a korrelációja,
+        - játék hatékonyság (playing efficiency): az eltérések döntéseinek a hatásával vett korrelációk átlaga, előjellel aszerint,
+          hogy az eltérés magas vagy alacsony valódi értéknél érvényes,
+        - biztosítás korreláció (insurance correlation): a címkék és a lapok biztosításra gyakorolt hatásának a korrelációja,
+        - egyensúly (balance): a címkék összege egy teljes paklira, 0 esetén kiegyensúlyozott a technika.
+    >>> result = analyze_systems(deck_count=6)
+    >>> sorted(result)
+    ["Dr. Thorp's Ultimate", 'Halves', 'Hi-Lo', 'Omega II']
+    >>> 0.9 < result['Hi-Lo']['betting_correlation'] < 1, result['Hi-Lo']['balance']
+    (True, 0.0)
+    >>> result['Halves']['betting_correlation'] > result['Hi-Lo']['betting_correlation']
+    True
+    >>> result['Omega II']['insurance_correlation'] > result['Hi-Lo']['insurance_correlation']
+    True
+    >>> custom = analyze_systems({'Unbalanced': [1, 1, 1, 1, 1, 0.5, 0, 0, -1, -1]})['Unbalanced']
+    >>> custom['balance'], custom['betting_correlation'] > 0.9
+    (0.5, True)
+
+    Args:
+        tag_matrix (dict): Technikánként a 2-11 lapértékek címkéi, ha nincs megadva, akkor a data/counting_systems.json technikái.
+        deck_count (int): A paklik száma.
+        rules (str): A szabályok neve.
+        deviations (str): Az eltérések neve.
+
+    Returns:
+        dict: Technikánként a betting_correlation, playing_efficiency, insurance_correlation és balance értékek.
+    """
+    if tag_matrix is None:
+        tag_matrix = load_tag_matrix()
+    game, insurance, decisions = effects_of_removal(deck_count, rules, deviations)
+    matrix = correlations(list(tag_matrix.values()), [game, insurance, *[effect for _, effect in decisions]])
+    signs = [1 if decision['when'] == '>=' else -1 for decision, _ in decisions]
+    result = {}
+    for name, tags, row in zip(tag_matrix, tag_matrix.values(), matrix):
+        result[name] = {
+            'betting_correlation': row[0],
+            'playing_efficiency': sum(sign * c for sign, c in zip(signs, row[2:])) / len(signs) if signs else None,
+            'insurance_correlation': row[1],
+            'balance': sum(weight * tag for weight, tag in zip(WEIGHTS, tags)),
+        }
+    return result
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,338 @@
+from adaptive import Running_stats, play_batch
+from betting import Count_histogram
+from simulation import create_simulation
+from shoe_bank import shard_configs
+from collections import deque
+from multiprocessing import Process
+from random import Random
+from time import monotonic, sleep
+import json
+import socket
+import socketserver
+import threading
+
+
+def _send(f, message: dict) -> None:
+    """Elküld egy üzenetet: egy JSON objektum egy sorban.
+
+    Args:
+        f: A kapcsolat írható bináris fájl objektuma.
+        message (dict): Az üzenet.
+    """
+    f.write(json.dumps(message).encode() + b'\n')
+    f.flush()
+
+
+def split_work(configs: list, unit_rounds: int, seed: int = None) -> list:
+    """Munkaegységekre bontja a szimulációkat. Minden egység saját seed értéket kap, ami csak a seed-től és az egység
+    sorszámától függ, így az eredmény nem függ attól, hogy melyik munkás hányadikként játssza le. Ha egy szimulációnak
+    saját seed értéke van, akkor az egységei seed értékei abból származnak, így a csak seed-ben eltérő szimulációk is különböznek.
+    Cipő bank esetén minden egység a bank saját, a többivel nem átfedő szakaszából oszt.
+    >>> units = split_work([{"rounds": 2500}, {"rounds": 1000}], 1000, seed=1)
+    >>> [(unit['id'], unit['config_index'], unit['config']['rounds']) for unit in units]
+    [(0, 0, 1000), (1, 0, 1000), (2, 0, 500), (3, 1, 1000)]
+    >>> units == split_work([{"rounds": 2500}, {"rounds": 1000}], 1000, seed=1)
+    True
+    >>> seeded = split_work([{"rounds": 1000, "seed": 1}, {"rounds": 1000, "seed": 2}, {"rounds": 1000, "seed": 1}], 1000)
+    >>> [unit['config']['seed'] for unit in seeded] == [Random(1).getrandbits(64), Random(2).getrandbits(64), Random(1).getrandbits(64)]
+    True
+    >>> import os, tempfile
+    >>> from shoe_bank import create_bank
+    >>> bank = os.path.join(tempfile.mkdtemp(), 'bank.shoes')
+    >>> create_bank(bank, 1, 30, seed=1)
+    >>> [(unit['config']['first_shoe'], unit['config']['shoe_count']) for unit in split_work([{"rounds": 2500, "shoe_bank": bank}], 1000)]
+    [(0, 10), (10, 10), (20, 10)]
+
+    Args:
+        configs (list): A szimulációk beállításai, köztük a körök száma (rounds).
+        unit_rounds (int): Egy munkaegység legfeljebb ennyi kör.
+        seed (int): A saját seed nélküli szimulációk seed értékeinek a kezdőértéke, ha None, akkor véletlenszerű.
+
+    Returns:
+        list: A munkaegységek: azonosító (id), a szimuláció sorszáma (config_index) és a beállítások a saját seed és rounds értékkel (config).
+    """
+    common_seeds = Random(seed)
+    units = []
+    for index, config in enumerate(configs):
+        seeds = common_seeds if config.get("seed") is None else Random(config["seed"])
+        starts = range(0, config["rounds"], unit_rounds)
+        for start, shard in zip(starts, shard_configs(config, len(starts))):
+            rounds = min(unit_rounds, config["rounds"] - start)
+            units.append({'id': len(units), 'config_index': index,
+                          'config': dict(shard, rounds=rounds, seed=seeds.getrandbits(64))})
+    return units
+
+
+class Coordinator:
+    """Kiosztja a munkaegységeket a hozzá TCP-n kapcsolódó munkásoknak, és összegyűjti a statisztikáikat.
+    A protokoll soronként egy JSON üzenet: a koordinátor task üzenetben küldi az egységet, a munkás result üzenetben
+    válaszol, ha pedig nincs több munka, akkor done üzenetet kap. Ha egy munkás kapcsolata megszakad (vagy a timeout
+    alatt nem válaszol), akkor a nála lévő egység visszakerül a sorba, és egy másik munkás kapja meg.
+    Az eredmények egységenként, sorszám szerint vonódnak össze, így azonos seed esetén a munkások számától és
+    a kiesésektől függetlenül ugyanaz az eredmény. Ha egy egység hibát jelez (error üzenet), vagy max_attempts próbálkozás
+    sem sikerül, akkor a futás hibával leáll, és nem próbálja újra a végtelenségig.
+    """
+
+    def __init__(self, configs: list, unit_rounds: int = 100000, seed: int = None, host: str = '127.0.0.1', port: int = 0,
+                 timeout: float = None, max_attempts: int = 3) -> None:
+        """
+        Args:
+            configs (list): A szimulációk beállításai, köztük a körök száma (rounds).
+            unit_rounds (int): Egy munkaegység legfeljebb ennyi kör.
+            seed (int): A saját seed nélküli szimulációk munkaegységei seed értékeinek a kezdőértéke.
+            host (str): A cím, ahol a munkásokat várja.
+            port (int): A port, 0 esetén az operációs rendszer választ egyet.
+            timeout (float): Ennyi másodperc után halottnak tekinti a nem válaszoló munkást, ha nincs megadva, akkor csak a kapcsolat megszakadását figyeli.
+            max_attempts (int): Egy munkaegységet legfeljebb ennyiszer ad ki.
+        """
+        self._configs = configs
+        self._units = split_work(configs, unit_rounds, seed)
+        self._pending = deque(range(len(self._units)))
+        self._results = {}
+        self._attempts = [0] * len(self._units)
+        self._max_attempts = max_attempts
+        self._error = None
+        self._condition = threading.Condition()
+        self._timeout = timeout
+        coordinator = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                self.request.settimeout(coordinator._timeout)
+                coordinator._serve_worker(self.rfile, self.wfile)
+
+        self._server = socketserver.ThreadingTCPServer((host, port), Handler, bind_and_activate=False)
+        self._server.daemon_threads = True
+        self._server.allow_reuse_address = True
+        self._server.server_bind()
+        self._server.server_activate()
+        self.address = self._server.server_address
+
+    def _is_finished(self) -> bool:
+        """Elkészült-e az összes munkaegység, vagy hibával leállt-e a futás."""
+        return len(self._results) == len(self._units) or self._error is not None
+
+    def _fail(self, unit_id: int, message: str) -> None:
+        """Hibával leállítja a futást. A hívónak a feltétel zárolását kell tartania.
+
+        Args:
+            unit_id (int): A hibás munkaegység azonosítója.
+            message (str): A hiba leírása.
+        """
+        if self._error is None:
+            self._error = f'Work unit {unit_id} failed: {message}'
+        self._condition.notify_all()
+
+    def _next_unit(self) -> int:
+        """Kivesz egy munkaegységet a sorból. Ha a sor üres, de még van kint lévő egység, akkor megvárja, hogy
+        az elkészüljön, vagy visszakerüljön a sorba.
+
+        Returns:
+            int: Az egység azonosítója, vagy None, ha minden egység elkészült.
+        """
+        with self._condition:
+            while not self._pending and not self._is_finished():
+                self._condition.wait()
+            if self._error is not None or not self._pending:
+                return None
+            unit_id = self._pending.popleft()
+            self._attempts[unit_id] += 1
+            return unit_id
+
+    def _serve_worker(self, rfile, wfile) -> None:
+        """Egy munkás kiszolgálása, amíg el nem fogy a munka vagy meg nem szakad a kapcsolat.
+
+        Args:
+            rfile: A kapcsolat olvasható fájl objektuma.
+            wfile: A kapcsolat írható fájl objektuma.
+        """
+        unit_id = None
+        try:
+            while True:
+                unit_id = self._next_unit()
+                if unit_id is None:
+                    _send(wfile, {'type': 'done'})
+                    return
+                unit = self._units[unit_id]
+                _send(wfile, {'type': 'task', 'id': unit_id, 'config': unit['config']})
+                line = rfile.readline()
+                if not line:
+                    return
+                message = json.loads(line)
+                if message.get('type') == 'error' and message.get('id') == unit_id:
+                    with self._condition:
+                        self._fail(unit_id, message.get('message'))
+                    unit_id = None
+                    continue
+                if message.get('type') != 'result' or message.get('id') != unit_id:
+                    return
+                histogram = Count_histogram.from_dict(message['histogram']) if 'histogram' in message else None
+                with self._condition:
+                    self._results[unit_id] = (Running_stats.from_dict(message['stats']), histogram)
+                    self._condition.notify_all()
+                unit_id = None
+        except (OSError, ValueError):
+            pass
+        finally:
+            if unit_id is not None:
+                with self._condition:
+                    if unit_id not in self._results:
+                        if self._attempts[unit_id] >= self._max_attempts:
+                            self._fail(unit_id, f'no result after {self._attempts[unit_id]} attempts')
+                        else:
+                            self._pending.appendleft(unit_id)
+                    self._condition.notify_all()
+
+    def run(self, workers_alive=None) -> list:
+        """Kiszolgálja a munkásokat, amíg minden munkaegység el nem készül. Ha egy munkaegység nem sikerül, akkor hibát jelez.
+
+        Args:
+            workers_alive (callable): Ha meg van adva, akkor másodpercenként meghívja, és ha False-t ad vissza
+                (például mert az összes helyi munkás folyamat kilépett), akkor hibával leáll.
+
+        Returns:
+            list: Szimulációnként a beállítások kiegészítve a lejátszott körök számával (played_rounds), a körönkénti, kezdő tét arányában
+                vett várható értékkel (ev), a 95%-os konfidencia intervallum félszélességével (half_width) és a szórással (standard_deviation),
+                lapszámolás esetén a munkaegységek összevont valódi érték szerinti hisztogramjával is (count_histogram).
+        """
+        thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self._condition:
+                while not self._is_finished():
+                    self._condition.wait(None if workers_alive is None else 1)
+                    if not self._is_finished() and workers_alive is not None and not workers_alive():
+                        self._error = 'All workers have exited'
+        finally:
+            self._server.shutdown()
+            self._server.server_close()
+            thread.join()
+        if self._error is not None:
+            raise Exception(self._error)
+        return self.summary()
+
+    def summary(self) -> list:
+        """Szimulációnként összevonja a munkaegységek statisztikáit, azonosító szerinti sorrendben.
+
+        Returns:
+            list: Az eredmények, ahogy a run visszaadja.
+        """
+        merged = [Running_stats() for _ in self._configs]
+        histograms = [Count_histogram() for _ in self._configs]
+        for unit in self._units:
+            if unit['id'] in self._results:
+                stats, histogram = self._results[unit['id']]
+                merged[unit['config_index']].merge(stats)
+                if histogram is not None:
+                    histograms[unit['config_index']].merge(histogram)
+        results = []
+        for config, stats, histogram in zip(self._configs, merged, histograms):
+            result = dict(config, played_rounds=stats.count, ev=stats.mean, half_width=stats.half_width(),
+                          standard_deviation=stats.variance() ** 0.5 if stats.count > 1 else float('inf'))
+            if config["bet_system"]:
+                result['count_histogram'] = histogram.as_dict()
+            results.append(result)
+        return results
+
+
+def run_worker(host: str, port: int, connect_timeout: float = 10) -> int:
+    """Egy munkás: kapcsolódik a koordinátorhoz, és lejátssza a kapott munkaegységeket, amíg done üzenetet nem kap.
+    Ha a koordinátor még nem indult el, akkor connect_timeout másodpercig próbálkozik.
+
+    Args:
+        host (str): A koordinátor címe.
+        port (int): A koordinátor portja.
+        connect_timeout (float): Legfeljebb ennyi másodpercig próbál kapcsolódni.
+
+    Returns:
+        int: A lejátszott munkaegységek száma.
+    """
+    deadline = monotonic() + connect_timeout
+    while True:
+        try:
+            connection = socket.create_connection((host, port))
+            break
+        except ConnectionRefusedError:
+            if monotonic() > deadline:
+                raise
+            sleep(0.1)
+    units = 0
+    with connection, connection.makefile('rb') as reader, connection.makefile('wb') as writer:
+        for line in reader:
+            message = json.loads(line)
+            if message['type'] != 'task':
+                break
+            config = message['config']
+            try:
+                ai, g = create_simulation(config)
+                histogram = Count_histogram() if config["bet_system"] else None
+                stats = play_batch(ai, g, config["rounds"], bool(config["bet_system"]), histogram=histogram)
+            except Exception as e:
+                _send(writer, {'type': 'error', 'id': message['id'], 'message': repr(e)})
+                continue
+            result = {'type': 'result', 'id': message['id'], 'stats': stats.as_dict()}
+            if histogram is not None:
+                result['histogram'] = histogram.as_dict()
+            _send(writer, result)
+            units += 1
+    return units
+
+
+def run_distributed(configs: list, unit_rounds: int = 100000, workers: int = 2, seed: int = None) -> list:
+    """Elindít egy koordinátort és a megadott számú helyi munkás folyamatot ugyanazon a gépen.
+    >>> config = {"deck_count": 6, "rounds": 1500, "min_bet": 100, "max_bet": 100, "chips": 10 ** 6, "basic_strategy": True,
+    ...           "bet_system": False, "rules": "Default"}
+    >>> results = run_distributed([config, dict(config, rules='Las Vegas Strip')], 500, workers=2, seed=4)
+    >>> [result['played_rounds'] for result in results]
+    [1500, 1500]
+    >>> run_distributed([config, dict(config, rules='Las Vegas Strip')], 500, workers=1, seed=4) == results
+    True
+    >>> counted = run_distributed([dict(config, bet_system='Hi-Lo')], 500, workers=2, seed=4)[0]
+    >>> sum(counted['count_histogram']['hands'])
+    1500
+
+    Egy hibás beállítás nem akasztja meg a futást:
+
+    >>> run_distributed([dict(config, rules='Nope')], 500, workers=2, seed=4)  # doctest: +ELLIPSIS
+    Traceback (most recent call last):
+    ...
+    Exception: Work unit ... failed: KeyError('Nope')
+
+    Egy munkás, amelyik kiesik, miután megkapta az egységét (itt egy kapcsolat, ami a feladat után bezárul):
+
+    >>> coordinator = Coordinator([config, dict(config, rules='Las Vegas Strip')], 500, seed=4)
+    >>> def dead_worker():
+    ...     with socket.create_connection(coordinator.address) as connection:
+    ...         return json.loads(connection.makefile('rb').readline())['id']
+    >>> def workers():
+    ...     dead_worker()
+    ...     run_worker(*coordinator.address)
+    >>> thread = threading.Thread(target=workers)
+    >>> thread.start()
+    >>> coordinator.run() == results
+    True
+    >>> thread.join()
+
+    Args:
+        configs (list): A szimulációk beállításai, köztük a körök száma (rounds).
+        unit_rounds (int): Egy munkaegység legfeljebb ennyi kör.
+        workers (int): A helyi munkás folyamatok száma.
+        seed (int): A munkaegységek seed értékeinek a kezdőértéke.
+
+    Returns:
+        list: Az eredmények, ahogy a Coordinator.run visszaadja.
+    """
+    coordinator = Coordinator(configs, unit_rounds, seed)
+    processes = [Process(target=run_worker, args=coordinator.address, daemon=True) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        return coordinator.run(lambda: any(process.is_alive() for process in processes))
+    finally:
+        for process in processes:
+            process.join()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
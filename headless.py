@@ -0,0 +1,539 @@
+from simulation import create_simulation, play_rounds, run_simulation
+from instrumentation import Instrumentation, Stack_profiler
+from results_store import Results_store, STORE_FILE
+from comparison import compare, compare_systems
+from adaptive import run_adaptive
+from parallel import run_parallel_adaptive
+from distributed import Coordinator, run_worker
+from multiprocessing import Process
+from count_analysis import analyze_systems, load_tag_matrix
+from shoe_bank import create_bank
+from job_service import serve as serve_jobs, validate_job
+from strategy_learner import Strategy_learner
+from betting import Count_histogram
+from blackjack_logic import load_rules
+import checkpoint
+from itertools import product
+from time import perf_counter
+import argparse
+import asyncio
+import cProfile
+import json
+import os
+import pstats
+import socket
+
+
+SWEEP_PARAMETERS = ('decks', 'rules', 'system', 'bet_ramp', 'min_bet', 'max_bet', 'seed')
+
+
+def _config_from_args(args: argparse.Namespace) -> dict:
+    """A parancssori argumentumokból összeállítja a szimuláció beállításait.
+
+    Args:
+        args (argparse.Namespace): A parancssori argumentumok.
+
+    Returns:
+        dict: A szimuláció beállításai.
+    """
+    return {
+        "deck_count": args.decks,
+        "rounds": args.rounds,
+        "min_bet": args.min_bet,
+        "max_bet": args.max_bet,
+        "chips": args.chips,
+        "basic_strategy": args.basic_strategy,
+        "bet_system": args.system if args.system and args.system != 'off' else False,
+        "rules": args.rules,
+        "seed": args.seed,
+        "deviations": args.deviations,
+        "strategy": args.strategy,
+        "bet_ramp": args.bet_ramp,
+        "deck_resolution": args.deck_resolution,
+        "table_engine": args.table_engine,
+        "shoe_bank": args.shoe_bank,
+        "first_shoe": args.first_shoe,
+    }
+
+
+def _add_config_arguments(parser: argparse.ArgumentParser, sweep: bool = False) -> None:
+    """Hozzáadja a szimuláció beállításaihoz tartozó argumentumokat.
+
+    Args:
+        parser (argparse.ArgumentParser): Az argumentum feldolgozó.
+        sweep (bool): Ha igaz, akkor a SWEEP_PARAMETERS argumentumok több értéket is kaphatnak, és az összes kombináció lefut.
+    """
+    def add(name: str, default, **kwargs) -> None:
+        if sweep and name.lstrip('-').replace('-', '_') in SWEEP_PARAMETERS:
+            parser.add_argument(name, nargs='+', default=[default], **kwargs)
+        else:
+            parser.add_argument(name, default=default, **kwargs)
+
+    add('--decks', 6, type=int, help='number of decks, 0 = infinite deck')
+    add('--rounds', 10000, type=int)
+    add('--min-bet', 100, type=int)
+    add('--max-bet', 3000, type=int)
+    add('--chips', 5000, type=int)
+    parser.add_argument('--basic-strategy', action='store_true')
+    add('--system', None, help='counting system from data/counting_systems.json, off = no counting')
+    add('--rules', 'Default', help='rule set from data/rules.json')
+    add('--seed', None, type=int)
+    add('--deviations', None, help='deviation set from data/deviations.json')
+    parser.add_argument('--strategy', default='basic_strategy', help='strategy file in data/, e.g. one written by the learn command, or a path ending in .json')
+    add('--bet-ramp', 'Linear', help='bet system from data/bet_ramps.json')
+    add('--deck-resolution', 1, type=float)
+    parser.add_argument('--table-engine', action='store_true', help='play with the table driven state machine engine')
+    parser.add_argument('--shoe-bank', metavar='FILE', help='deal the pre-shuffled shoes of a bank file (see the bank command)')
+    parser.add_argument('--first-shoe', type=int, default=0, help='index of the first shoe used from the bank')
+
+
+def _add_store_arguments(parser: argparse.ArgumentParser) -> None:
+    """Hozzáadja az eredmények adatbázisához tartozó argumentumokat.
+
+    Args:
+        parser (argparse.ArgumentParser): Az argumentum feldolgozó.
+    """
+    parser.add_argument('--store', default=STORE_FILE, metavar='FILE', help='results database')
+    parser.add_argument('--no-store', action='store_true', help='do not save the results')
+
+
+def _save(args: argparse.Namespace, data: dict) -> int:
+    """Elmenti a szimulációt az eredmények adatbázisába, ha nincs kikapcsolva.
+
+    Args:
+        args (argparse.Namespace): A parancssori argumentumok.
+        data (dict): A szimuláció adatai.
+
+    Returns:
+        int: Az elmentett szimuláció azonosítója, vagy None.
+    """
+    if args.no_store:
+        return None
+    store = Results_store(args.store)
+    try:
+        return store.save_run(data)
+    finally:
+        store.close()
+
+
+def _play(config: dict, history: list, instrumentation: bool = False, histogram: Count_histogram = None) -> dict:
+    """Lejátssza a szimulációt, opcionálisan fázisonkénti méréssel.
+
+    Args:
+        config (dict): A szimuláció beállításai.
+        history (list): Ehhez a listához fűzi hozzá a zseton mennyiségeket.
+        instrumentation (bool): Mérje-e a kör fázisait.
+        histogram (Count_histogram): Ha meg van adva, akkor ebbe gyűjti a valódi érték szerinti eredményeket.
+
+    Returns:
+        dict: A mérés eredménye, ha be volt kapcsolva, különben None.
+    """
+    ai, g = create_simulation(config)
+    if instrumentation:
+        i = Instrumentation(g)
+        i.attach()
+    play_rounds(ai, g, config["rounds"], bool(config["bet_system"]), history, histogram)
+    return i.report() if instrumentation else None
+
+
+def _print_count_histogram(histogram: dict) -> None:
+    """Kiírja a valódi érték szerinti eredményeket.
+
+    Args:
+        histogram (dict): A hisztogram a Count_histogram.as_dict formájában.
+    """
+    print(f'{"TC":>4} {"Hands":>10} {"Freq":>7} {"EV":>8} {"SD":>6} {"Mean bet":>9}')
+    for row in Count_histogram.from_dict(histogram).rows():
+        print(f'{row["true_count"]:>4} {row["hands"]:>10} {row["frequency"]:7.2%} {row["ev"]:+8.2%} '
+              f'{row["standard_deviation"]:6.3f} {row["mean_bet"]:9.1f}')
+
+
+def _print_report(report: dict) -> None:
+    """Kiírja a fázisonkénti mérés eredményét.
+
+    Args:
+        report (dict): Az Instrumentation.report eredménye.
+    """
+    total = sum(report['times'].values())
+    for phase, seconds in report['times'].items():
+        calls = report['calls'][phase]
+        print(f'{phase:34} {seconds:9.3f} s {seconds / total * 100 if total else 0:6.1f} % '
+              f'{calls:10} calls {seconds / calls * 1e6 if calls else 0:8.2f} us/call')
+    for counter, value in report['counters'].items():
+        print(f'{counter:34} {value:12}')
+
+
+def run(args: argparse.Namespace) -> None:
+    """A run parancs: lefuttat egy szimulációt, opcionálisan méréssel vagy profilozással. A fázisonkénti mérés a profilozással
+    együtt is használható, az ellenőrzőpontos futás viszont sem méréssel, sem profilozással nem kombinálható."""
+    if args.checkpoint and args.instrument:
+        raise Exception('--instrument cannot be used with --checkpoint')
+    config = _config_from_args(args)
+    history = []
+    histogram = Count_histogram() if config["bet_system"] else None
+    start = perf_counter()
+    report = None
+    if args.checkpoint:
+        data = checkpoint.run_checkpointed(checkpoint.start(config), args.checkpoint, args.checkpoint_every)
+        history = data["history"]
+        if histogram is not None:
+            histogram = Count_histogram.from_dict(data["count_histogram"])
+    elif args.profile:
+        profiler = cProfile.Profile()
+        report = profiler.runcall(_play, config, history, args.instrument, histogram)
+        profiler.dump_stats(args.profile)
+        pstats.Stats(profiler).sort_stats('cumulative').print_stats(20)
+    elif args.collapsed:
+        profiler = Stack_profiler()
+        report = profiler.run(_play, config, history, args.instrument, histogram)
+        profiler.write_collapsed(args.collapsed)
+    else:
+        report = _play(config, history, args.instrument, histogram)
+    elapsed = perf_counter() - start
+    if report is not None:
+        _print_report(report)
+    data = dict(config, history=history)
+    if histogram is not None:
+        data["count_histogram"] = histogram.as_dict()
+        if args.by_count:
+            _print_count_histogram(data["count_histogram"])
+    run_id = _save(args, data)
+    print(f'After {config["rounds"]} rounds, the value of the chips is {history[-1]}. '
+          f'({config["rounds"] / elapsed:.0f} rounds/sec)' + ('' if run_id is None else f' Saved as run #{run_id}.'))
+
+
+def resume(args: argparse.Namespace) -> None:
+    """A resume parancs: betölti az ellenőrzőpontot, pontosan úgy játssza le a hátralévő köröket, ahogy a megszakított futás tette volna, majd elmenti az eredményt."""
+    state = checkpoint.load_checkpoint(args.checkpoint)
+    rounds_done = state["rounds_done"]
+    start = perf_counter()
+    data = checkpoint.run_checkpointed(state, args.checkpoint, args.checkpoint_every)
+    elapsed = perf_counter() - start
+    run_id = _save(args, data)
+    print(f'Resumed after {rounds_done} rounds. After {data["rounds"]} rounds, the value of the chips is {data["history"][-1]}. '
+          f'({(data["rounds"] - rounds_done) / elapsed if elapsed else 0:.0f} rounds/sec)' + ('' if run_id is None else f' Saved as run #{run_id}.'))
+
+
+def _sweep_args(args: argparse.Namespace) -> list:
+    """A SWEEP_PARAMETERS argumentumok összes kombinációja.
+
+    Args:
+        args (argparse.Namespace): A parancssori argumentumok, a SWEEP_PARAMETERS értékei listák.
+
+    Returns:
+        list: Kombinációnként egy argumentum készlet, egy-egy értékkel.
+    """
+    sweep_args = []
+    for values in product(*(getattr(args, name) for name in SWEEP_PARAMETERS)):
+        run_args = argparse.Namespace(**vars(args))
+        for name, value in zip(SWEEP_PARAMETERS, values):
+            setattr(run_args, name, value)
+        sweep_args.append(run_args)
+    return sweep_args
+
+
+def sweep(args: argparse.Namespace) -> None:
+    """A sweep parancs: a megadott paraméterek összes kombinációjával lefuttat egy-egy szimulációt, és elmenti őket."""
+    for run_args in _sweep_args(args):
+        data = run_simulation(_config_from_args(run_args))
+        run_id = _save(args, data)
+        print(('' if run_id is None else f'#{run_id}: ') + f'decks={run_args.decks} rules={run_args.rules} system={run_args.system or "off"} '
+              f'bet_ramp={run_args.bet_ramp} bets={run_args.min_bet}-{run_args.max_bet} seed={run_args.seed}: '
+              f'{data["history"][-1]} chips after {data["rounds"]} rounds')
+
+
+def adaptive(args: argparse.Namespace) -> None:
+    """Az adaptive parancs: adagokban játszik, amíg a körönkénti várható érték el nem éri a kívánt pontosságot,
+    vagy el nem fogy a körök kerete (--rounds). Több munkafolyamat esetén azok egyszerre állnak le."""
+    config = _config_from_args(args)
+    start = perf_counter()
+    if args.workers == 1:
+        result = run_adaptive(config, args.precision, args.confidence, args.batch_rounds, args.rounds)
+    else:
+        result = run_parallel_adaptive(config, args.precision, args.confidence, args.batch_rounds, args.rounds, args.workers)
+    elapsed = perf_counter() - start
+    print(f'EV per hand: {result["ev"] * 100:+.3f}% ± {result["half_width"] * 100:.3f}% ({args.confidence * 100:g}% confidence), '
+          f'standard deviation {result["standard_deviation"]:.3f}')
+    print(f'{"Converged" if result["converged"] else "Round budget exhausted"} after {result["rounds"]} rounds '
+          f'({result["rounds"] / elapsed:.0f} rounds/sec)')
+
+
+def coordinate(args: argparse.Namespace) -> None:
+    """A coordinator parancs: a megadott paraméterek összes kombinációját munkaegységekre bontja, és kiosztja a kapcsolódó munkásoknak.
+    A munkaegységek seed értékei a kombináció --seed értékéből származnak.
+    A --local-workers munkás folyamatokat ugyanezen a gépen el is indítja."""
+    configs = [_config_from_args(run_args) for run_args in _sweep_args(args)]
+    coordinator = Coordinator(configs, args.unit_rounds, None, args.host, args.port, args.timeout)
+    print(f'Coordinator listening on {coordinator.address[0]}:{coordinator.address[1]}', flush=True)
+    processes = [Process(target=run_worker, args=coordinator.address, daemon=True) for _ in range(args.local_workers)]
+    for process in processes:
+        process.start()
+    start = perf_counter()
+    results = coordinator.run()
+    elapsed = perf_counter() - start
+    for process in processes:
+        process.join()
+    for result in results:
+        print(f'decks={result["deck_count"]} rules={result["rules"]} system={result["bet_system"] or "off"} '
+              f'bet_ramp={result["bet_ramp"]} bets={result["min_bet"]}-{result["max_bet"]} seed={result["seed"]}: '
+              f'EV per hand {result["ev"] * 100:+.3f}% ± {result["half_width"] * 100:.3f}% after {result["played_rounds"]} rounds')
+    print(f'{sum(result["played_rounds"] for result in results) / elapsed:.0f} rounds/sec')
+
+
+def work(args: argparse.Namespace) -> None:
+    """A worker parancs: kapcsolódik a koordinátorhoz, és addig játssza a kapott munkaegységeket, amíg van munka."""
+    units = run_worker(args.host, args.port, args.connect_timeout)
+    print(f'Played {units} work units')
+
+
+def _player_config(table: dict, player: str) -> dict:
+    """Egy játékos leírásából (STRATEGY[:SYSTEM[:BET_RAMP[:DEVIATIONS]]], ahol STRATEGY basic vagy random) a szimuláció beállításai.
+
+    Args:
+        table (dict): Az asztal beállításai.
+        player (str): A játékos leírása, például basic:Hi-Lo:1-8 spread.
+
+    Returns:
+        dict: A szimuláció beállításai.
+    """
+    strategy, system, bet_ramp, deviations = (player.split(':') + [None] * 3)[:4]
+    if strategy not in ('basic', 'random'):
+        raise Exception(f'Unknown strategy: {strategy}')
+    return dict(table, basic_strategy=strategy == 'basic', bet_system=system if system and system != 'off' else False,
+                bet_ramp=bet_ramp or 'Linear', deviations=deviations or None)
+
+
+def compare_players(args: argparse.Namespace) -> None:
+    """A compare parancs: a játékosokat közös véletlen számokkal, ugyanazokon a cipőkön hasonlítja össze az elsőhöz."""
+    table = {"deck_count": args.decks, "min_bet": args.min_bet, "max_bet": args.max_bet, "chips": args.chips,
+             "rules": args.rules, "deck_resolution": args.deck_resolution, "table_engine": args.table_engine}
+    result = compare([_player_config(table, player) for player in args.player], args.shoes, args.seed)
+    for player, config in zip(args.player, result['configs']):
+        print(f'{player:30} {config["rounds"]:9} rounds {config["total"]:12} chips {config["mean"]:10.1f} per shoe '
+              f'(variance {config["variance"]:.0f})')
+    for difference in result['differences']:
+        print(f'{args.player[difference["against"]]} - {args.player[0]}: {difference["mean"]:+.1f} per shoe, '
+              f'standard error {difference["paired_standard_error"]:.1f} paired / {difference["unpaired_standard_error"]:.1f} unpaired, '
+              f'variance reduction {difference["variance_reduction"]:.1f}x')
+
+
+def systems(args: argparse.Namespace) -> None:
+    """A systems parancs: egyetlen játékon, ugyanazokból a lapokból számolja ki az összes lapszámolási technika tétjeit és eredményét."""
+    start = perf_counter()
+    result = compare_systems(_config_from_args(args), args.only)
+    elapsed = perf_counter() - start
+    for name, values in sorted(result['systems'].items(), key=lambda item: -item[1]['ev']):
+        print(f'{name:24} {values["total"]:+12} chips {values["mean_bet"]:9.1f} mean bet {values["ev"]:+8.4%} of wagered')
+    print(f'{result["rounds"]} rounds, {len(result["systems"])} systems in {elapsed:.2f} s')
+
+
+def analyze(args: argparse.Namespace) -> None:
+    """Az analyze parancs: kiszámolja a lapszámolási technikák tét korrelációját, játék hatékonyságát, biztosítás korrelációját
+    és egyensúlyát, a tét korreláció szerint sorba rendezve."""
+    tag_matrix = load_tag_matrix()
+    for custom in args.tags or []:
+        name, tags = custom.split('=')
+        tag_matrix[name] = [float(tag) for tag in tags.split(',')]
+        if len(tag_matrix[name]) != 10:
+            raise Exception('A tag vector needs 10 values for the cards 2-9, 10 and A')
+    result = analyze_systems(tag_matrix, args.decks, args.rules, args.deviations)
+    print(f'{"System":24} {"BC":>6} {"PE":>6} {"IC":>6} {"Balance":>8}')
+    for name, values in sorted(result.items(), key=lambda item: -item[1]['betting_correlation']):
+        print(f'{name:24} {values["betting_correlation"]:6.3f} {values["playing_efficiency"]:6.3f} '
+              f'{values["insurance_correlation"]:6.3f} {values["balance"]:8g}')
+
+
+def serve(args: argparse.Namespace) -> None:
+    """A serve parancs: elindítja a helyi szimulációs szolgáltatást, ami a leállításig fut."""
+    try:
+        asyncio.run(serve_jobs(args.workers or None, args.per_client, args.chunk_rounds, args.host, args.port,
+                               None if args.no_store else args.store))
+    except KeyboardInterrupt:
+        pass
+
+
+def submit(args: argparse.Namespace) -> None:
+    """A submit parancs: elküld egy szimulációt a szolgáltatásnak, és kiírja az állapotát, amíg el nem készül."""
+    config = {key: value for key, value in _config_from_args(args).items() if value is not None}
+    validate_job(config)
+    with socket.create_connection((args.host, args.port)) as connection, connection.makefile('rwb') as f:
+        f.write(json.dumps({'type': 'submit', 'config': config, 'store': not args.no_store}).encode() + b'\n')
+        f.flush()
+        for line in f:
+            message = json.loads(line)
+            if message['type'] == 'progress':
+                print(f'job {message["job"]}: {message["rounds_done"]} rounds, {message["chips"]} chips, '
+                      f'EV per hand {message["ev"] * 100:+.2f}%', flush=True)
+            elif message['type'] == 'result':
+                data = message['data']
+                print(f'job {message["job"]}: final chips {data["final_chips"]}, EV per hand {data["ev"] * 100:+.3f}% '
+                      f'± {data["half_width"] * 100:.3f}%' + (f', saved as run #{data["id"]}' if "id" in data else ''))
+                return
+            elif message['type'] in ('error', 'cancelled'):
+                raise Exception(message.get('message', f'Job {message["job"]} was cancelled'))
+
+
+def bank(args: argparse.Namespace) -> None:
+    """A bank parancs: előre megkevert cipőket generál egy fájlba."""
+    start = perf_counter()
+    create_bank(args.file, args.decks, args.shoes, args.seed)
+    print(f'{args.shoes} shoes of {args.decks} decks written to {args.file} in {perf_counter() - start:.2f} s')
+
+
+def learn(args: argparse.Namespace) -> None:
+    """A learn parancs: Monte Carlo kontrollal megtanulja a stratégia táblázatokat a megadott szabályokhoz, és a data mappába menti őket.
+    Egy létező stratégia fájlt (például a data/basic_strategy.json-t) csak --force esetén ír felül, ezt még a tanulás előtt ellenőrzi."""
+    if os.path.exists(f'data/{args.name}.json') and not args.force:
+        raise Exception('The strategy file already exists')
+    learner = Strategy_learner(load_rules(args.rules), args.seed, args.initial)
+
+    def report(batch: dict) -> None:
+        print(f'batch {batch["batch"] + 1}: {batch["episodes"]} episodes in {batch["seconds"]:.2f} s '
+              f'({batch["episodes_per_second"]:.0f}/s), {batch["changed"]} cells changed', flush=True)
+
+    reports = learner.train(args.batches, args.episodes, report, decay=args.decay)
+    learner.write(args.name, force=args.force)
+    episodes = sum(batch['episodes'] for batch in reports)
+    seconds = sum(batch['seconds'] for batch in reports)
+    print(f'{episodes} episodes in {seconds:.2f} s ({episodes / seconds:.0f}/s), strategy written to data/{args.name}.json')
+
+
+def runs(args: argparse.Namespace) -> None:
+    """A runs parancs: kilistázza az elmentett szimulációkat."""
+    store = Results_store(args.store)
+    try:
+        for run in store.list_runs()[:args.limit]:
+            print(f'#{run["id"]:<5} {run["created"]} decks={run["deck_count"]} rounds={run["rounds"]} rules={run["rules"]} '
+                  f'strategy={run["strategy"] or ("basic_strategy" if run["basic_strategy"] else "random")} system={run["bet_system"] or "off"} '
+                  f'final={run["final_chips"]} per_round={run["result_per_round"]:+.2f}')
+    finally:
+        store.close()
+
+
+def main(argv: list = None) -> None:
+    """A parancssori futtató belépési pontja.
+
+    Args:
+        argv (list): A parancssori argumentumok, ha nincs megadva, akkor a sys.argv.
+    """
+    parser = argparse.ArgumentParser(description='Epic blackjack simulator without GUI')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run one simulation')
+    _add_config_arguments(run_parser)
+    _add_store_arguments(run_parser)
+    run_parser.add_argument('--instrument', action='store_true', help='report per-phase timers and counters')
+    run_mode = run_parser.add_mutually_exclusive_group()
+    run_mode.add_argument('--profile', metavar='FILE', help='write cProfile statistics (pstats) to FILE')
+    run_mode.add_argument('--collapsed', metavar='FILE', help='write collapsed stacks for flame graphs to FILE')
+    run_mode.add_argument('--checkpoint', metavar='FILE', help='save the whole simulation state to FILE periodically')
+    run_parser.add_argument('--checkpoint-every', type=int, default=100000, metavar='ROUNDS')
+    run_parser.add_argument('--by-count', action='store_true', help='print the results by true count at bet time')
+    run_parser.set_defaults(handler=run)
+
+    resume_parser = commands.add_parser('resume', help='continue a checkpointed simulation')
+    resume_parser.add_argument('checkpoint', metavar='FILE')
+    resume_parser.add_argument('--checkpoint-every', type=int, default=100000, metavar='ROUNDS')
+    _add_store_arguments(resume_parser)
+    resume_parser.set_defaults(handler=resume)
+
+    sweep_parser = commands.add_parser('sweep', help='run every combination of the given parameters')
+    _add_config_arguments(sweep_parser, sweep=True)
+    _add_store_arguments(sweep_parser)
+    sweep_parser.set_defaults(handler=sweep)
+
+    coordinator_parser = commands.add_parser('coordinator', help='hand out a sweep to worker nodes over TCP')
+    _add_config_arguments(coordinator_parser, sweep=True)
+    coordinator_parser.add_argument('--unit-rounds', type=int, default=100000, help='rounds per work unit')
+    coordinator_parser.add_argument('--host', default='127.0.0.1', help='address to listen on, 0.0.0.0 = every interface')
+    coordinator_parser.add_argument('--port', type=int, default=5151)
+    coordinator_parser.add_argument('--timeout', type=float, help='seconds after which a silent worker is considered dead')
+    coordinator_parser.add_argument('--local-workers', type=int, default=0, help='worker processes to start on this machine')
+    coordinator_parser.set_defaults(handler=coordinate)
+
+    worker_parser = commands.add_parser('worker', help='play work units for a coordinator')
+    worker_parser.add_argument('--host', default='127.0.0.1')
+    worker_parser.add_argument('--port', type=int, default=5151)
+    worker_parser.add_argument('--connect-timeout', type=float, default=10, help='seconds to wait for the coordinator')
+    worker_parser.set_defaults(handler=work)
+
+    adaptive_parser = commands.add_parser('adaptive', help='run until the EV per hand reaches the given precision')
+    _add_config_arguments(adaptive_parser)
+    adaptive_parser.set_defaults(rounds=10 ** 7)
+    adaptive_parser.add_argument('--precision', type=float, default=0.001, help='half width of the confidence interval, 0.001 = ±0.1%%')
+    adaptive_parser.add_argument('--confidence', type=float, default=0.95)
+    adaptive_parser.add_argument('--batch-rounds', type=int, default=10000, help='rounds per worker between precision checks')
+    adaptive_parser.add_argument('--workers', type=int, default=1, help='number of worker processes, 0 = one per CPU')
+    adaptive_parser.set_defaults(handler=adaptive)
+
+    compare_parser = commands.add_parser('compare', help='compare players on the same shoes (common random numbers)')
+    compare_parser.add_argument('--player', action='append', required=True,
+                                help='STRATEGY[:SYSTEM[:BET_RAMP[:DEVIATIONS]]], STRATEGY is basic or random; repeat for each player')
+    compare_parser.add_argument('--shoes', type=int, default=1000)
+    compare_parser.add_argument('--decks', type=int, default=6)
+    compare_parser.add_argument('--min-bet', type=int, default=100)
+    compare_parser.add_argument('--max-bet', type=int, default=3000)
+    compare_parser.add_argument('--chips', type=int, default=5000)
+    compare_parser.add_argument('--rules', default='Default', help='rule set from data/rules.json')
+    compare_parser.add_argument('--seed', type=int)
+    compare_parser.add_argument('--deck-resolution', type=float, default=1)
+    compare_parser.add_argument('--table-engine', action='store_true', help='play with the table driven state machine engine')
+    compare_parser.set_defaults(handler=compare_players)
+
+    systems_parser = commands.add_parser('systems', help='evaluate every counting system on one stream of dealt cards')
+    _add_config_arguments(systems_parser)
+    systems_parser.add_argument('--only', nargs='+', metavar='SYSTEM', help='systems to evaluate, default: all')
+    systems_parser.set_defaults(handler=systems)
+
+    analyze_parser = commands.add_parser('analyze', help='evaluate the counting systems from their tags')
+    analyze_parser.add_argument('--decks', type=int, default=6)
+    analyze_parser.add_argument('--rules', default='Default', help='rule set from data/rules.json')
+    analyze_parser.add_argument('--deviations', default='Illustrious 18', help='decisions used for the playing efficiency')
+    analyze_parser.add_argument('--tags', action='append', metavar='NAME=T2,...,T9,T10,TA', help='custom system to rank, repeatable')
+    analyze_parser.set_defaults(handler=analyze)
+
+    serve_parser = commands.add_parser('serve', help='run the local job service for scripts and dashboards')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=5252)
+    serve_parser.add_argument('--workers', type=int, default=0, help='worker processes, 0 = one per CPU')
+    serve_parser.add_argument('--per-client', type=int, default=2, help='jobs of one client running at the same time')
+    serve_parser.add_argument('--chunk-rounds', type=int, default=10000, help='rounds between progress messages')
+    _add_store_arguments(serve_parser)
+    serve_parser.set_defaults(handler=serve)
+
+    submit_parser = commands.add_parser('submit', help='run a simulation on the job service')
+    _add_config_arguments(submit_parser)
+    submit_parser.add_argument('--host', default='127.0.0.1')
+    submit_parser.add_argument('--port', type=int, default=5252)
+    submit_parser.add_argument('--no-store', action='store_true', help='do not save the results')
+    submit_parser.set_defaults(handler=submit)
+
+    bank_parser = commands.add_parser('bank', help='pre-generate a file of shuffled shoes')
+    bank_parser.add_argument('file', metavar='FILE')
+    bank_parser.add_argument('--decks', type=int, default=6)
+    bank_parser.add_argument('--shoes', type=int, default=100000)
+    bank_parser.add_argument('--seed', type=int)
+    bank_parser.set_defaults(handler=bank)
+
+    learn_parser = commands.add_parser('learn', help='learn the strategy tables of a rule set by Monte Carlo control')
+    learn_parser.add_argument('name', help='file name in data/ without extension, load it with --strategy NAME')
+    learn_parser.add_argument('--rules', default='Default', help='rule set from data/rules.json')
+    learn_parser.add_argument('--batches', type=int, default=20)
+    learn_parser.add_argument('--episodes', type=int, default=1000, help='hands per cell and first move in a batch')
+    learn_parser.add_argument('--decay', type=float, default=0.5, help='weight of the earlier batches after each improvement, 0 = reset')
+    learn_parser.add_argument('--initial', help='strategy file in data/ or .json path to start from, default: stand everywhere')
+    learn_parser.add_argument('--seed', type=int)
+    learn_parser.add_argument('--force', action='store_true', help='overwrite an existing strategy file')
+    learn_parser.set_defaults(handler=learn)
+
+    runs_parser = commands.add_parser('runs', help='list the saved simulations')
+    runs_parser.add_argument('--store', default=STORE_FILE, metavar='FILE', help='results database')
+    runs_parser.add_argument('--limit', type=int, default=20)
+    runs_parser.set_defaults(handler=runs)
+
+    args = parser.parse_args(argv)
+    args.handler(args)
+
+
+if __name__ == '__main__':
+    main()
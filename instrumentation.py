@@ -0,0 +1,217 @@
+from blackjack_logic import Game
+from collections import defaultdict
+from time import perf_counter_ns
+import os
+import sys
+
+PHASES = ('_setup', 'move_and_check', '_dealer_move', '_check_player_after_dealer_move')
+
+
+class Instrumentation:
+    """A Game.round fázisainak az idejét és a kör közbeni eseményeket méri.
+    A mérés a megadott játék példány metódusainak a lecserélésével történik, így kikapcsolt állapotban a játék kódja semmit nem lassul.
+    >>> from simulation import create_simulation
+    >>> ai, g = create_simulation({"deck_count": 1, "min_bet": 100, "max_bet": 3000, "chips": 5000,
+    ...                            "basic_strategy": True, "bet_system": False, "seed": 3})
+    >>> i = Instrumentation(g)
+    >>> i.attach()
+    >>> for _ in range(500):
+    ...     g.round()
+    >>> report = i.report()
+    >>> report['counters']['rounds'], report['calls']['_setup']
+    (500, 500)
+    >>> report['counters']['cards_dealt'] >= 2000, report['counters']['reshuffles'] > 0
+    (True, True)
+    >>> sorted(report['times']) == sorted(PHASES)
+    True
+    >>> i.detach()
+    >>> '_setup' in vars(g), 'round' in vars(g)
+    (False, False)
+    """
+
+    def __init__(self, game: Game) -> None:
+        """
+        Args:
+            game (Game): A mérendő játék.
+        """
+        self._game = game
+        self._originals = {}
+        self.times = dict.fromkeys(PHASES, 0)
+        self.calls = dict.fromkeys(PHASES, 0)
+        self.counters = dict.fromkeys(
+            ('rounds', 'cards_dealt', 'reshuffles', 'decisions', 'splits', 'doubles', 'surrenders'), 0)
+
+    def _replace(self, owner, name: str, wrapper) -> None:
+        """Lecseréli a megadott objektum metódusát, és megjegyzi az eredetit.
+
+        Args:
+            owner: Az objektum, aminek a metódusát lecseréli.
+            name (str): A metódus neve.
+            wrapper (callable): Az új metódus, ami megkapja az eredetit.
+        """
+        original = getattr(owner, name)
+        self._originals[(owner, name)] = (original, name in vars(owner))
+        setattr(owner, name, wrapper(original))
+
+    def _timed(self, phase: str):
+        """Olyan csomagolót ad vissza, ami méri a fázis idejét és hívásainak a számát.
+
+        Args:
+            phase (str): A fázis neve.
+
+        Returns:
+            callable: A csomagoló.
+        """
+        times = self.times
+        calls = self.calls
+
+        def wrapper(original):
+            def timed(*args):
+                start = perf_counter_ns()
+                result = original(*args)
+                times[phase] += perf_counter_ns() - start
+                calls[phase] += 1
+                return result
+            return timed
+        return wrapper
+
+    def _counted(self, counter: str):
+        """Olyan csomagolót ad vissza, ami megszámolja a hívásokat.
+
+        Args:
+            counter (str): A számláló neve.
+
+        Returns:
+            callable: A csomagoló.
+        """
+        counters = self.counters
+
+        def wrapper(original):
+            def counted(*args):
+                counters[counter] += 1
+                return original(*args)
+            return counted
+        return wrapper
+
+    def _moves(self, original):
+        """A lépéseket számoló csomagoló: döntések, splitek, duplázások és feladások.
+
+        Args:
+            original (callable): Az eredeti Game._move metódus.
+
+        Returns:
+            callable: A csomagoló.
+        """
+        counters = self.counters
+        kinds = {'sp': 'splits', 'd': 'doubles', 'r': 'surrenders'}
+
+        def move(hand, move):
+            counters['decisions'] += 1
+            if move in kinds:
+                counters[kinds[move]] += 1
+            return original(hand, move)
+        return move
+
+    def attach(self) -> None:
+        """Bekapcsolja a mérést a játék metódusainak a lecserélésével."""
+        for phase in PHASES:
+            self._replace(self._game, phase, self._timed(phase))
+        self._replace(self._game, 'round', self._counted('rounds'))
+        self._replace(self._game, '_deal_card', self._counted('cards_dealt'))
+        self._replace(self._game, '_move', self._moves)
+        self._replace(self._game._deck, 'deck_init', self._counted('reshuffles'))
+
+    def detach(self) -> None:
+        """Kikapcsolja a mérést, visszaállítja az eredeti metódusokat."""
+        for (owner, name), (original, own) in self._originals.items():
+            if own:
+                setattr(owner, name, original)
+            else:
+                delattr(owner, name)
+        self._originals = {}
+
+    def report(self) -> dict:
+        """Összegzi a mérés eredményét.
+
+        Returns:
+            dict: A fázisok ideje másodpercben (times), a fázisok hívásainak a száma (calls) és az események száma (counters).
+        """
+        return {
+            'times': {phase: ns / 1e9 for phase, ns in self.times.items()},
+            'calls': dict(self.calls),
+            'counters': dict(self.counters),
+        }
+
+
+class Stack_profiler:
+    """Determinisztikus profilozó, ami minden hívási veremhez feljegyzi a benne töltött saját időt,
+    és flame graph eszközök által olvasható összesített verem (collapsed stack) formátumban írja ki.
+    >>> p = Stack_profiler()
+    >>> p.run(sorted, [3, 1, 2])
+    [1, 2, 3]
+    >>> any(stack[-1] == 'sorted' for stack in p.stacks)
+    True
+    """
+
+    def __init__(self) -> None:
+        self.stacks = defaultdict(int)
+        self._stack = []
+        self._last = 0
+
+    def _frame_name(self, frame) -> str:
+        """A verem egy elemének a neve: modul.függvény.
+
+        Args:
+            frame: A Python keret.
+
+        Returns:
+            str: A név.
+        """
+        code = frame.f_code
+        return f'{os.path.splitext(os.path.basename(code.co_filename))[0]}.{getattr(code, "co_qualname", code.co_name)}'
+
+    def _profile(self, frame, event: str, arg) -> None:
+        """A sys.setprofile által hívott függvény, ami az előző esemény óta eltelt időt a verem tetejéhez írja."""
+        now = perf_counter_ns()
+        if self._stack:
+            self.stacks[tuple(self._stack)] += now - self._last
+        if event == 'call':
+            self._stack.append(self._frame_name(frame))
+        elif event == 'c_call':
+            self._stack.append(getattr(arg, '__qualname__', getattr(arg, '__name__', 'builtin')))
+        elif self._stack:
+            self._stack.pop()
+        self._last = perf_counter_ns()
+
+    def run(self, function, *args):
+        """Lefuttatja a függvényt profilozás alatt.
+
+        Args:
+            function (callable): A futtatandó függvény.
+
+        Returns:
+            A függvény visszatérési értéke.
+        """
+        self._stack = []
+        self._last = perf_counter_ns()
+        sys.setprofile(self._profile)
+        try:
+            return function(*args)
+        finally:
+            sys.setprofile(None)
+
+    def write_collapsed(self, file_name: str) -> None:
+        """Kiírja a vermeket összesített verem formátumban, soronként a verem és a benne töltött idő mikroszekundumban.
+
+        Args:
+            file_name (str): A fájl neve.
+        """
+        with open(file_name, 'wt') as f:
+            for stack, ns in sorted(self.stacks.items()):
+                if ns >= 1000:
+                    f.write(f'{";".join(stack)} {ns // 1000}\n')
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,306 @@
+from checkpoint import start, advance
+from results_store import Results_store, STORE_FILE
+from blackjack_logic import load_data, load_rules
+from ai import Strategy
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import count
+import asyncio
+import json
+
+JOB_FIELDS = ('deck_count', 'rounds', 'min_bet', 'max_bet', 'chips', 'basic_strategy', 'bet_system', 'rules')
+OPTIONAL_JOB_FIELDS = ('seed', 'deviations', 'strategy', 'bet_ramp', 'deck_resolution', 'table_engine', 'shoe_bank', 'first_shoe', 'shoe_count')
+
+
+def _warm_up() -> None:
+    """A munkafolyamatok indulásakor betölti az adatfájlokat és lefordít egy stratégiát, így már az első feladat is a meleg gyorsítótárakat használja."""
+    for name in ('cards', 'rules', 'basic_strategy', 'deviations', 'counting_systems', 'bet_ramps'):
+        load_data(name)
+    for name in load_data('rules'):
+        load_rules(name)
+    Strategy()
+
+
+def _run_chunk(state: dict, config: dict, rounds: int) -> tuple:
+    """Egy feladat következő darabja a munkafolyamatban. A szimuláció teljes állapota darabonként utazik a folyamatok között,
+    így bármelyik munkafolyamat folytathatja, a körök utáni zseton mennyiségek viszont csak egyszer, az adott darabbal térnek vissza.
+
+    Args:
+        state (dict): A szimuláció állapota, ahogy a checkpoint.start visszaadja, az első darabnál None.
+        config (dict): A szimuláció beállításai.
+        rounds (int): A darabban lejátszandó körök száma.
+
+    Returns:
+        tuple: Az új állapot és a darab köreinek zseton mennyiségei.
+    """
+    if state is None:
+        state = start(config)
+    advance(state, rounds)
+    history = state["history"].tolist()
+    state["history"] = array('q')
+    return state, history
+
+
+def validate_job(config: dict) -> dict:
+    """Ellenőrzi és kiegészíti egy feladat beállításait. A mezők a mentett szimulációs adatok (_last_data) mezői.
+    >>> validate_job({"deck_count": 6, "rounds": 100, "min_bet": 100, "max_bet": 3000, "chips": 5000,
+    ...               "basic_strategy": True, "bet_system": "Hi-Lo"})["rules"]
+    'Default'
+    >>> validate_job({"deck_count": 6, "rounds": 100})
+    Traceback (most recent call last):
+    ...
+    Exception: Missing job fields: min_bet, max_bet, chips, basic_strategy, bet_system
+    >>> validate_job({"deck_count": 6, "rounds": 100, "min_bet": 100, "max_bet": 3000, "chips": 5000,
+    ...               "basic_strategy": True, "bet_system": False, "plot_img": "x.png"})
+    Traceback (most recent call last):
+    ...
+    Exception: Unknown job fields: plot_img
+
+    Args:
+        config (dict): A feladat beállításai.
+
+    Returns:
+        dict: A beállítások, a hiányzó szabályok helyett az alapértelmezettel.
+    """
+    config = dict({"rules": "Default"}, **config)
+    missing = [field for field in JOB_FIELDS if field not in config]
+    if missing:
+        raise Exception(f'Missing job fields: {", ".join(missing)}')
+    unknown = [field for field in config if field not in JOB_FIELDS + OPTIONAL_JOB_FIELDS]
+    if unknown:
+        raise Exception(f'Unknown job fields: {", ".join(unknown)}')
+    if config["rounds"] < 1:
+        raise Exception('Invalid rounds value')
+    return config
+
+
+class Job_service:
+    """Helyi asyncio szolgáltatás, ami a kliensektől JSON formában kapott szimulációs feladatokat egy folyamat készleten futtatja.
+    A protokoll soronként egy JSON üzenet. A kliens submit üzenettel küld feladatot (config, és opcionálisan store, ha el kell menteni
+    az eredmények adatbázisába), erre accepted választ kap a feladat azonosítójával, majd a feladat darabjai után progress üzeneteket
+    a lejátszott körökkel, a zsetonokkal és a körönkénti várható érték becslésével, a végén pedig egy result üzenetet.
+    A cancel üzenet leállítja a feladatot a következő darab előtt. Egy kliensnek egyszerre legfeljebb max_jobs_per_client feladata fut,
+    a többi sorban áll, így egy nagy sweep nem foglalja le az összes munkafolyamatot az interaktív futások elől.
+    A munkafolyamatok a szolgáltatás teljes élettartama alatt futnak, így az adatfájlok és a lefordított táblázatok gyorsítótárai melegek maradnak.
+    >>> config = {"deck_count": 6, "rounds": 3000, "min_bet": 100, "max_bet": 3000, "chips": 10 ** 6,
+    ...           "basic_strategy": True, "bet_system": "Hi-Lo", "seed": 2}
+    >>> async def client(address):
+    ...     reader, writer = await asyncio.open_connection(*address)
+    ...     async def send(message):
+    ...         writer.write(json.dumps(message).encode() + b'\\n')
+    ...         await writer.drain()
+    ...     await send({'type': 'submit', 'config': config})
+    ...     await send({'type': 'submit', 'config': dict(config, rounds=10 ** 7)})
+    ...     messages = []
+    ...     while not messages or messages[-1]['type'] != 'cancelled':
+    ...         messages.append(json.loads(await reader.readline()))
+    ...         if messages[-1]['type'] == 'result':
+    ...             await send({'type': 'cancel', 'job': 2})
+    ...     writer.close()
+    ...     return messages
+    >>> async def main():
+    ...     service = Job_service(workers=1, max_jobs_per_client=1, chunk_rounds=1000, store_file=None)
+    ...     address = await service.start()
+    ...     try:
+    ...         return await client(address)
+    ...     finally:
+    ...         await service.close()
+    >>> messages = asyncio.run(main())
+    >>> [(message['type'], message.get('rounds_done')) for message in messages if message['job'] == 1]
+    [('accepted', None), ('started', None), ('progress', 1000), ('progress', 2000), ('progress', 3000), ('result', None)]
+    >>> second = [message['type'] for message in messages if message['job'] == 2]
+    >>> second[0], second[-1], messages.index({'type': 'started', 'job': 2}) > [message['type'] for message in messages].index('result')
+    ('accepted', 'cancelled', True)
+    >>> from simulation import run_simulation
+    >>> result = next(message for message in messages if message['type'] == 'result')['data']
+    >>> result['final_chips'] == run_simulation(config)['history'][-1], result['count_histogram'] == run_simulation(config)['count_histogram']
+    (True, True)
+
+    Leállításkor a futó feladat még elküldi a cancelled üzenetet a kapcsolódó kliensnek:
+
+    >>> async def shutdown():
+    ...     service = Job_service(workers=1, chunk_rounds=1000, store_file=None)
+    ...     reader, writer = await asyncio.open_connection(*await service.start())
+    ...     writer.write(json.dumps({'type': 'submit', 'config': dict(config, rounds=10 ** 7)}).encode() + b'\\n')
+    ...     types = [json.loads(await reader.readline())['type'] for _ in range(3)]
+    ...     await service.close()
+    ...     types.extend(json.loads(line)['type'] for line in (await reader.read()).splitlines())
+    ...     writer.close()
+    ...     return types
+    >>> asyncio.run(shutdown())[-1]
+    'cancelled'
+    """
+
+    def __init__(self, workers: int = None, max_jobs_per_client: int = 2, chunk_rounds: int = 10000,
+                 host: str = '127.0.0.1', port: int = 0, store_file: str = STORE_FILE) -> None:
+        """
+        Args:
+            workers (int): A munkafolyamatok száma, ha nincs megadva, akkor a processzorok száma.
+            max_jobs_per_client (int): Egy kliensnek egyszerre legfeljebb ennyi feladata futhat.
+            chunk_rounds (int): Ennyi körönként küld állapotot, és ennyi körönként lehet leállítani egy feladatot.
+            host (str): A cím, ahol a klienseket várja.
+            port (int): A port, 0 esetén az operációs rendszer választ egyet.
+            store_file (str): Az eredmények adatbázisa, ha None, akkor nem lehet menteni.
+        """
+        self._workers = workers
+        self._max_jobs_per_client = max_jobs_per_client
+        self._chunk_rounds = chunk_rounds
+        self._host = host
+        self._port = port
+        self._store_file = store_file
+        self._store = None
+        self._job_ids = count(1)
+        self._tasks = set()
+        self._connections = set()
+
+    async def start(self) -> tuple:
+        """Elindítja a folyamat készletet és a szervert.
+
+        Returns:
+            tuple: A szerver címe és portja.
+        """
+        self._pool = ProcessPoolExecutor(self._workers, initializer=_warm_up)
+        self._server = await asyncio.start_server(self._serve_client, self._host, self._port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self) -> None:
+        """Leállítja a szervert, a futó feladatokat és a folyamat készletet. Előbb a feladatok állnak le, így még elküldhetik
+        a cancelled üzenetüket, utána a kliensek kapcsolatai, és csak ezek befejeződése után áll le a folyamat készlet."""
+        self._server.close()
+        for tasks in (self._tasks, self._connections):
+            tasks = list(tasks)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        await self._server.wait_closed()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+        if self._store is not None:
+            self._store.close()
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Egy kliens kiszolgálása. Ha a kliens kapcsolata megszakad, akkor a feladatai leállnak.
+        A kiszolgálást csak a close állítja le, ilyenkor rendben fejeződik be, mert az asyncio a megszakított kiszolgáló korutint hibaként naplózná.
+
+        Args:
+            reader (asyncio.StreamReader): A kapcsolat olvasható oldala.
+            writer (asyncio.StreamWriter): A kapcsolat írható oldala.
+        """
+        semaphore = asyncio.Semaphore(self._max_jobs_per_client)
+        tasks = {}
+        connection = asyncio.current_task()
+        self._connections.add(connection)
+
+        async def send(message: dict) -> None:
+            writer.write(json.dumps(message).encode() + b'\n')
+            await writer.drain()
+
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                    if message['type'] == 'submit':
+                        config = validate_job(message['config'])
+                        job_id = next(self._job_ids)
+                        await send({'type': 'accepted', 'job': job_id})
+                        task = asyncio.create_task(self._run_job(job_id, config, message.get('store', False), semaphore, send))
+                        tasks[job_id] = task
+                        self._tasks.add(task)
+                        task.add_done_callback(lambda task, job_id=job_id: (tasks.pop(job_id, None), self._tasks.discard(task)))
+                    elif message['type'] == 'cancel':
+                        task = tasks.get(message['job'])
+                        if task is None:
+                            raise Exception(f'Unknown job: {message["job"]}')
+                        task.cancel()
+                    else:
+                        raise Exception(f'Unknown message type: {message["type"]}')
+                except Exception as e:
+                    await send({'type': 'error', 'job': None, 'message': str(e)})
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            for task in list(tasks.values()):
+                task.cancel()
+            writer.close()
+            self._connections.discard(connection)
+
+    async def _run_job(self, job_id: int, config: dict, store: bool, semaphore: asyncio.Semaphore, send) -> None:
+        """Lefuttat egy feladatot darabonként a folyamat készleten, és minden darab után elküldi az állapotát.
+
+        Args:
+            job_id (int): A feladat azonosítója.
+            config (dict): A szimuláció beállításai.
+            store (bool): Elmentse-e az eredményt az adatbázisba.
+            semaphore (asyncio.Semaphore): A kliens feladatainak a korlátja.
+            send (callable): Az üzenetküldő korutin.
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            async with semaphore:
+                await send({'type': 'started', 'job': job_id})
+                state = None
+                history = array('q')
+                while len(history) < config["rounds"]:
+                    rounds = min(self._chunk_rounds, config["rounds"] - len(history))
+                    state, chunk = await loop.run_in_executor(self._pool, _run_chunk, state, config, rounds)
+                    history.extend(chunk)
+                    stats = state["stats"]
+                    await send({'type': 'progress', 'job': job_id, 'rounds_done': len(history), 'chips': history[-1],
+                                'ev': stats.mean, 'half_width': stats.half_width() if stats.count > 1 else None})
+                data = dict(config, final_chips=history[-1], min_chips=min(history), max_chips=max(history),
+                            ev=state["stats"].mean, half_width=state["stats"].half_width())
+                if state["histogram"] is not None:
+                    data["count_histogram"] = state["histogram"].as_dict()
+                if store:
+                    data["id"] = self._save(dict(config, history=history.tolist(), count_histogram=data.get("count_histogram")))
+                await send({'type': 'result', 'job': job_id, 'data': data})
+        except asyncio.CancelledError:
+            try:
+                await send({'type': 'cancelled', 'job': job_id})
+            except ConnectionError:
+                pass
+            raise
+        except ConnectionError:
+            pass
+        except Exception as e:
+            await send({'type': 'error', 'job': job_id, 'message': str(e)})
+
+    def _save(self, data: dict) -> int:
+        """Elmenti a szimulációt. Az adatbázis kapcsolat az eseményhurok szálában jön létre és csak ott használható.
+
+        Args:
+            data (dict): A szimuláció adatai.
+
+        Returns:
+            int: Az elmentett szimuláció azonosítója.
+        """
+        if self._store_file is None:
+            raise Exception('The service has no results database')
+        if self._store is None:
+            self._store = Results_store(self._store_file)
+        return self._store.save_run(data)
+
+
+async def serve(workers: int = None, max_jobs_per_client: int = 2, chunk_rounds: int = 10000, host: str = '127.0.0.1', port: int = 5252,
+                store_file: str = STORE_FILE) -> None:
+    """Elindítja a szolgáltatást, és addig fut, amíg le nem állítják.
+
+    Args:
+        workers (int): A munkafolyamatok száma.
+        max_jobs_per_client (int): Egy kliensnek egyszerre legfeljebb ennyi feladata futhat.
+        chunk_rounds (int): Ennyi körönként küld állapotot.
+        host (str): A cím.
+        port (int): A port.
+        store_file (str): Az eredmények adatbázisa.
+    """
+    service = Job_service(workers, max_jobs_per_client, chunk_rounds, host, port, store_file)
+    address = await service.start()
+    print(f'Job service listening on {address[0]}:{address[1]}', flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.close()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,103 @@
+from adaptive import Running_stats, play_batch, is_precise, summarize
+from simulation import create_simulation
+from shoe_bank import shard_configs
+from betting import Count_histogram
+from multiprocessing import Process, Queue
+from random import Random
+import os
+
+
+def _worker(config: dict, tasks: Queue, results: Queue) -> None:
+    """Egy munkafolyamat: létrehozza a saját szimulációját, majd a kapott adagokat játssza le, amíg None-t nem kap.
+
+    Args:
+        config (dict): A szimuláció beállításai a munkafolyamat saját seed értékével.
+        tasks (Queue): Innen kapja a lejátszandó körök számát.
+        results (Queue): Ide küldi vissza az adagok statisztikáját, lapszámolás esetén a valódi érték szerinti hisztogrammal együtt.
+    """
+    ai, g = create_simulation(config)
+    counting = bool(config["bet_system"])
+    for rounds in iter(tasks.get, None):
+        histogram = Count_histogram() if counting else None
+        results.put((play_batch(ai, g, rounds, counting, histogram=histogram), histogram))
+
+
+def worker_seeds(seed: int, workers: int) -> list:
+    """A munkafolyamatok seed értékei. Azonos seed és munkafolyamat szám esetén ugyanazok.
+
+    Args:
+        seed (int): A kezdőérték, ha None, akkor véletlenszerű.
+        workers (int): A munkafolyamatok száma.
+
+    Returns:
+        list: A seed értékek.
+    """
+    seeds = Random(seed)
+    return [seeds.getrandbits(64) for _ in range(workers)]
+
+
+def run_parallel_adaptive(config: dict, precision: float = 0.001, confidence: float = 0.95, batch_rounds: int = 10000,
+                          max_rounds: int = 10 ** 7, workers: int = None) -> dict:
+    """Több munkafolyamattal játszik adagokban, amíg az összevont körönkénti várható érték el nem éri a kívánt pontosságot,
+    vagy el nem fogy a körök kerete. Minden munkafolyamat egy adagot játszik, majd az összevont eredmény alapján
+    vagy mindegyik újabb adagot kap, vagy mindegyik egyszerre áll le. Cipő bank esetén a munkafolyamatok a bank
+    egymást nem átfedő szakaszaiból osztanak, különben ugyanazokat a cipőket játszanák.
+    >>> config = {"deck_count": 6, "min_bet": 100, "max_bet": 100, "chips": 10 ** 6, "basic_strategy": True,
+    ...           "bet_system": False, "rules": "Default", "seed": 1}
+    >>> result = run_parallel_adaptive(config, precision=0.05, batch_rounds=250, workers=2)
+    >>> result['converged'], result['rounds'] % 500, result['workers']
+    (True, 0, 2)
+    >>> run_parallel_adaptive(config, precision=0.05, batch_rounds=250, workers=2) == result
+    True
+    >>> counted = run_parallel_adaptive(dict(config, bet_system='Hi-Lo'), precision=0.05, batch_rounds=250, workers=2)
+    >>> sum(Count_histogram.from_dict(counted['count_histogram']).hands) == counted['rounds']
+    True
+
+    Args:
+        config (dict): A szimuláció beállításai.
+        precision (float): A konfidencia intervallum kívánt félszélessége a kezdő tét arányában.
+        confidence (float): A megbízhatósági szint.
+        batch_rounds (int): Egy munkafolyamat ennyi kört játszik az ellenőrzések között.
+        max_rounds (int): Összesen legfeljebb ennyi kört játszanak.
+        workers (int): A munkafolyamatok száma, ha nincs megadva, akkor a processzorok száma.
+
+    Returns:
+        dict: Az eredmény, ahogy a summarize visszaadja, kiegészítve a munkafolyamatok számával (workers),
+            lapszámolás esetén a részek összevont valódi érték szerinti hisztogramjával is (count_histogram).
+    """
+    workers = workers or os.cpu_count() or 1
+    results = Queue()
+    processes = []
+    for seed, shard in zip(worker_seeds(config.get("seed"), workers), shard_configs(config, workers)):
+        tasks = Queue()
+        process = Process(target=_worker, args=(dict(shard, seed=seed), tasks, results), daemon=True)
+        process.start()
+        processes.append((process, tasks))
+    stats = Running_stats()
+    histogram = Count_histogram()
+    try:
+        while stats.count < max_rounds and not is_precise(stats, precision, confidence):
+            remaining = max_rounds - stats.count
+            batches = [min(batch_rounds, remaining // workers + (index < remaining % workers)) for index in range(workers)]
+            for (_, tasks), rounds in zip(processes, batches):
+                tasks.put(rounds)
+            batch_stats = [results.get() for _ in range(workers)]
+            batch_stats.sort(key=lambda batch: (batch[0].count, batch[0].mean))
+            for batch, batch_histogram in batch_stats:
+                stats.merge(batch)
+                if batch_histogram is not None:
+                    histogram.merge(batch_histogram)
+    finally:
+        for process, tasks in processes:
+            tasks.put(None)
+        for process, _ in processes:
+            process.join()
+    result = dict(summarize(stats, precision, confidence), workers=workers)
+    if config["bet_system"]:
+        result["count_histogram"] = histogram.as_dict()
+    return result
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
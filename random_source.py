@@ -0,0 +1,147 @@
+from array import array
+from itertools import islice
+from random import Random
+
+
+class Random_source:
+    """Pufferelt véletlenszám forrás. Egyetlen hívással nagy blokknyi 32 bites véletlen számot generál,
+    majd ezekből szolgálja ki a választásokat, a téteket és a keveréseket. Azonos seed mellett ugyanazt a sorozatot adja.
+    >>> r = Random_source(7)
+    >>> values = [r.randint(100, 3000) for _ in range(1000)]
+    >>> min(values) >= 100 and max(values) <= 3000
+    True
+    >>> r2 = Random_source(7)
+    >>> [r2.randint(100, 3000) for _ in range(1000)] == values
+    True
+    >>> r.choice(['s', 'h']) in ['s', 'h']
+    True
+    >>> cards = list(range(52))
+    >>> r.shuffle(cards)
+    >>> sorted(cards) == list(range(52))
+    True
+    >>> a, b = Random_source(3), Random_source(3)
+    >>> c, d = list(range(312)), list(range(312))
+    >>> a.shuffle(c)
+    >>> b.shuffle(d)
+    >>> c == d
+    True
+    >>> a.choices('abc', 5) == b.choices('abc', 5)
+    True
+    >>> 0 <= a.random() < 1
+    True
+    """
+
+    def __init__(self, seed: int = None, block_size: int = 8192) -> None:
+        """
+        Args:
+            seed (int): A véletlenszám generátor kezdőértéke, ha nincs megadva, akkor az operációs rendszertől kap egyet.
+            block_size (int): Egyszerre ennyi véletlen számot generál.
+        """
+        self._random = Random(seed)
+        self._block_size = block_size
+        self._values = iter(())
+
+    def _fill_block(self, size: int) -> None:
+        """Egyetlen getrandbits hívással legenerál egy blokknyi 32 bites véletlen számot.
+
+        Args:
+            size (int): A blokk mérete.
+        """
+        self._values = iter(array('I', self._random.getrandbits(32 * size).to_bytes(4 * size, 'little')))
+
+    def _take(self, count: int) -> list:
+        """Kivesz a blokkból a megadott számú véletlen számot, ha a blokk közben elfogy, akkor a következőből folytatja.
+
+        Args:
+            count (int): A véletlen számok száma.
+
+        Returns:
+            list: A 32 bites véletlen számok.
+        """
+        values = list(islice(self._values, count))
+        if len(values) < count:
+            self._fill_block(max(self._block_size, count - len(values)))
+            values.extend(islice(self._values, count - len(values)))
+        return values
+
+    def _next(self) -> int:
+        """Kivesz egy 32 bites véletlen számot a blokkból.
+
+        Returns:
+            int: A véletlen szám.
+        """
+        try:
+            return next(self._values)
+        except StopIteration:
+            self._fill_block(self._block_size)
+            return next(self._values)
+
+    def random(self) -> float:
+        """Egy véletlen szám a [0, 1) intervallumból.
+
+        Returns:
+            float: A véletlen szám.
+        """
+        return self._next() / 4294967296
+
+    def randint(self, a: int, b: int) -> int:
+        """Egy véletlen egész szám az [a, b] intervallumból.
+
+        Args:
+            a (int): Az intervallum alsó határa.
+            b (int): Az intervallum felső határa.
+
+        Returns:
+            int: A véletlen szám.
+        """
+        try:
+            value = next(self._values)
+        except StopIteration:
+            value = self._next()
+        return a + ((value * (b - a + 1)) >> 32)
+
+    def choice(self, seq):
+        """Véletlenszerűen kiválaszt egy elemet a megadott sorozatból.
+
+        Args:
+            seq (list): A sorozat.
+
+        Returns:
+            A kiválasztott elem.
+        """
+        try:
+            value = next(self._values)
+        except StopIteration:
+            value = self._next()
+        return seq[(value * len(seq)) >> 32]
+
+    def choices(self, population, k: int) -> list:
+        """Visszatevéssel kiválaszt k elemet a megadott sorozatból.
+
+        Args:
+            population (list): A sorozat.
+            k (int): A kiválasztott elemek száma.
+
+        Returns:
+            list: A kiválasztott elemek listája.
+        """
+        n = len(population)
+        return [population[(value * n) >> 32] for value in self._take(k)]
+
+    def shuffle(self, x: list) -> None:
+        """Helyben megkeveri a listát (Fisher–Yates keverés), a szükséges véletlen számokat egyszerre veszi ki a blokkból.
+
+        Args:
+            x (list): A megkeverendő lista.
+        """
+        if len(x) < 2:
+            return
+        values = self._take(len(x) - 1)
+        for i, value in zip(range(len(x) - 1, 0, -1), values):
+            j = (value * (i + 1)) >> 32
+            x[i], x[j] = x[j], x[i]
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
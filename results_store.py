@@ -0,0 +1,318 @@
+from betting import Count_histogram, MIN_TRUE_COUNT
+from array import array
+from datetime import datetime
+import json
+import sqlite3
+
+STORE_FILE = 'save/results.sqlite3'
+CONFIG_COLUMNS = ('deck_count', 'rounds', 'min_bet', 'max_bet', 'chips', 'basic_strategy', 'bet_system', 'rules',
+                  'seed', 'deviations', 'bet_ramp', 'deck_resolution', 'strategy', 'table_engine', 'shoe_bank', 'first_shoe',
+                  'deck_seed')
+SUMMARY_COLUMNS = ('final_chips', 'min_chips', 'max_chips', 'result_per_round')
+ADDED_COLUMNS = (('strategy', 'TEXT'), ('table_engine', 'INTEGER'), ('shoe_bank', 'TEXT'), ('first_shoe', 'INTEGER'),
+                 ('deck_seed', 'INTEGER'))
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created TEXT NOT NULL,
+    deck_count INTEGER NOT NULL,
+    rounds INTEGER NOT NULL,
+    min_bet INTEGER NOT NULL,
+    max_bet INTEGER NOT NULL,
+    chips INTEGER NOT NULL,
+    basic_strategy INTEGER NOT NULL,
+    bet_system TEXT,
+    rules TEXT NOT NULL,
+    seed INTEGER,
+    deviations TEXT,
+    bet_ramp TEXT,
+    deck_resolution REAL,
+    strategy TEXT,
+    table_engine INTEGER,
+    shoe_bank TEXT,
+    first_shoe INTEGER,
+    deck_seed INTEGER,
+    final_chips INTEGER NOT NULL,
+    min_chips INTEGER NOT NULL,
+    max_chips INTEGER NOT NULL,
+    result_per_round REAL NOT NULL,
+    plot_img TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_parameters ON runs (deck_count, rules, basic_strategy, bet_system, min_bet, max_bet);
+CREATE TABLE IF NOT EXISTS history_chunks (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    chunk INTEGER NOT NULL,
+    data BLOB NOT NULL,
+    PRIMARY KEY (run_id, chunk)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS count_buckets (
+    run_id INTEGER NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    true_count INTEGER NOT NULL,
+    hands INTEGER NOT NULL,
+    units REAL NOT NULL,
+    squares REAL NOT NULL,
+    bets INTEGER NOT NULL,
+    PRIMARY KEY (run_id, true_count)
+) WITHOUT ROWID;
+"""
+
+
+class Results_store:
+    """A szimulációk eredményeit tároló SQLite adatbázis. A runs tábla a beállításokat és az összesített eredményeket tartalmazza,
+    a paraméterek szerint indexelve, a körök utáni zseton mennyiségek pedig bináris darabokban kerülnek a history_chunks táblába.
+    A lapszámolós szimulációk valódi érték szerinti hisztogramjának nem üres rekeszei a count_buckets táblába kerülnek.
+    >>> store = Results_store(':memory:', chunk_size=3)
+    >>> data = {"deck_count": 6, "rounds": 5, "min_bet": 100, "max_bet": 3000, "chips": 5000, "basic_strategy": True,
+    ...         "bet_system": False, "rules": "Default", "history": [4900, 5100, 4800, 4700, 5300], "plot_img": None}
+    >>> run_id = store.save_run(data)
+    >>> store.save_run(dict(data, deck_count=1, bet_system='Hi-Lo', seed=3, history=[5000, 5200])) > run_id
+    True
+    >>> [run['deck_count'] for run in store.list_runs()]
+    [1, 6]
+    >>> [run['final_chips'] for run in store.list_runs(bet_system=False)]
+    [5300]
+    >>> run = store.load_run(run_id)
+    >>> run['history'], run['basic_strategy'], run['bet_system']
+    ([4900, 5100, 4800, 4700, 5300], True, False)
+    >>> run['min_chips'], run['max_chips'], run['result_per_round']
+    (4700, 5300, 60.0)
+    >>> store.latest_run_id() == run_id + 1
+    True
+    >>> "count_histogram" in run
+    False
+    >>> learned_id = store.save_run(dict(data, strategy='learned'))
+    >>> run['strategy'], store.list_runs(strategy='learned')[0]['id'] == learned_id
+    ('basic_strategy', True)
+    >>> store.delete_run(learned_id)
+    >>> banked_id = store.save_run(dict(data, table_engine=True, shoe_bank='bank.shoes', first_shoe=4, deck_seed=7))
+    >>> [(run['table_engine'], run['shoe_bank'], run['first_shoe'], run['deck_seed']) for run in store.list_runs()[:2]]
+    [(True, 'bank.shoes', 4, 7), (False, None, None, None)]
+    >>> store.list_runs(table_engine=True)[0]['id'] == banked_id
+    True
+    >>> store.delete_run(banked_id)
+    >>> store.save_run(dict(data, history=[]))
+    Traceback (most recent call last):
+    ...
+    Exception: Empty history
+    >>> histogram = Count_histogram()
+    >>> histogram.add(2.5, 200, 300)
+    >>> counted_id = store.save_run(dict(data, bet_system='Hi-Lo', count_histogram=histogram.as_dict()))
+    >>> Count_histogram.from_dict(store.load_run(counted_id)['count_histogram']).rows() == histogram.rows()
+    True
+    >>> store.delete_run(counted_id)
+    >>> store.delete_run(run_id)
+    >>> len(store.list_runs())
+    1
+    """
+
+    def __init__(self, file_name: str = STORE_FILE, chunk_size: int = 8192) -> None:
+        """Megnyitja, és ha még nem létezik, akkor létrehozza az adatbázist.
+
+        Args:
+            file_name (str): Az adatbázis fájl neve.
+            chunk_size (int): Egy bináris darabban tárolt körök száma.
+        """
+        self._chunk_size = chunk_size
+        self._connection = sqlite3.connect(file_name)
+        self._connection.row_factory = sqlite3.Row
+        self._connection.execute('PRAGMA foreign_keys = ON')
+        self._connection.executescript(_SCHEMA)
+        self._add_columns()
+
+    def _add_columns(self) -> None:
+        """A régebbi adatbázisok runs táblájához hozzáadja a később bevezetett oszlopokat, a régi szimulációknál ezek NULL értékűek."""
+        existing = {row['name'] for row in self._connection.execute('PRAGMA table_info(runs)')}
+        with self._connection:
+            for column, column_type in ADDED_COLUMNS:
+                if column not in existing:
+                    self._connection.execute(f'ALTER TABLE runs ADD COLUMN {column} {column_type}')
+
+    def close(self) -> None:
+        """Lezárja az adatbázis kapcsolatot."""
+        self._connection.close()
+
+    def _chunks(self, run_id: int, history: list):
+        """Feldarabolja a körök utáni zseton mennyiségeket bináris darabokra.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+            history (list): A zseton mennyiségek.
+
+        Returns:
+            generator: A (run_id, darab sorszáma, bináris adat) hármasok.
+        """
+        for chunk, start in enumerate(range(0, len(history), self._chunk_size)):
+            yield run_id, chunk, array('q', history[start:start + self._chunk_size]).tobytes()
+
+    def save_run(self, data: dict) -> int:
+        """Elment egy szimulációt egyetlen tranzakcióban, a zseton mennyiségeket egy executemany hívással.
+
+        Args:
+            data (dict): A szimuláció adatai, ahogy a run_simulation visszaadja, opcionálisan plot_img mezővel.
+
+        Returns:
+            int: Az elmentett szimuláció azonosítója.
+        """
+        history = data["history"]
+        if not history:
+            raise Exception('Empty history')
+        values = [data.get(column) for column in CONFIG_COLUMNS]
+        values[CONFIG_COLUMNS.index('bet_system')] = data["bet_system"] or None
+        values[CONFIG_COLUMNS.index('rules')] = data.get("rules", "Default")
+        values[CONFIG_COLUMNS.index('strategy')] = data.get("strategy") or "basic_strategy" if data["basic_strategy"] else None
+        values[CONFIG_COLUMNS.index('table_engine')] = bool(data.get("table_engine"))
+        if data.get("shoe_bank"):
+            values[CONFIG_COLUMNS.index('first_shoe')] = data.get("first_shoe") or 0
+        else:
+            values[CONFIG_COLUMNS.index('shoe_bank')] = values[CONFIG_COLUMNS.index('first_shoe')] = None
+        summary = [history[-1], min(history), max(history), (history[-1] - data["chips"]) / len(history)]
+        columns = ('created', *CONFIG_COLUMNS, *SUMMARY_COLUMNS, 'plot_img')
+        with self._connection:
+            run_id = self._connection.execute(
+                f'INSERT INTO runs ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})',
+                (datetime.now().isoformat(timespec='seconds'), *values, *summary, data.get("plot_img"))).lastrowid
+            self._connection.executemany('INSERT INTO history_chunks VALUES (?, ?, ?)', self._chunks(run_id, history))
+            if data.get("count_histogram"):
+                self._connection.executemany('INSERT INTO count_buckets VALUES (?, ?, ?, ?, ?, ?)',
+                                             self._buckets(run_id, data["count_histogram"]))
+        return run_id
+
+    def _buckets(self, run_id: int, histogram: dict):
+        """A valódi érték szerinti hisztogram nem üres rekeszei.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+            histogram (dict): A hisztogram a Count_histogram.as_dict formájában.
+
+        Returns:
+            generator: A (run_id, valódi érték, körök, egységek, négyzetösszeg, tétek) sorok.
+        """
+        for index, hands in enumerate(histogram['hands']):
+            if hands:
+                yield (run_id, index + MIN_TRUE_COUNT, hands, histogram['units'][index], histogram['squares'][index],
+                       histogram['bets'][index])
+
+    def load_count_histogram(self, run_id: int) -> dict:
+        """Betölti a szimuláció valódi érték szerinti hisztogramját.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+
+        Returns:
+            dict: A hisztogram a Count_histogram.as_dict formájában, vagy None, ha a szimulációhoz nem tartozik hisztogram.
+        """
+        rows = self._connection.execute('SELECT true_count, hands, units, squares, bets FROM count_buckets WHERE run_id = ?',
+                                        (run_id,)).fetchall()
+        if not rows:
+            return None
+        histogram = Count_histogram()
+        for true_count, hands, units, squares, bets in rows:
+            index = true_count - MIN_TRUE_COUNT
+            histogram.hands[index], histogram.units[index], histogram.squares[index], histogram.bets[index] = hands, units, squares, bets
+        return histogram.as_dict()
+
+    def _run_from_row(self, row: sqlite3.Row) -> dict:
+        """Az adatbázis egy sorát a szimulációs adatok formátumára alakítja.
+
+        Args:
+            row (sqlite3.Row): A runs tábla egy sora.
+
+        Returns:
+            dict: A szimuláció beállításai és összesített eredményei.
+        """
+        run = dict(row)
+        run["basic_strategy"] = bool(run["basic_strategy"])
+        run["bet_system"] = run["bet_system"] or False
+        run["table_engine"] = bool(run["table_engine"])
+        return run
+
+    def list_runs(self, **parameters) -> list:
+        """Kilistázza az elmentett szimulációkat a körök utáni zseton mennyiségek nélkül, a legújabbal kezdve.
+
+        Args:
+            **parameters: Szűrés a beállításokra, például deck_count=6 vagy bet_system='Hi-Lo'.
+
+        Returns:
+            list: A szimulációk beállításai és összesített eredményei.
+        """
+        conditions = []
+        values = []
+        for column, value in parameters.items():
+            if column not in CONFIG_COLUMNS:
+                raise Exception(f'Unknown parameter: {column}')
+            if column == 'bet_system' and not value:
+                conditions.append('bet_system IS NULL')
+            else:
+                conditions.append(f'{column} = ?')
+                values.append(value)
+        where = f' WHERE {" AND ".join(conditions)}' if conditions else ''
+        rows = self._connection.execute(f'SELECT * FROM runs{where} ORDER BY id DESC', values)
+        return [self._run_from_row(row) for row in rows]
+
+    def latest_run_id(self) -> int:
+        """Visszaadja a legutóbb elmentett szimuláció azonosítóját.
+
+        Returns:
+            int: Az azonosító, ha még nincs elmentett szimuláció, akkor None.
+        """
+        return self._connection.execute('SELECT MAX(id) FROM runs').fetchone()[0]
+
+    def load_history(self, run_id: int) -> list:
+        """Betölti a szimuláció körök utáni zseton mennyiségeit.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+
+        Returns:
+            list: A zseton mennyiségek.
+        """
+        history = array('q')
+        for (data,) in self._connection.execute('SELECT data FROM history_chunks WHERE run_id = ? ORDER BY chunk', (run_id,)):
+            history.frombytes(data)
+        return history.tolist()
+
+    def load_run(self, run_id: int) -> dict:
+        """Betölti a szimulációt a körök utáni zseton mennyiségekkel együtt.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+
+        Returns:
+            dict: A szimuláció adatai, ugyanabban a formátumban, ahogy a régi last_statistics.json tárolta,
+                és ha van, akkor a valódi érték szerinti hisztogrammal (count_histogram).
+        """
+        row = self._connection.execute('SELECT * FROM runs WHERE id = ?', (run_id,)).fetchone()
+        if row is None:
+            raise Exception(f'Unknown run: {run_id}')
+        run = dict(self._run_from_row(row), history=self.load_history(run_id))
+        histogram = self.load_count_histogram(run_id)
+        if histogram is not None:
+            run["count_histogram"] = histogram
+        return run
+
+    def delete_run(self, run_id: int) -> None:
+        """Törli a szimulációt.
+
+        Args:
+            run_id (int): A szimuláció azonosítója.
+        """
+        with self._connection:
+            self._connection.execute('DELETE FROM runs WHERE id = ?', (run_id,))
+
+    def import_json(self, file_name: str) -> int:
+        """Beimportálja a régi formátumú, egyetlen szimulációt tartalmazó JSON fájlt (save/last_statistics.json).
+
+        Args:
+            file_name (str): A fájl neve.
+
+        Returns:
+            int: Az elmentett szimuláció azonosítója.
+        """
+        with open(file_name) as f:
+            return self.save_run(json.load(f))
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
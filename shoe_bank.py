@@ -0,0 +1,197 @@
+from blackjack_logic import Deck
+from random_source import Random_source
+import mmap
+import os
+import struct
+
+BANK_MAGIC = b'BJSHOES1'
+BANK_HEADER = struct.Struct('<8sBBHI')
+
+
+def create_bank(file_name: str, deck_count: int, shoes: int, seed: int = None) -> None:
+    """Előre megkevert cipőket generál egy fájlba. A fájl egy 16 bájtos fejléc (azonosító, verzió, paklik száma, cipők száma),
+    utána cipőnként deck_count * 52 bájt, minden bájt egy lap kódja: az indexe a Deck._make_a_deck által összeállított 52 lapban.
+    Először egy ideiglenes fájlba ír, majd azzal cseréli le a régit.
+
+    Args:
+        file_name (str): A fájl neve.
+        deck_count (int): A paklik száma egy cipőben.
+        shoes (int): A cipők száma.
+        seed (int): A keverések kezdőértéke, ha nincs megadva, akkor véletlenszerű.
+    """
+    if deck_count < 1 or deck_count > 8:
+        raise Exception('Invalid decks value')
+    rng = Random_source(seed)
+    temporary = f'{file_name}.tmp'
+    with open(temporary, 'wb') as f:
+        f.write(BANK_HEADER.pack(BANK_MAGIC, 1, deck_count, 0, shoes))
+        for _ in range(shoes):
+            codes = list(range(52)) * deck_count
+            rng.shuffle(codes)
+            f.write(bytes(codes))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, file_name)
+
+
+def read_bank_header(file_name: str) -> tuple:
+    """Beolvassa egy cipő bank fejlécét.
+
+    Args:
+        file_name (str): A create_bank által készített fájl neve.
+
+    Returns:
+        tuple: A paklik száma egy cipőben és a cipők száma.
+    """
+    with open(file_name, 'rb') as f:
+        magic, _, deck_count, _, shoes = BANK_HEADER.unpack(f.read(BANK_HEADER.size))
+    if magic != BANK_MAGIC:
+        raise Exception('Not a shoe bank file')
+    return deck_count, shoes
+
+
+def shard_configs(config: dict, shards: int) -> list:
+    """Egy szimuláció beállításait a megadott számú részre osztja úgy, hogy a részek a cipő bank egymást nem átfedő,
+    egyforma hosszú szakaszaiból osszanak (first_shoe és shoe_count). Cipő bank nélkül a részek beállításai változatlanok.
+    >>> import tempfile
+    >>> file_name = os.path.join(tempfile.mkdtemp(), 'bank.shoes')
+    >>> create_bank(file_name, 1, 10, seed=2)
+    >>> [(shard['first_shoe'], shard['shoe_count']) for shard in shard_configs({'shoe_bank': file_name, 'first_shoe': 1}, 3)]
+    [(1, 3), (4, 3), (7, 3)]
+    >>> decks = [Bank_deck(shard['shoe_bank'], shard['first_shoe'], shard['shoe_count']) for shard in shard_configs({'shoe_bank': file_name}, 2)]
+    >>> [decks[0].get_a_card() for _ in range(52)] == [decks[1].get_a_card() for _ in range(52)]
+    False
+    >>> shard_configs({'shoe_bank': file_name}, 11)
+    Traceback (most recent call last):
+    ...
+    Exception: The shoe bank is too small for the shards
+    >>> shard_configs({'shoe_bank': None}, 2)
+    [{'shoe_bank': None}, {'shoe_bank': None}]
+
+    Args:
+        config (dict): A szimuláció beállításai, köztük opcionálisan a shoe_bank, first_shoe és shoe_count.
+        shards (int): A részek száma.
+
+    Returns:
+        list: A részek beállításai.
+    """
+    if not config.get("shoe_bank"):
+        return [dict(config) for _ in range(shards)]
+    first_shoe = config.get("first_shoe") or 0
+    available = read_bank_header(config["shoe_bank"])[1] - first_shoe
+    if config.get("shoe_count"):
+        available = min(available, config["shoe_count"])
+    stride = available // shards
+    if stride < 1:
+        raise Exception('The shoe bank is too small for the shards')
+    return [dict(config, first_shoe=first_shoe + index * stride, shoe_count=stride) for index in range(shards)]
+
+
+class Bank_deck(Deck):
+    """Egy előre megkevert cipőket tartalmazó fájlból osztó pakli. A fájlt memóriába képezi le, és a lapok kódjait egy memoryview-n
+    keresztül, másolás nélkül olvassa, így több folyamat is ugyanazt az egyszer beolvasott (page cache-ben lévő) fájlt használhatja,
+    és a keverés kimarad a játékból. Minden újrakeverés a következő cipőt veszi elő, ha a cipők elfogytak, akkor hibát jelez.
+    >>> import tempfile
+    >>> file_name = os.path.join(tempfile.mkdtemp(), 'bank.shoes')
+    >>> create_bank(file_name, 2, 3, seed=1)
+    >>> os.path.getsize(file_name)
+    328
+    >>> d = Bank_deck(file_name)
+    >>> shoe = [d.get_a_card() for _ in range(104)]
+    >>> d.out_of_card(), d.shoes, sorted(shoe) == sorted(d._make_a_deck() * 2)
+    (True, 1, True)
+    >>> d.deck_init()
+    >>> d.shoes, d.get_deck_count()
+    (2, 2)
+    >>> Bank_deck(file_name, first_shoe=1).get_a_card() == d.get_a_card()
+    True
+    >>> import pickle
+    >>> copy = pickle.loads(pickle.dumps(d))
+    >>> [copy.get_a_card() for _ in range(103)] == [d.get_a_card() for _ in range(103)]
+    True
+    >>> d.deck_init()
+    >>> d.deck_init()
+    Traceback (most recent call last):
+    ...
+    Exception: The shoe bank is exhausted
+    >>> Bank_deck(file_name, first_shoe=1, shoe_count=1).deck_init()
+    Traceback (most recent call last):
+    ...
+    Exception: The shoe bank is exhausted
+    """
+
+    def __init__(self, file_name: str, first_shoe: int = 0, shoe_count: int = None) -> None:
+        """
+        Args:
+            file_name (str): A create_bank által készített fájl neve.
+            first_shoe (int): Ennyi cipőt átugrik, így a párhuzamos futások a fájl különböző részeit használhatják (lásd shard_configs).
+            shoe_count (int): Legfeljebb ennyi cipőt használ, ha nincs megadva, akkor a fájl végéig.
+        """
+        self._file_name = file_name
+        self._open()
+        self._last_shoe = self._bank_shoes if shoe_count is None else min(self._bank_shoes, first_shoe + shoe_count)
+        self._templates = self._make_a_deck()
+        self._shoe = first_shoe - 1
+        self.shoes = 0
+        self.deck_init()
+
+    def _open(self) -> None:
+        """Memóriába képezi le a fájlt és beolvassa a fejlécet."""
+        with open(self._file_name, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, self._deck_count, _, self._bank_shoes = BANK_HEADER.unpack_from(self._map)
+        if magic != BANK_MAGIC:
+            raise Exception('Not a shoe bank file')
+        self._shoe_size = self._deck_count * 52
+        self._cards = memoryview(self._map)[BANK_HEADER.size:BANK_HEADER.size + self._bank_shoes * self._shoe_size]
+
+    def close(self) -> None:
+        """Megszünteti a fájl leképezését."""
+        self._cards.release()
+        self._map.close()
+
+    def __getstate__(self) -> dict:
+        """A leképezés nem menthető, ezért csak a fájl nevét és a pozíciót menti (például az ellenőrzőpontokban)."""
+        state = dict(vars(self))
+        del state['_map'], state['_cards']
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """Visszaállítja az állapotot és újra leképezi a fájlt."""
+        vars(self).update(state)
+        self._open()
+
+    def deck_init(self) -> None:
+        """Előveszi a következő cipőt."""
+        self._shoe += 1
+        if self._shoe >= self._last_shoe:
+            raise Exception('The shoe bank is exhausted')
+        self.shoes += 1
+        self._position = self._shoe * self._shoe_size
+        self._end = self._position + self._shoe_size
+
+    def shuffle(self) -> None:
+        """A cipők már meg vannak keverve."""
+
+    def get_a_card(self) -> tuple:
+        """Kivesz egy kártyát a cipőből.
+
+        Returns:
+            tuple: A kivett kártya.
+        """
+        card = self._templates[self._cards[self._position]]
+        self._position += 1
+        return card
+
+    def out_of_card(self) -> bool:
+        """Azt viszgálja, hogy elfogyott-e a lap a cipőből.
+
+        Returns:
+            bool: Ha nincs már kártya a cipőben, akkor True-val és ha van még, akkor False-al tér vissza.
+        """
+        return self._position == self._end
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
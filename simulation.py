@@ -0,0 +1,178 @@
+from ai import AI, Game_simulation, Table_game
+from blackjack_logic import load_rules, CHIP_SCALE
+from random_source import Random_source
+from shoe_bank import Bank_deck
+from betting import Count_histogram
+
+
+def create_simulation(config: dict) -> tuple:
+    """Létrehozza a játékost és a játékot a szimuláció beállításai alapján.
+    A beállítások a mentett szimulációs adatok mezőit használják (deck_count, min_bet, max_bet, chips, basic_strategy, bet_system, rules),
+    emellett opcionálisan: seed, deviations, strategy (a stratégia fájl neve a data mappában), bet_ramp, deck_resolution,
+    és table_engine, ami esetén a táblázat alapú Table_game játszik.
+    Ha a deck_seed is meg van adva, akkor a pakli külön véletlenszám forrást kap, így a keverések nem függnek a játékos döntéseitől.
+    Ha a shoe_bank meg van adva, akkor a játék az előre megkevert cipőket tartalmazó fájlból oszt, a first_shoe sorszámú cipőtől kezdve,
+    legfeljebb shoe_count cipőt használva.
+
+    Args:
+        config (dict): A szimuláció beállításai.
+
+    Returns:
+        tuple: A játékos (AI) és a játék (Game_simulation).
+    """
+    rng = Random_source(config.get("seed"))
+    deck_rng = rng if config.get("deck_seed") is None else Random_source(config["deck_seed"])
+    ai = AI(config["chips"], rng)
+    deck = Bank_deck(config["shoe_bank"], config.get("first_shoe") or 0, config.get("shoe_count")) if config.get("shoe_bank") else None
+    engine = Table_game if config.get("table_engine") else Game_simulation
+    g = engine(ai, config["min_bet"], config["max_bet"], config["deck_count"],
+               load_rules(config.get("rules", "Default")), deck_rng, deck)
+    if config["bet_system"]:
+        ai.set_card_counter(config["bet_system"], config["deck_count"],
+                            config.get("bet_ramp", "Linear"), config.get("deck_resolution", 1))
+    if config["basic_strategy"]:
+        ai.set_basic_strategy(config.get("deviations"), config.get("strategy", "basic_strategy"))
+    return ai, g
+
+
+def play_round(ai: AI, g: Game_simulation, counting: bool, histogram: Count_histogram = None) -> float:
+    """Lejátszik egy kört, és a zsetonok pontos (zseton egységben vett) értékéből kiszámolja az eredményét.
+    Minden körönként játszó ciklus (play_rounds, adaptive.play_batch, checkpoint.advance) ezt hívja.
+
+    Args:
+        ai (AI): A játékos.
+        g (Game_simulation): A játék.
+        counting (bool): A játékos számolja-e a lapokat.
+        histogram (Count_histogram): Ha meg van adva, akkor a kör eredményét a tét megtételekor érvényes valódi érték szerint is gyűjti.
+
+    Returns:
+        float: A körben nyert (vagy negatív esetén vesztett) zseton mennyiség, a zseton töredékével együtt.
+    """
+    units = g.get_player_chip_units()
+    if histogram is not None:
+        true_count = ai.get_true_count()
+    g.round()
+    if counting:
+        ai.view_cards_on_the_table(g.get_cards_on_the_table())
+    won = (g.get_player_chip_units() - units) / CHIP_SCALE
+    if histogram is not None:
+        histogram.add(true_count, g.get_round_bet(), won)
+    return won
+
+
+def play_rounds(ai: AI, g: Game_simulation, rounds: int, counting: bool, history: list, histogram: Count_histogram = None) -> None:
+    """Lejátssza a megadott számú kört, és minden kör után feljegyzi a játékos zsetonjainak az értékét.
+
+    Args:
+        ai (AI): A játékos.
+        g (Game_simulation): A játék.
+        rounds (int): A körök száma.
+        counting (bool): A játékos számolja-e a lapokat.
+        history (list): Ehhez a listához fűzi hozzá a zseton mennyiségeket.
+        histogram (Count_histogram): Ha meg van adva, akkor a körök eredményét a tét megtételekor érvényes valódi érték szerint is gyűjti.
+    """
+    for _ in range(rounds):
+        play_round(ai, g, counting, histogram)
+        history.append(g.get_player_chips_value())
+
+
+class Decimated_series:
+    """Egy folyamatosan növekvő zseton sorozat ritkított, korlátos méretű változata az élő grafikonhoz.
+    Csak minden stride-adik kör kerül bele, és ha a pontok száma eléri a kapacitást, akkor minden második pont kiesik,
+    a stride pedig duplázódik, így a pontok száma a körök számától függetlenül legfeljebb capacity, a frissítés költsége
+    pedig csak az új körök számától függ. Az utolsó kör mindig látszik.
+    >>> series = Decimated_series(capacity=8)
+    >>> history = list(range(100, 110))
+    >>> series.update(history)
+    >>> series.points()
+    ([0, 2, 4, 6, 8, 9], [100, 102, 104, 106, 108, 109])
+    >>> history.extend(range(110, 1100))
+    >>> series.update(history)
+    >>> xs, ys = series.points()
+    >>> len(xs) <= 9, xs[:3], xs[-1], ys[-1]
+    (True, [0, 128, 256], 999, 1099)
+    """
+
+    def __init__(self, capacity: int = 2000) -> None:
+        """
+        Args:
+            capacity (int): A tárolt pontok legnagyobb száma.
+        """
+        self._capacity = capacity
+        self._stride = 1
+        self._xs = []
+        self._ys = []
+        self._count = 0
+        self._last = None
+
+    def update(self, history: list) -> None:
+        """Hozzáadja a history azon elemeit, amelyek a legutóbbi frissítés óta kerültek bele.
+
+        Args:
+            history (list): A körök utáni zseton mennyiségek, amit a szimuláció közben is bővíthet.
+        """
+        end = len(history)
+        if end <= self._count:
+            return
+        first = -(-self._count // self._stride) * self._stride
+        self._xs.extend(range(first, end, self._stride))
+        self._ys.extend(history[first:end:self._stride])
+        while len(self._xs) > self._capacity:
+            self._xs = self._xs[::2]
+            self._ys = self._ys[::2]
+            self._stride *= 2
+        self._count = end
+        self._last = (end - 1, history[end - 1])
+
+    def points(self) -> tuple:
+        """A kirajzolandó pontok.
+
+        Returns:
+            tuple: A körök sorszámai és a zseton mennyiségek listái, a legutolsó körrel együtt.
+        """
+        if self._last is None or (self._xs and self._xs[-1] == self._last[0]):
+            return self._xs.copy(), self._ys.copy()
+        return self._xs + [self._last[0]], self._ys + [self._last[1]]
+
+
+def run_simulation(config: dict) -> dict:
+    """Leszimulál egy játékot a megadott beállítások alapján.
+    >>> data = run_simulation({"deck_count": 6, "rounds": 200, "min_bet": 100, "max_bet": 3000, "chips": 5000,
+    ...                        "basic_strategy": True, "bet_system": "Hi-Lo", "rules": "Default", "seed": 1})
+    >>> len(data["history"])
+    200
+    >>> data["history"] == run_simulation(dict(data, history=None))["history"]
+    True
+    >>> data["history"] == run_simulation(dict(data, table_engine=True))["history"]
+    True
+    >>> rows = Count_histogram.from_dict(data["count_histogram"]).rows()
+    >>> sum(row['hands'] for row in rows), all(100 <= row['mean_bet'] <= 3000 for row in rows)
+    (200, True)
+    >>> import os, tempfile
+    >>> from shoe_bank import create_bank
+    >>> bank = os.path.join(tempfile.mkdtemp(), 'bank.shoes')
+    >>> create_bank(bank, 6, 20, seed=5)
+    >>> banked = run_simulation(dict(data, shoe_bank=bank))
+    >>> banked["history"] == run_simulation(dict(data, shoe_bank=bank, table_engine=True))["history"]
+    True
+
+    Args:
+        config (dict): A szimuláció beállításai, köztük a körök száma (rounds).
+
+    Returns:
+        dict: A beállítások kiegészítve a körök utáni zseton mennyiségekkel (history), lapszámolás esetén
+            a valódi érték szerinti eredményekkel is (count_histogram, a Count_histogram.as_dict formájában).
+    """
+    ai, g = create_simulation(config)
+    history = []
+    if not config["bet_system"]:
+        play_rounds(ai, g, config["rounds"], False, history)
+        return dict(config, history=history)
+    histogram = Count_histogram()
+    play_rounds(ai, g, config["rounds"], True, history, histogram)
+    return dict(config, history=history, count_histogram=histogram.as_dict())
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -1,11 +1,20 @@
-from ai import AI, Game_simulation
+from blackjack_logic import get_rules_names
+from simulation import create_simulation, play_rounds, Decimated_series
+from adaptive import run_adaptive
+from results_store import Results_store
+from betting import Count_histogram
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
-import matplotlib.pyplot as plt
+from base64 import b64encode
+from io import BytesIO
+from threading import Thread
 import json
 import os
 
+LIVE_FRAME_MS = 50
+LIVE_BATCH_ROUNDS = 1000
+
 
 class Statistics_frame(tk.Frame):
     """A statisztikai adatok megjelenését definiálja az osztály."""
@@ -13,20 +22,79 @@ class Statistics_frame(tk.Frame):
     def __init__(self, master) -> None:
         super().__init__(master)
         self.configure(background='white')
+        self._img = tk.PhotoImage(master=self)
+        self._live_canvas = None
+
+    def start_live(self, rounds: int, chips: int) -> None:
+        """Egy üres élő grafikont jelenít meg a szimuláció idejére. A vászon a futások között újra fel van használva.
+        Az x tengely a körök számáig tart, így csak akkor kell az egész grafikont újrarajzolni, ha a zsetonok kilépnek az y tartományból.
+
+        Args:
+            rounds (int): A körök legnagyobb száma.
+            chips (int): A kezdő zseton mennyiség.
+        """
+        for widget in self.grid_slaves():
+            widget.destroy()
+        if self._live_canvas is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            figure = Figure()
+            self._live_axes = figure.subplots()
+            self._live_axes.tick_params(axis='both', which='major', labelsize=7)
+            self._live_axes.set_xlabel('Rounds')
+            self._live_axes.set_ylabel('Chips')
+            self._live_axes.set_title('Simulation in progress')
+            self._live_line, = self._live_axes.plot([], [], animated=True)
+            self._live_canvas = FigureCanvasTkAgg(figure, master=self)
+        self._live_line.set_data([], [])
+        self._live_axes.set_xlim(0, max(rounds, 1))
+        self._live_axes.set_ylim(0, 2 * chips)
+        self._live_canvas.get_tk_widget().grid(row=0, column=0)
+        self._redraw_live()
+
+    def _redraw_live(self) -> None:
+        """Újrarajzolja a grafikont a vonal nélkül, és elmenti a hátterét a blitteléshez."""
+        self._live_canvas.draw()
+        self._live_background = self._live_canvas.copy_from_bbox(self._live_axes.bbox)
+
+    def draw_live(self, xs: list, ys: list) -> None:
+        """Kirajzolja az élő grafikon pontjait. Csak a vonal rajzolódik újra az elmentett háttérre (blitting),
+        a teljes grafikon csak akkor, ha az y tartományt bővíteni kell. A költség a pontok számától függ, ami korlátos.
 
-    def update(self, data: dict) -> None:
-        """Egy szimuláció adatait jeleníti meg.
+        Args:
+            xs (list): A körök sorszámai.
+            ys (list): A zseton mennyiségek.
+        """
+        if not ys:
+            return
+        self._live_line.set_data(xs, ys)
+        bottom, top = self._live_axes.get_ylim()
+        low, high = min(ys), max(ys)
+        if low < bottom or high > top:
+            margin = (high - low) / 2 + 1
+            self._live_axes.set_ylim(min(bottom, low - margin), max(top, high + margin))
+            self._redraw_live()
+        self._live_canvas.restore_region(self._live_background)
+        self._live_axes.draw_artist(self._live_line)
+        self._live_canvas.blit(self._live_axes.bbox)
+
+    def update(self, data: dict, image: bytes = None) -> None:
+        """Egy szimuláció adatait jeleníti meg. A grafikon képe ugyanabba a PhotoImage-be töltődik be minden alkalommal.
 
         Args:
             data (dict): A szimuláció adatai.
+            image (bytes): A grafikon PNG formátumban. Ha nincs megadva, akkor a data["plot_img"] fájlból tölti be.
         """
-        for label in self.grid_slaves():
-            label.grid_forget()
-        self._img = tk.PhotoImage(file=data["plot_img"])
+        for widget in self.grid_slaves():
+            widget.destroy()
+        if image is None:
+            self._img.configure(file=data["plot_img"])
+        else:
+            self._img.configure(data=b64encode(image))
         img_widget = tk.Label(self, image=self._img, bd=0)
         text_frame = tk.Frame(self, background='white')
         padding = 20
-        tk.Label(text_frame, text=f'Number of decks: {data["deck_count"]}', background='white').grid(
+        tk.Label(text_frame, text=f'Number of decks: {data["deck_count"] or "infinite"}', background='white').grid(
             padx=padding, row=0, column=0)
         tk.Label(text_frame, text=f'Minimum bet: {data["min_bet"]}', background='white').grid(
             padx=padding, row=0, column=1)
@@ -38,10 +106,122 @@ class Statistics_frame(tk.Frame):
             padx=padding, row=1, column=1)
         tk.Label(text_frame, text=f'Card counting: {"off" if data["bet_system"] == False else data["bet_system"]}', background='white').grid(
             padx=padding, row=1, column=2)
+        tk.Label(text_frame, text=f'Rules: {data.get("rules", "Default")}', background='white').grid(
+            padx=padding, row=2, columnspan=3)
         tk.Label(text_frame, text=f'After {data["rounds"]} rounds, the value of the chips is {data["history"][- 1]}.',
                  background='white').grid(padx=padding, row=3, columnspan=3)
+        if "ev" in data:
+            tk.Label(text_frame, text=f'EV per hand: {data["ev"] * 100:+.2f}% ± {data["half_width"] * 100:.2f}% (95% confidence)',
+                     background='white').grid(padx=padding, row=4, columnspan=3)
         img_widget.grid(row=0, column=0)
         text_frame.grid(row=1, column=0)
+        if data.get("count_histogram"):
+            self._show_count_histogram(data["count_histogram"]).grid(row=2, column=0, pady=5)
+
+    def _show_count_histogram(self, histogram: dict) -> ttk.Treeview:
+        """Táblázatban jeleníti meg a valódi érték szerinti eredményeket: valódi értékenként a körök számát és arányát,
+        a kezdő tét arányában vett várható értéket, a szórást és az átlagos tétet.
+
+        Args:
+            histogram (dict): A hisztogram a Count_histogram.as_dict formájában.
+
+        Returns:
+            ttk.Treeview: A táblázat.
+        """
+        columns = ('true_count', 'hands', 'frequency', 'ev', 'standard_deviation', 'mean_bet')
+        headings = ('True count', 'Hands', 'Frequency', 'EV per hand', 'SD', 'Mean bet')
+        table = ttk.Treeview(self, columns=columns, show='headings', height=6)
+        for column, heading in zip(columns, headings):
+            table.heading(column, text=heading)
+            table.column(column, width=90, anchor='e')
+        for row in Count_histogram.from_dict(histogram).rows():
+            table.insert('', 'end', values=(row['true_count'], row['hands'], f'{row["frequency"]:.2%}', f'{row["ev"]:+.2%}',
+                                            f'{row["standard_deviation"]:.3f}', f'{row["mean_bet"]:.1f}'))
+        return table
+
+    def show_comparison(self, runs: list, image: bytes) -> None:
+        """Több elmentett szimuláció összehasonlítását jeleníti meg: a közös grafikont és szimulációnként egy összefoglaló sort.
+
+        Args:
+            runs (list): A szimulációk beállításai és összesített eredményei.
+            image (bytes): A közös grafikon PNG formátumban.
+        """
+        for widget in self.grid_slaves():
+            widget.destroy()
+        self._img.configure(data=b64encode(image))
+        tk.Label(self, image=self._img, bd=0).grid(row=0, column=0)
+        text_frame = tk.Frame(self, background='white')
+        for row, run in enumerate(runs):
+            tk.Label(text_frame, text=f'#{run["id"]}: {run["deck_count"] or "infinite"} decks, {run["rules"]}, '
+                                      f'basic strategy {"on" if run["basic_strategy"] else "off"}, '
+                                      f'card counting {run["bet_system"] or "off"}: {run["final_chips"]} chips after {run["rounds"]} rounds '
+                                      f'({run["result_per_round"]:+.2f} per round)', background='white').grid(row=row, column=0, sticky='w')
+        text_frame.grid(row=1, column=0)
+
+
+class Runs_frame(tk.Frame):
+    """Az elmentett szimulációk listáját jeleníti meg. A lista csak a runs tábla összesített adatait olvassa,
+    a körök utáni zseton mennyiségeket csak a kiválasztott szimulációkhoz tölti be."""
+
+    COLUMNS = (('id', '#', 40), ('created', 'Date', 130), ('deck_count', 'Decks', 45), ('rounds', 'Rounds', 60),
+               ('rules', 'Rules', 110), ('basic_strategy', 'Basic', 45), ('bet_system', 'Counting', 90),
+               ('final_chips', 'Chips', 70), ('result_per_round', 'Per round', 70))
+
+    def __init__(self, master, show, compare) -> None:
+        """
+        Args:
+            master: A szülő widget.
+            show (callable): Egy szimuláció azonosítójával hívódik meg, ha a felhasználó meg akarja nézni.
+            compare (callable): A szimulációk azonosítóinak a listájával hívódik meg, ha a felhasználó össze akarja hasonlítani őket.
+        """
+        super().__init__(master)
+        self.configure(background='white')
+        self._show = show
+        self._compare = compare
+        tk.Label(self, text="Past simulations", font=('Arial', 16), background='white').grid(pady=10, row=0, columnspan=2)
+        self._tree = ttk.Treeview(self, columns=[column for column, _, _ in self.COLUMNS], show='headings', height=8, selectmode='extended')
+        for column, heading, width in self.COLUMNS:
+            self._tree.heading(column, text=heading)
+            self._tree.column(column, width=width, anchor='e')
+        self._tree.grid(row=1, columnspan=2)
+        self._tree.bind('<Double-1>', lambda event: self._show_selected())
+        tk.Button(self, text='Show', background='white', command=self._show_selected).grid(sticky='we', row=2, column=0, padx=20, pady=10)
+        tk.Button(self, text='Compare', background='white', command=self._compare_selected).grid(sticky='we', row=2, column=1, padx=20, pady=10)
+
+    def update_runs(self, runs: list) -> None:
+        """Újratölti a listát.
+
+        Args:
+            runs (list): A szimulációk beállításai és összesített eredményei.
+        """
+        self._tree.delete(*self._tree.get_children())
+        for run in runs:
+            values = [run[column] for column, _, _ in self.COLUMNS]
+            values[2] = run['deck_count'] or '∞'
+            values[5] = 'on' if run['basic_strategy'] else 'off'
+            values[6] = run['bet_system'] or 'off'
+            values[8] = f'{run["result_per_round"]:+.2f}'
+            self._tree.insert('', 'end', iid=str(run['id']), values=values)
+
+    def _selected_ids(self) -> list:
+        """A kiválasztott szimulációk azonosítói.
+
+        Returns:
+            list: Az azonosítók listája.
+        """
+        return [int(iid) for iid in self._tree.selection()]
+
+    def _show_selected(self) -> None:
+        """Megjeleníti az első kiválasztott szimulációt."""
+        selected = self._selected_ids()
+        if selected:
+            self._show(selected[0])
+
+    def _compare_selected(self) -> None:
+        """Összehasonlítja a kiválasztott szimulációkat."""
+        selected = self._selected_ids()
+        if selected:
+            self._compare(selected)
 
 
 class Form_frame(tk.Frame):
@@ -56,8 +236,8 @@ class Form_frame(tk.Frame):
             pady=self._padding, row=0, columnspan=3)
 
         self.decks_var = tk.IntVar(self, value=1)
-        tk.Label(self, text="Decks: ").grid(sticky='w', row=1, column=0)
-        tk.Spinbox(self, textvariable=self.decks_var, width=2, from_=1, to=8).grid(
+        tk.Label(self, text="Decks (0 = ∞): ").grid(sticky='w', row=1, column=0)
+        tk.Spinbox(self, textvariable=self.decks_var, width=2, from_=0, to=8).grid(
             pady=self._padding, sticky='w', row=1, column=1)
 
         self.rounds_var = tk.IntVar(self, value=1000)
@@ -65,38 +245,51 @@ class Form_frame(tk.Frame):
         tk.Spinbox(self, textvariable=self.rounds_var, width=7, from_=1, to=100000,
                    increment=100).grid(pady=self._padding, sticky='w', row=2, column=1)
 
+        self.precision_var = tk.DoubleVar(self, value=0)
+        tk.Label(self, text="Precision (±%): ").grid(sticky='w', row=3, column=0)
+        tk.Spinbox(self, textvariable=self.precision_var, width=7, from_=0, to=10,
+                   increment=0.1).grid(pady=self._padding, sticky='w', row=3, column=1)
+        tk.Label(self, text="0 = fixed rounds").grid(sticky='w', row=3, column=2)
+
         self.minimum_bet_var = tk.IntVar(self, value=100)
-        tk.Label(self, text="Minimum bet: ").grid(sticky='w', row=3, column=0)
+        tk.Label(self, text="Minimum bet: ").grid(sticky='w', row=4, column=0)
         tk.Spinbox(self, textvariable=self.minimum_bet_var, width=7, from_=100, to=99999,
-                   increment=100).grid(pady=self._padding, sticky='w', row=3, column=1)
+                   increment=100).grid(pady=self._padding, sticky='w', row=4, column=1)
 
         self.maximum_bet_var = tk.IntVar(self, value=3000)
-        tk.Label(self, text="Maximum bet: ").grid(sticky='w', row=4, column=0)
+        tk.Label(self, text="Maximum bet: ").grid(sticky='w', row=5, column=0)
         tk.Spinbox(self, textvariable=self.maximum_bet_var, width=7, from_=101, to=100000,
-                   increment=100).grid(pady=self._padding, sticky='w', row=4, column=1)
+                   increment=100).grid(pady=self._padding, sticky='w', row=5, column=1)
 
         self.chips_var = tk.IntVar(self, value=5000)
-        tk.Label(self, text="Chips: ").grid(sticky='w', row=5, column=0)
+        tk.Label(self, text="Chips: ").grid(sticky='w', row=6, column=0)
         tk.Label(self, textvariable=self.chips_var, width=6).grid(
-            sticky='e', row=5, column=2)
+            sticky='e', row=6, column=2)
         tk.Scale(self, variable=self.chips_var, orient='horizontal', troughcolor='white', showvalue=0,
-                 from_=100, to=100000, resolution=100).grid(pady=self._padding, sticky='w', row=5, column=1)
+                 from_=100, to=100000, resolution=100).grid(pady=self._padding, sticky='w', row=6, column=1)
 
         self.basic_strategy_state = tk.BooleanVar(self, value=True)
         tk.Label(self, text="Basic strategy: ").grid(
-            sticky='w', row=6, column=0)
+            sticky='w', row=7, column=0)
         tk.Checkbutton(self, variable=self.basic_strategy_state, onvalue=True,
-                       offvalue=False).grid(pady=self._padding, sticky='w', row=6, column=1)
+                       offvalue=False).grid(pady=self._padding, sticky='w', row=7, column=1)
+
+        self.rules_var = tk.StringVar(self)
+        tk.Label(self, text="Rules: ").grid(sticky='w', row=8, column=0)
+        rules_combobox = ttk.Combobox(self, width=16, state='readonly', textvariable=self.rules_var, values=get_rules_names())
+        rules_combobox.current(0)
+        rules_combobox.grid(pady=self._padding, row=8, column=1, columnspan=2)
 
         self.card_counter_state = tk.BooleanVar(self, value=False)
-        tk.Label(self, text="Card counter: ").grid(sticky='w', row=7, column=0)
+        tk.Label(self, text="Card counter: ").grid(sticky='w', row=9, column=0)
         tk.Checkbutton(self, variable=self.card_counter_state, onvalue=True, offvalue=False,
-                       command=self._select_system).grid(pady=self._padding, sticky='w', row=7, column=1)
+                       command=self._select_system).grid(pady=self._padding, sticky='w', row=9, column=1)
 
         self.counting_system_var = tk.StringVar(self)
 
         for widget in self.grid_slaves():
-            widget.configure(background='white', bd=0)
+            if not isinstance(widget, ttk.Combobox):
+                widget.configure(background='white', bd=0)
 
     def _get_counting_system_names(self) -> list:
         """Visszaadja azoknak lapszámolási technikák nevét, amik megtalálhatóak az erre létrehozott mappában.
@@ -113,12 +306,12 @@ class Form_frame(tk.Frame):
         if self.card_counter_state.get():
             self._counting_system_label = tk.Label(
                 self, background='white', text="System: ")
-            self._counting_system_label.grid(sticky='w', row=8, column=0)
+            self._counting_system_label.grid(sticky='w', row=10, column=0)
             self._counting_system_combobox = ttk.Combobox(
                 self, width=16, state='readonly', textvariable=self.counting_system_var, values=self._get_counting_system_names())
             self._counting_system_combobox.current(0)
             self._counting_system_combobox.grid(
-                pady=self._padding, row=8, column=1, columnspan=2)
+                pady=self._padding, row=10, column=1, columnspan=2)
         else:
             self._counting_system_label.destroy()
             self._counting_system_combobox.destroy()
@@ -127,8 +320,14 @@ class Form_frame(tk.Frame):
 class Simulation_window(tk.Tk):
     """Egy ablakot definiál, ami ha van régebbi szimulációs adat akkor annak a statisztikáját jeleníti meg és, emelett új szimulációra is ad lehetőséget."""
 
-    def __init__(self) -> None:
+    def __init__(self, export_plot: bool = True) -> None:
+        """
+        Args:
+            export_plot (bool): A grafikon képét a háttérben a save mappába is kiírja-e.
+        """
         super().__init__()
+        self._export_plot = export_plot
+        self._figure = None
         self.title('Epic blackjack simulator by Csabi')
         self.configure(background='white', padx=15, pady=15)
         self.resizable(False, False)
@@ -137,53 +336,114 @@ class Simulation_window(tk.Tk):
         style.map('TCombobox', selectbackground=[('readonly', 'white')])
         style.map('TCombobox', selectforeground=[('readonly', 'black')])
 
-        self._save_file = 'save/last_statistics.json'
+        self._store = Results_store()
+        legacy_file = 'save/last_statistics.json'
+        if self._store.latest_run_id() is None and os.path.isfile(legacy_file):
+            self._store.import_json(legacy_file)
         self._statistics_frame = Statistics_frame(self)
         self._statistics_frame.grid(column=0, rowspan=2)
-        if os.path.isfile(self._save_file):
-            self._last_data = self._load_last_statistics()
-            self._statistics_frame.update(self._last_data)
+        latest_run_id = self._store.latest_run_id()
+        if latest_run_id is not None:
+            self._last_data = self._store.load_run(latest_run_id)
+            if self._last_data.get("plot_img") and os.path.isfile(self._last_data["plot_img"]):
+                self._statistics_frame.update(self._last_data)
+            else:
+                self._statistics_frame.update(self._last_data, self._plot(self._last_data["history"]))
 
         self._form_frame = Form_frame(self)
         self._form_frame.grid(row=0, column=1, padx=20)
 
-        tk.Button(self._form_frame, text='Simulate game', background='white',
-                  command=self._new_simulation).grid(sticky='we', row=9, columnspan=3, padx=20, pady=15)
+        self._simulate_button = tk.Button(self._form_frame, text='Simulate game', background='white', command=self._new_simulation)
+        self._simulate_button.grid(sticky='we', row=11, columnspan=3, padx=20, pady=15)
+
+        self._runs_frame = Runs_frame(self, self._show_run, self._compare_runs)
+        self._runs_frame.grid(row=1, column=1, padx=20)
+        self._runs_frame.update_runs(self._store.list_runs())
 
         self.eval('tk::PlaceWindow . center')
 
-    def _plot(self, stat: list, file_name: str) -> None:
-        """Grafikon formájában menti el, hogy a szimúláció során a játékosnak a körök után mennyi zsetonja volt.
+    def _plot(self, *stats: list, title: str = 'Last simulation', labels: list = None) -> bytes:
+        """Grafikon formájában a memóriába rajzolja, hogy a szimúláció során a játékosnak a körök után mennyi zsetonja volt.
+        A matplotlib csak az első rajzoláskor töltődik be, a pyplot és az interaktív backend nélkül, így az ablak indulását nem lassítja.
+        A grafikon a futások között újra fel van használva, csak a vonalak adatai cserélődnek.
 
         Args:
-            stat (list): A körök utáni zseton mennyiségek.
+            *stats (list): A körök utáni zseton mennyiségek, összehasonlításnál több szimulációé is.
+                Egy (körök, zseton mennyiségek) pár esetén csak a megadott körök pontjait rajzolja ki, például egy Decimated_series pontjait.
+            title (str): A grafikon címe.
+            labels (list): A vonalak nevei a jelmagyarázatban, ha nincs megadva, akkor nincs jelmagyarázat.
+
+        Returns:
+            bytes: A grafikon PNG formátumban.
+        """
+        if self._figure is None:
+            from matplotlib.figure import Figure
+            self._figure = Figure()
+            self._axes = self._figure.subplots()
+            self._axes.tick_params(axis='both', which='major', labelsize=7)
+            self._axes.set_xlabel('Rounds')
+            self._axes.set_ylabel('Chips')
+            self._lines = []
+        while len(self._lines) < len(stats):
+            self._lines.extend(self._axes.plot([], []))
+        while len(self._lines) > len(stats):
+            self._lines.pop().remove()
+        for line, stat in zip(self._lines, stats):
+            if isinstance(stat, tuple):
+                line.set_data(*stat)
+            else:
+                line.set_data(range(len(stat)), stat)
+        legend = self._axes.get_legend()
+        if legend is not None:
+            legend.remove()
+        if labels is not None:
+            self._axes.legend(self._lines, labels, fontsize=7)
+        self._axes.set_title(title)
+        self._axes.relim()
+        self._axes.autoscale_view()
+        buffer = BytesIO()
+        self._figure.savefig(buffer, format='png')
+        return buffer.getvalue()
+
+    def _export(self, image: bytes, file_name: str) -> None:
+        """A háttérben fájlba írja a grafikon képét, így a szimuláció megjelenítése nem várja meg a lemezre írást.
+
+        Args:
+            image (bytes): A grafikon PNG formátumban.
             file_name (str): Megadja, hogy milyen néven legyen elmentve a grafikon képe.
         """
-        fig, ax = plt.subplots()
-        ax.tick_params(axis='both', which='major', labelsize=7)
-        ax.set_xlabel('Rounds')
-        ax.set_title('Last simulation')
-        ax.set_ylabel('Chips')
-        ax.plot(stat)
-        fig.savefig(file_name)
+        def write():
+            with open(file_name, 'wb') as f:
+                f.write(image)
+        Thread(target=write, daemon=True).start()
 
     def _save_statistics(self) -> None:
-        """JSON formátumban elmenti a szimuláció adatait."""
-        with open(self._save_file, "wt") as f:
-            json.dump(self._last_data, f)
+        """Elmenti a szimuláció adatait az eredmények adatbázisába, és frissíti az elmentett szimulációk listáját."""
+        self._last_data["id"] = self._store.save_run(self._last_data)
+        self._runs_frame.update_runs(self._store.list_runs())
 
-    def _load_last_statistics(self) -> dict:
-        """Betölti az utolsó szimuláció adatait.
+    def _show_run(self, run_id: int) -> None:
+        """Megjelenít egy elmentett szimulációt.
 
-        Returns:
-            dict: A szimuláció adatai.
+        Args:
+            run_id (int): A szimuláció azonosítója.
         """
-        with open(self._save_file) as f:
-            return json.load(f)
+        data = self._store.load_run(run_id)
+        self._statistics_frame.update(data, self._plot(data["history"], title=f'Simulation #{run_id}'))
+
+    def _compare_runs(self, run_ids: list) -> None:
+        """Egy grafikonon hasonlítja össze az elmentett szimulációkat.
+
+        Args:
+            run_ids (list): A szimulációk azonosítói.
+        """
+        runs = [self._store.load_run(run_id) for run_id in run_ids]
+        image = self._plot(*[run["history"] for run in runs], title='Comparison', labels=[f'#{run["id"]}' for run in runs])
+        self._statistics_frame.show_comparison(runs, image)
 
     def _simulation(self) -> None:
-        """Leszimulál egy játékot a megadott adatok alapján, majd elmenti azt."""
-        history = []
+        """Ellenőrzi a megadott adatokat, majd egy háttérszálon elindítja a szimulációt. A szál csak a zseton mennyiségek listáját bővíti,
+        a grafikont a főszál frissíti rögzített képkocka időközönként, így a rajzolás nem lassítja a szimulációt."""
         decks = self._form_frame.decks_var.get()
         rounds = self._form_frame.rounds_var.get()
         min_bet = self._form_frame.minimum_bet_var.get()
@@ -191,28 +451,16 @@ class Simulation_window(tk.Tk):
         chips = self._form_frame.chips_var.get()
         system_state = self._form_frame.card_counter_state.get()
         system = self._form_frame.counting_system_var.get()
+        rules = self._form_frame.rules_var.get()
+        precision = self._form_frame.precision_var.get()
 
         if rounds > 100000 or rounds < 1:
             raise Exception('Invalid rounds value')
+        elif precision < 0:
+            raise Exception('Invalid precision value')
         else:
             basic_strategy = self._form_frame.basic_strategy_state.get()
-            ai = AI(chips)
-            g = Game_simulation(ai, min_bet, max_bet, decks)
-            if system_state:
-                ai.set_card_counter(system, decks)
-            if basic_strategy:
-                ai.set_basic_strategy()
-
-            for i in range(rounds):
-                g.round()
-                if system_state:
-                    ai.view_cards_on_the_table(g.get_cards_on_the_table())
-                history.append(g.get_player_chips_value())
-
-            plot_fname = 'save/last_statistics.png'
-            self._plot(history, plot_fname)
-
-            self._last_data = {
+            config = {
                 "deck_count": decks,
                 "rounds": rounds,
                 "min_bet": min_bet,
@@ -220,11 +468,64 @@ class Simulation_window(tk.Tk):
                 "chips": chips,
                 "basic_strategy": basic_strategy,
                 "bet_system": system if system_state else system_state,
-                "history": history,
-                "plot_img": plot_fname
+                "rules": rules
             }
-            self._save_statistics()
-            self._statistics_frame.update(self._last_data)
+            self._live_history = []
+            self._live_series = Decimated_series()
+            self._live_result = None
+            self._simulate_button.configure(state='disabled')
+            self._statistics_frame.start_live(rounds, chips)
+            Thread(target=self._simulate_in_background, args=(config, precision), daemon=True).start()
+            self.after(LIVE_FRAME_MS, self._refresh_live)
+
+    def _simulate_in_background(self, config: dict, precision: float) -> None:
+        """A háttérszálon futó szimuláció. Az eredményt vagy a hibát a _live_result-ba teszi, a mentés a főszálban történik,
+        mert az adatbázis kapcsolat csak abban a szálban használható, ahol létrejött. A játékot csak a fix számú kör esetén hozza létre,
+        a run_adaptive a sajátját használja.
+
+        Args:
+            config (dict): A szimuláció beállításai.
+            precision (float): A kívánt pontosság százalékban, 0 esetén fix számú kört játszik.
+        """
+        history = self._live_history
+        counting = bool(config["bet_system"])
+        histogram = Count_histogram() if counting else None
+        try:
+            if precision > 0:
+                result = run_adaptive(config, precision / 100, max_rounds=config["rounds"], batch_rounds=1000, history=history,
+                                      histogram=histogram)
+                data = dict(config, rounds=result["rounds"], history=history, ev=result["ev"], half_width=result["half_width"])
+            else:
+                ai, g = create_simulation(config)
+                for start in range(0, config["rounds"], LIVE_BATCH_ROUNDS):
+                    play_rounds(ai, g, min(LIVE_BATCH_ROUNDS, config["rounds"] - start), counting, history, histogram)
+                data = dict(config, history=history)
+            if histogram is not None:
+                data["count_histogram"] = histogram.as_dict()
+            self._live_result = data
+        except Exception as e:
+            self._live_result = e
+
+    def _refresh_live(self) -> None:
+        """Rögzített időközönként kirajzolja az új pontokat, a szimuláció végén pedig megjeleníti és elmenti az eredményt."""
+        result = self._live_result
+        self._live_series.update(self._live_history)
+        self._statistics_frame.draw_live(*self._live_series.points())
+        if result is None:
+            self.after(LIVE_FRAME_MS, self._refresh_live)
+            return
+        self._simulate_button.configure(state='normal')
+        if isinstance(result, Exception):
+            messagebox.showerror('Error', result)
+            return
+        image = self._plot(self._live_series.points())
+        plot_fname = 'save/last_statistics.png' if self._export_plot else None
+        if self._export_plot:
+            self._export(image, plot_fname)
+
+        self._last_data = dict(result, plot_img=plot_fname)
+        self._save_statistics()
+        self._statistics_frame.update(self._last_data, image)
 
     def _new_simulation(self) -> None:
         """Ha hiba nélkül futtatható a szimuláció akkor lefuttatja, ha nem, akkor hibaüzenet formájában értésíti a felhasználót a probléma okáról."""
@@ -0,0 +1,322 @@
+from blackjack_logic import Rules, DEFAULT_RULES
+
+CARD_VALUES = range(2, 12)
+TEN = 10
+ACE = 11
+DEALER_RESULTS = (17, 18, 19, 20, 21)
+
+
+def full_shoe(deck_count: int) -> list:
+    """A megadott számú pakli összetétele.
+
+    Args:
+        deck_count (int): A paklik száma.
+
+    Returns:
+        list: A lapértékkel (2-11) indexelt darabszámok.
+    """
+    counts = [0] * 12
+    for value in CARD_VALUES:
+        counts[value] = 16 * deck_count if value == TEN else 4 * deck_count
+    return counts
+
+
+class Composition_solver:
+    """Egy adott cipő összetétel mellett kiszámolja a lépések és a játék várható értékét, a tét arányában.
+    Az osztó megnézi, hogy Blackjackje van-e, mielőtt a játékos lépne (ahogy a Game is), így a játékos csak a kezdő tétet veszítheti el.
+    Egyszerűsítés: a lapok valószínűsége a kiinduló összetételből adódik és a kézen belül nem változik (a kiosztott lapok nem fogynak),
+    a split után nincs újrasplitelés. A lapszámolási elemzéshez szükséges különbségeket (effect of removal) így is jól közelíti,
+    és egy összetétel kiértékelése csak néhány ezredmásodperc. A szabályok közül az osztó puha 17-e, a split utáni duplázás,
+    a split ászokra kérhető lap, a feladás és a Blackjack kifizetése számít.
+    >>> s = Composition_solver(full_shoe(6))
+    >>> -0.01 < s.expected_value() < 0.0
+    True
+    >>> s.action_ev('hard_hand', 16, 10, 'h') > s.action_ev('hard_hand', 16, 10, 's')
+    True
+    >>> s.action_ev('pair_splitting', 8, 10, 'sp') > s.action_ev('pair_splitting', 8, 10, 'h')
+    True
+    >>> round(s.insurance_ev(), 4)
+    -0.0769
+    >>> richer = full_shoe(6)
+    >>> richer[5] -= 4
+    >>> Composition_solver(richer).expected_value() > s.expected_value()
+    True
+    """
+
+    def __init__(self, counts: list, rules: Rules = None) -> None:
+        """
+        Args:
+            counts (list): A lapértékkel (2-11) indexelt darabszámok.
+            rules (Rules): A játékszabályok, ha nincs megadva, akkor az alapértelmezett szabályok.
+        """
+        total = sum(counts)
+        self._p = [count / total for count in counts]
+        self._rules = DEFAULT_RULES if rules is None else rules
+        self._dealer = {}
+        self._dealer_states = {}
+        self._hit = {}
+
+    def _add(self, hard: int, ace: bool, value: int) -> tuple:
+        """Egy lap hozzáadása egy kézhez, ahol az ász 1-nek számít a kemény összegben.
+
+        Args:
+            hard (int): A kéz kemény összege.
+            ace (bool): Van-e ász a kézben.
+            value (int): A lap értéke.
+
+        Returns:
+            tuple: Az új kemény összeg és ász jelző.
+        """
+        return hard + (1 if value == ACE else value), ace or value == ACE
+
+    def _score(self, hard: int, ace: bool) -> tuple:
+        """A kéz értéke és hogy puha-e.
+
+        Args:
+            hard (int): A kéz kemény összege.
+            ace (bool): Van-e ász a kézben.
+
+        Returns:
+            tuple: Az érték és a puha jelző.
+        """
+        if ace and hard + 10 <= 21:
+            return hard + 10, True
+        return hard, False
+
+    def _dealer_final(self, hard: int, ace: bool) -> tuple:
+        """Az osztó végső értékének az eloszlása az adott állásból.
+
+        Args:
+            hard (int): Az osztó kezének kemény összege.
+            ace (bool): Van-e ász az osztó kezében.
+
+        Returns:
+            tuple: A 17, 18, 19, 20, 21 és a besokallás valószínűsége.
+        """
+        key = (hard, ace)
+        if key in self._dealer_states:
+            return self._dealer_states[key]
+        score, soft = self._score(hard, ace)
+        if score > 21:
+            distribution = (0, 0, 0, 0, 0, 1)
+        elif score > 17 or (score == 17 and not (soft and self._rules.dealer_hits_soft_17)):
+            distribution = tuple(1 if score == result else 0 for result in DEALER_RESULTS) + (0,)
+        else:
+            distribution = [0] * 6
+            for value in CARD_VALUES:
+                for index, probability in enumerate(self._dealer_final(*self._add(hard, ace, value))):
+                    distribution[index] += self._p[value] * probability
+            distribution = tuple(distribution)
+        self._dealer_states[key] = distribution
+        return distribution
+
+    def dealer_distribution(self, upcard: int) -> tuple:
+        """Az osztó végső értékének az eloszlása a felfordított lapja alapján, feltéve, hogy nincs Blackjackje.
+
+        Args:
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            tuple: A 17, 18, 19, 20, 21 és a besokallás valószínűsége.
+        """
+        if upcard not in self._dealer:
+            excluded = {ACE: TEN, TEN: ACE}.get(upcard)
+            norm = 1 - (self._p[excluded] if excluded else 0)
+            distribution = [0] * 6
+            start = self._add(0, False, upcard)
+            for value in CARD_VALUES:
+                if value == excluded:
+                    continue
+                for index, probability in enumerate(self._dealer_final(*self._add(*start, value))):
+                    distribution[index] += self._p[value] / norm * probability
+            self._dealer[upcard] = tuple(distribution)
+        return self._dealer[upcard]
+
+    def dealer_blackjack(self, upcard: int) -> float:
+        """Annak a valószínűsége, hogy az osztónak Blackjackje van.
+
+        Args:
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A valószínűség.
+        """
+        return self._p[{ACE: TEN, TEN: ACE}[upcard]] if upcard in (ACE, TEN) else 0
+
+    def _stand(self, score: int, upcard: int) -> float:
+        """A megállás várható értéke.
+
+        Args:
+            score (int): A játékos kezének az értéke.
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A várható érték.
+        """
+        if score > 21:
+            return -1
+        distribution = self.dealer_distribution(upcard)
+        ev = distribution[5]
+        for result, probability in zip(DEALER_RESULTS, distribution):
+            if score > result:
+                ev += probability
+            elif score < result:
+                ev -= probability
+        return ev
+
+    def _hit_ev(self, hard: int, ace: bool, upcard: int) -> float:
+        """A lapkérés várható értéke, ha utána a játékos a jobbik lehetőséget választja a megállás és a további lapkérés közül.
+
+        Args:
+            hard (int): A kéz kemény összege.
+            ace (bool): Van-e ász a kézben.
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A várható érték.
+        """
+        key = (hard, ace, upcard)
+        if key not in self._hit:
+            ev = 0
+            for value in CARD_VALUES:
+                new_hard, new_ace = self._add(hard, ace, value)
+                score = self._score(new_hard, new_ace)[0]
+                if score > 21:
+                    ev -= self._p[value]
+                else:
+                    ev += self._p[value] * max(self._stand(score, upcard), self._hit_ev(new_hard, new_ace, upcard))
+            self._hit[key] = ev
+        return self._hit[key]
+
+    def _double_ev(self, hard: int, ace: bool, upcard: int) -> float:
+        """A duplázás várható értéke.
+
+        Args:
+            hard (int): A kéz kemény összege.
+            ace (bool): Van-e ász a kézben.
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A várható érték, az eredeti tét arányában.
+        """
+        ev = 0
+        for value in CARD_VALUES:
+            ev += self._p[value] * self._stand(self._score(*self._add(hard, ace, value))[0], upcard)
+        return 2 * ev
+
+    def _split_ev(self, value: int, upcard: int) -> float:
+        """A splitelés várható értéke, a két kéz együtt, újrasplitelés nélkül.
+
+        Args:
+            value (int): A pár lapjainak az értéke.
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A várható érték, az eredeti tét arányában.
+        """
+        ev = 0
+        start = self._add(0, False, value)
+        for second in CARD_VALUES:
+            hard, ace = self._add(*start, second)
+            options = [self._stand(self._score(hard, ace)[0], upcard)]
+            if value != ACE or self._rules.hit_split_aces:
+                options.append(self._hit_ev(hard, ace, upcard))
+                if self._rules.double_after_split:
+                    options.append(self._double_ev(hard, ace, upcard))
+            ev += self._p[second] * max(options)
+        return 2 * ev
+
+    def _hand(self, hand_type: str, player: int) -> tuple:
+        """A stratégia táblázatok jelölése alapján a kéz kemény összege és ász jelzője.
+
+        Args:
+            hand_type (str): hard_hand, soft_hand vagy pair_splitting.
+            player (int): A táblázat sora: kemény összeg, a puha kéz ász nélküli része, vagy a pár lapjainak az értéke.
+
+        Returns:
+            tuple: A kemény összeg és az ász jelző.
+        """
+        if hand_type == 'soft_hand':
+            return player + 1, True
+        if hand_type == 'pair_splitting':
+            return self._add(*self._add(0, False, player), player)
+        return player, False
+
+    def action_ev(self, hand_type: str, player: int, upcard: int, move: str) -> float:
+        """Egy két lapos kéz adott lépésének a várható értéke.
+
+        Args:
+            hand_type (str): hard_hand, soft_hand vagy pair_splitting.
+            player (int): A stratégia táblázat sora.
+            upcard (int): Az osztó első lapja.
+            move (str): A lépés (s, h, d, sp, r).
+
+        Returns:
+            float: A várható érték.
+        """
+        hard, ace = self._hand(hand_type, player)
+        if move == 's':
+            return self._stand(self._score(hard, ace)[0], upcard)
+        if move == 'h':
+            return self._hit_ev(hard, ace, upcard)
+        if move == 'd':
+            return self._double_ev(hard, ace, upcard)
+        if move == 'sp':
+            return self._split_ev(player, upcard)
+        if move == 'r':
+            return -0.5
+        raise Exception('Wrong move')
+
+    def _best_ev(self, first: int, second: int, upcard: int) -> float:
+        """Egy két lapos kéz legjobb lépésének a várható értéke.
+
+        Args:
+            first (int): Az első lap értéke.
+            second (int): A második lap értéke.
+            upcard (int): Az osztó első lapja.
+
+        Returns:
+            float: A várható érték.
+        """
+        hard, ace = self._add(*self._add(0, False, first), second)
+        options = [self._stand(self._score(hard, ace)[0], upcard), self._hit_ev(hard, ace, upcard), self._double_ev(hard, ace, upcard)]
+        if first == second:
+            options.append(self._split_ev(first, upcard))
+        if self._rules.surrender:
+            options.append(-0.5)
+        return max(options)
+
+    def expected_value(self) -> float:
+        """A játék várható értéke a kezdő tét arányában, optimális (összeg alapú) stratégiával.
+
+        Returns:
+            float: A várható érték.
+        """
+        p = self._p
+        payout = self._rules.blackjack_multiplier - 1
+        player_blackjack = 2 * p[ACE] * p[TEN]
+        ev = 0
+        for upcard in CARD_VALUES:
+            dealer_blackjack = self.dealer_blackjack(upcard)
+            hands = 0
+            for first in CARD_VALUES:
+                for second in CARD_VALUES:
+                    if {first, second} == {ACE, TEN}:
+                        hands += p[first] * p[second] * payout
+                    else:
+                        hands += p[first] * p[second] * self._best_ev(first, second, upcard)
+            ev += p[upcard] * (dealer_blackjack * (player_blackjack - 1) + (1 - dealer_blackjack) * hands)
+        return ev
+
+    def insurance_ev(self) -> float:
+        """A biztosítás várható értéke a biztosítás arányában, ha az osztó első lapja ász.
+
+        Returns:
+            float: A várható érték.
+        """
+        return 3 * self._p[TEN] - 1
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()
@@ -0,0 +1,258 @@
+from ai import AI, Table_game
+from blackjack_logic import Rules, INFINITE_DECK, CHIP_SCALE, load_data
+from random_source import Random_source
+from time import perf_counter
+import os
+
+BET = 1000
+HAND_TYPES = {
+    'hard_hand': range(20, 4, -1),
+    'soft_hand': range(9, 1, -1),
+    'pair_splitting': range(11, 1, -1),
+}
+DEALER_CARDS = range(2, 12)
+
+
+def _start_cards(hand_type: str, player: int) -> list:
+    """A stratégia táblázat egy sorához tartozó kezdő lapok. A kemény kezek nem alkotnak párt, a kemény 20 ezért három lapos.
+
+    Args:
+        hand_type (str): hard_hand, soft_hand vagy pair_splitting.
+        player (int): A táblázat sora.
+
+    Returns:
+        list: A lapok értékei.
+    """
+    if hand_type == 'soft_hand':
+        return [11, player]
+    if hand_type == 'pair_splitting':
+        return [player, player]
+    if player == 20:
+        return [2, 8, 10]
+    return [2, player - 2] if player <= 12 else [player - 10, 10]
+
+
+class Strategy_learner:
+    """Monte Carlo kontrollal (exploring starts) megtanulja a stratégia táblázatokat a Table_game állapotgépén.
+    Egy köteg a táblázatok minden cellájában minden lehetséges első lépést ugyanannyiszor játszik le végtelen paklival,
+    az első lépés után a kéz (és a split kezek) a jelenlegi mohó stratégia szerint folytatódnak. A köteg után minden cella
+    a legnagyobb átlagos nyereségű lépést kapja (a korábbi kötegek súlya csökken, lásd train), és a játék újrafordítja a stratégiát. A feladás nem szerepel a lépések között,
+    mert a stratégia fájl minden szabály mellett használható kell legyen.
+    A kötegek a NumPy-mentes kódbázisban sima Python ciklusok, a gyorsaságot a Table_game táblázatai adják.
+    >>> learner = Strategy_learner(seed=3)
+    >>> len(learner.cells), learner.actions_per_batch()
+    (340, 1110)
+    >>> reports = learner.train(batches=3, episodes=30)
+    >>> [report['episodes'] for report in reports]
+    [33300, 33300, 33300]
+    >>> reports[0]['changed'] > reports[-1]['changed']
+    True
+    >>> tables = learner.tables()
+    >>> tables['hard_hand']['move'][0][4], tables['hard_hand']['move'][9][4], tables['pair_splitting']['move'][0][4]
+    ('s', 'd', 'sp')
+
+    A megtanult táblázat a saját stratégiája mellett újra kiértékelve is a legjobb lépéseket tartalmazza:
+
+    >>> refined = Strategy_learner(seed=1, initial='basic_strategy')
+    >>> _ = refined.train(batches=2, episodes=20000, cells=[('pair_splitting', 2, 6), ('pair_splitting', 8, 10)])
+    >>> moves = refined.tables()['pair_splitting']['move']
+    >>> for player, dealer, move in ((2, 6, moves[9][4]), (8, 10, moves[3][8])):
+    ...     returns = refined.evaluate('pair_splitting', player, dealer, episodes=20000)
+    ...     print(move, max(returns, key=returns.get))
+    sp sp
+    sp sp
+    >>> import tempfile
+    >>> directory = tempfile.mkdtemp()
+    >>> learner.write('learned', directory)
+    >>> from ai import Strategy
+    >>> Strategy(strategy=os.path.join(directory, 'learned.json'))._strategy == tables
+    True
+    >>> learner.write('learned', directory)
+    Traceback (most recent call last):
+    ...
+    Exception: The strategy file already exists
+    >>> learner.write('learned', directory, force=True)
+    """
+
+    def __init__(self, rules: Rules = None, seed: int = None, initial: str = None) -> None:
+        """
+        Args:
+            rules (Rules): A játékszabályok, ha nincs megadva, akkor az alapértelmezett szabályok.
+            seed (int): A véletlenszám forrás kezdőértéke.
+            initial (str): A kiinduló stratégia fájl neve a data mappában vagy egy .json fájl elérési útja,
+                ha nincs megadva, akkor minden cellában megállás.
+        """
+        rng = Random_source(seed)
+        self._player = AI(BET, rng)
+        self._player.set_basic_strategy(strategy=initial or 'basic_strategy')
+        self._game = Table_game(self._player, BET, BET, INFINITE_DECK, rules, rng)
+        self._tables = self._player._strategy._tables
+        self.cells = []
+        for hand_type, players in HAND_TYPES.items():
+            for player in players:
+                cards = _start_cards(hand_type, player)
+                state = 0
+                for value in cards:
+                    state = self._game._hit[state][value]
+                moves = [move for move in self._game._moves[state][2] if move != 'r']
+                for dealer in DEALER_CARDS:
+                    if initial is None:
+                        self._tables[hand_type][player][dealer] = 's'
+                    self.cells.append((hand_type, player, dealer, cards, state, moves))
+        self._returns = [{move: [0.0, 0.0] for move in moves} for *_, moves in self.cells]
+        self._game._compile_strategy()
+
+    def actions_per_batch(self) -> int:
+        """A cellák és a bennük lehetséges első lépések párjainak a száma, egy köteg ennek többszöröse.
+
+        Returns:
+            int: A párok száma.
+        """
+        return sum(len(moves) for *_, moves in self.cells)
+
+    def _episode(self, cards: list, state: int, dealer: int, move: str) -> float:
+        """Lejátszik egy kezet a megadott első lépéssel, az osztó második lapja nem adhat Blackjacket (az osztó előre megnézi).
+
+        Args:
+            cards (list): A játékos kezdő lapjai.
+            state (int): A kezdő lapok állapota.
+            dealer (int): Az osztó első lapja.
+            move (str): Az első lépés.
+
+        Returns:
+            float: A nyereség a kezdő tét arányában.
+        """
+        g = self._game
+        hand = [state, BET, False, False, True, False, list(cards), False]
+        g._hands = hands = [hand]
+        row = g._actions[state][2]
+        greedy = row[dealer]
+        row[dealer] = move
+        try:
+            paid = g._play_hand(hand, dealer, None)
+        finally:
+            row[dealer] = greedy
+        i = 1
+        while i < len(hands):
+            paid += g._play_hand(hands[i], dealer, None)
+            i += 1
+        hole = g._deal_card()[2]
+        while dealer + hole == 21:
+            hole = g._deal_card()[2]
+        dealer_state = g._play_dealer(g._hit[g._first[dealer]][hole], [dealer, hole])
+        return (g._settle(hands, dealer_state) / CHIP_SCALE - BET - paid) / BET
+
+    def _cell_returns(self, cell: tuple, episodes: int) -> dict:
+        """A cella minden lehetséges első lépését lejátssza a jelenlegi stratégiával folytatva.
+
+        Args:
+            cell (tuple): A cella, ahogy a cells listában szerepel.
+            episodes (int): Lépésenként ennyi kéz.
+
+        Returns:
+            dict: Lépésenként az átlagos nyereség a kezdő tét arányában.
+        """
+        _, _, dealer, cards, state, moves = cell
+        returns = {}
+        for move in moves:
+            total = 0.0
+            for _ in range(episodes):
+                total += self._episode(cards, state, dealer, move)
+            returns[move] = total / episodes
+        return returns
+
+    def evaluate(self, hand_type: str, player: int, dealer: int, episodes: int = 10000) -> dict:
+        """Újra kiértékeli egy cella lépéseit a jelenlegi (megtanult) stratégiával folytatva, így ellenőrizhető,
+        hogy a táblázat a saját stratégiája mellett is a legjobb lépést tartalmazza-e.
+
+        Args:
+            hand_type (str): hard_hand, soft_hand vagy pair_splitting.
+            player (int): A táblázat sora.
+            dealer (int): Az osztó lapja.
+            episodes (int): Lépésenként ennyi kéz.
+
+        Returns:
+            dict: Lépésenként az átlagos nyereség a kezdő tét arányában.
+        """
+        cell = next(cell for cell in self.cells if cell[:3] == (hand_type, player, dealer))
+        return self._cell_returns(cell, episodes)
+
+    def train(self, batches: int = 20, episodes: int = 1000, report=None, cells: list = None, decay: float = 0.5) -> list:
+        """Kötegenként kiértékeli és javítja a stratégiát. A korábbi kötegek kezei más stratégiával folytatódtak, ezért minden javítás után
+        a cellák addigi nyereségei és kézszámai decay-szeresükre csökkennek, így az átlag a legutóbbi stratégiát követi, a kezdeti
+        (például mindenhol megálló) stratégia hatása pedig exponenciálisan eltűnik.
+
+        Args:
+            batches (int): A kötegek száma.
+            episodes (int): Egy kötegben cellánként és lépésenként ennyi kéz.
+            report: Ha meg van adva, akkor minden köteg után meghívja a köteg adataival.
+            cells (list): Ha meg van adva, akkor csak ezeket a (hand_type, player, dealer) cellákat tanulja.
+            decay (float): A korábbi kötegek súlya javításonként, 0 esetén minden köteg csak a saját kezeit átlagolja.
+
+        Returns:
+            list: Kötegenként a lejátszott kezek száma (episodes), az idő (seconds), a sebesség (episodes_per_second)
+                és a megváltozott cellák száma (changed), ami a táblázat stabilitását mutatja.
+        """
+        trained = [(cell, returns) for cell, returns in zip(self.cells, self._returns) if cells is None or cell[:3] in cells]
+        reports = []
+        for batch in range(batches):
+            start = perf_counter()
+            for cell, returns in trained:
+                for move, mean in self._cell_returns(cell, episodes).items():
+                    returns[move][0] += mean * episodes
+                    returns[move][1] += episodes
+            changed = 0
+            for (hand_type, player, dealer, *_), returns in trained:
+                best = max(returns, key=lambda move: returns[move][0] / returns[move][1])
+                if self._tables[hand_type][player][dealer] != best:
+                    self._tables[hand_type][player][dealer] = best
+                    changed += 1
+                for total in returns.values():
+                    total[0] *= decay
+                    total[1] *= decay
+            self._game._compile_strategy()
+            played = episodes * sum(len(cell[5]) for cell, _ in trained)
+            seconds = perf_counter() - start
+            reports.append({'batch': batch, 'episodes': played, 'seconds': seconds,
+                            'episodes_per_second': played / seconds, 'changed': changed})
+            if report is not None:
+                report(reports[-1])
+        return reports
+
+    def tables(self) -> dict:
+        """A megtanult stratégia a data/basic_strategy.json szerkezetében.
+
+        Returns:
+            dict: A hard_hand, soft_hand és pair_splitting táblázatok.
+        """
+        return {hand_type: {'player': list(players), 'dealer': list(DEALER_CARDS),
+                            'move': [[self._tables[hand_type][player][dealer] for dealer in DEALER_CARDS] for player in players]}
+                for hand_type, players in HAND_TYPES.items()}
+
+    def write(self, name: str, directory: str = 'data', force: bool = False) -> None:
+        """Elmenti a megtanult stratégiát ugyanabban a formában, mint a data/basic_strategy.json, így a Strategy változtatás nélkül betölti.
+        Egy létező fájlt (például a data/basic_strategy.json-t) csak force esetén ír felül.
+
+        Args:
+            name (str): A fájl neve kiterjesztés nélkül.
+            directory (str): A mappa.
+            force (bool): Felülírhatja-e a létező fájlt.
+        """
+        file_name = os.path.join(directory, f'{name}.json')
+        if os.path.exists(file_name) and not force:
+            raise Exception('The strategy file already exists')
+        parts = []
+        for hand_type, table in self.tables().items():
+            rows = ',\n'.join('            [' + ','.join(f'"{move}"' for move in row) + ']' for row in table['move'])
+            parts.append(f'    "{hand_type}": {{\n'
+                         f'        "player": {table["player"]},\n'
+                         f'        "dealer": {table["dealer"]},\n'
+                         f'        "move": [\n{rows}\n        ]\n    }}')
+        with open(file_name, 'w') as f:
+            f.write('{\n' + ',\n'.join(parts) + '\n}')
+        load_data.cache_clear()
+
+
+if __name__ == '__main__':
+    import doctest
+    doctest.testmod()